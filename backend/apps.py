@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class BackendConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'backend'
+    verbose_name = 'SportOase'
+    
+    def ready(self):
+        from backend import signals  # noqa: F401
+        from backend.services import outbox_handlers  # noqa: F401
@@ -0,0 +1 @@
+# SportOase Benchmarks
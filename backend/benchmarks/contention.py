@@ -0,0 +1,133 @@
+from datetime import date, time
+from django.contrib.auth.models import User
+from django.db import connections
+from backend.db.retry import is_lock_error
+from backend.models import BookingStudent, SlotOccupancy, TimeSlot
+from backend.services.booking_service import BookingService, CapacityExceededError, WEEKDAY_CODES
+import threading
+
+
+class ContentionCheck:
+    """
+    Viele Threads buchen gleichzeitig denselben Slot über BookingService.create_booking
+    
+    Prüft danach, dass der Slot nicht überbucht ist und der Belegungszähler
+    (SlotOccupancy.student_count) genau den gebuchten Schülern entspricht.
+    Jede Buchung hat eigene Schüler, abgelehnt werden darf also nur wegen
+    der Kapazität (oder wegen Lock-Timeouts, die getrennt gezählt werden).
+    """
+    DATE = date(2030, 1, 7)
+    PERIOD = 1
+    
+    def __init__(self, threads=16, attempts=10, class_size=5, capacity=100):
+        """
+        Args:
+            threads: Anzahl paralleler Threads
+            attempts: Buchungsversuche pro Thread
+            class_size: Schüler pro Buchung
+            capacity: max_students des Slots
+        """
+        self.threads = threads
+        self.attempts = attempts
+        self.class_size = class_size
+        self.capacity = capacity
+        self.outcomes = {'booked': 0, 'capacity': 0, 'lock_errors': 0, 'errors': 0}
+        self.errors = []
+        self._lock = threading.Lock()
+    
+    def prepare(self):
+        """Legt den Slot mit der gewünschten Kapazität und eine Lehrkraft pro Thread an"""
+        TimeSlot.objects.update_or_create(
+            weekday=WEEKDAY_CODES[self.DATE.weekday()],
+            period=self.PERIOD,
+            defaults={'label': f'{self.PERIOD}. Stunde', 'start_time': time(8, 0), 'end_time': time(8, 45), 'max_students': self.capacity},
+        )
+        self.teachers = [
+            User.objects.get_or_create(username=f'contention-teacher-{i}')[0]
+            for i in range(self.threads)
+        ]
+    
+    def _worker(self, index, start):
+        teacher = self.teachers[index]
+        outcomes = dict.fromkeys(self.outcomes, 0)
+        errors = []
+        start.wait()
+        try:
+            for attempt in range(self.attempts):
+                students = [{'name': f'Schüler {index}-{attempt}-{i}', 'klasse': '5a'} for i in range(self.class_size)]
+                try:
+                    BookingService.create_booking(
+                        date=self.DATE,
+                        weekday=WEEKDAY_CODES[self.DATE.weekday()],
+                        period=self.PERIOD,
+                        teacher=teacher,
+                        students=students,
+                        offer_type='sport',
+                        offer_label='Kontention',
+                    )
+                    outcomes['booked'] += 1
+                except CapacityExceededError:
+                    outcomes['capacity'] += 1
+                except Exception as e:
+                    if is_lock_error(e):
+                        outcomes['lock_errors'] += 1
+                    else:
+                        outcomes['errors'] += 1
+                        errors.append(f"{type(e).__name__}: {e}")
+        finally:
+            connections.close_all()
+            with self._lock:
+                for key, value in outcomes.items():
+                    self.outcomes[key] += value
+                self.errors.extend(errors)
+    
+    def run(self):
+        """Startet alle Threads gleichzeitig und wartet auf ihr Ende"""
+        start = threading.Barrier(self.threads)
+        workers = [threading.Thread(target=self._worker, args=(i, start)) for i in range(self.threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    
+    def violations(self):
+        """
+        Returns:
+            Liste von Meldungen (leer, wenn der Slot konsistent ist)
+        """
+        booked = BookingStudent.objects.filter(date=self.DATE, period=self.PERIOD).count()
+        counter = SlotOccupancy.objects.filter(date=self.DATE, period=self.PERIOD).values_list('student_count', flat=True).first() or 0
+        problems = []
+        if booked > self.capacity:
+            problems.append(f"Slot überbucht: {booked} Schüler bei {self.capacity} Plätzen")
+        if counter != booked:
+            problems.append(f"Belegungszähler {counter}, gebucht {booked}")
+        if booked != self.outcomes['booked'] * self.class_size:
+            problems.append(f"{self.outcomes['booked']} erfolgreiche Buchungen, aber {booked} gebuchte Schüler")
+        demand = self.threads * self.attempts * self.class_size
+        if not self.outcomes['lock_errors'] and not self.outcomes['errors'] and booked < min(demand, self.capacity - self.class_size + 1):
+            problems.append(f"Nur {booked} Schüler gebucht, obwohl Plätze frei waren")
+        return problems
+    
+    @staticmethod
+    def sqlite_profile():
+        """'tuned' (backend.db.sqlite mit PRAGMAs), 'plain' oder None bei anderen Datenbanken"""
+        connection = connections['default']
+        if connection.vendor != 'sqlite':
+            return None
+        return 'tuned' if connection.settings_dict['ENGINE'] == 'backend.db.sqlite' else 'plain'
+    
+    def report(self):
+        """Dict mit Ergebnissen der Buchungsversuche, gebuchten Schülern und Verstößen"""
+        return {
+            'database': connections['default'].vendor,
+            'engine': connections['default'].settings_dict['ENGINE'],
+            'sqlite_profile': self.sqlite_profile(),
+            'threads': self.threads,
+            'attempts': self.threads * self.attempts,
+            'capacity': self.capacity,
+            'outcomes': dict(self.outcomes),
+            'booked_students': BookingStudent.objects.filter(date=self.DATE, period=self.PERIOD).count(),
+            'errors': self.errors[:10],
+            'violations': self.violations(),
+        }
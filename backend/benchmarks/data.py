@@ -0,0 +1,158 @@
+from datetime import date, time, timedelta
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+from backend.models import Booking, BookingStudent, BlockedSlot, Notification, SlotOccupancy, TimeSlot
+from backend.services.booking_service import WEEKDAY_CODES
+import json
+import random
+
+
+SCHOOL_YEAR_START = date(2025, 8, 4)
+SCHOOL_DAYS = 190
+PERIODS = 6
+OFFERS = [('sport', 'Fußball'), ('games', 'Brettspiele'), ('outdoor', 'Laufen'), ('other', 'Entspannung')]
+
+
+def school_days(start=SCHOOL_YEAR_START, count=SCHOOL_DAYS):
+    """Die ersten count Werktage (Mo–Fr) ab start"""
+    days = []
+    current = start
+    while len(days) < count:
+        if current.weekday() < 5:
+            days.append(current)
+        current += timedelta(days=1)
+    return days
+
+
+def generate(bookings, students_per_booking=30, teachers=50, blocked_every=10, seed=42, batch_size=1000):
+    """
+    Erzeugt ein synthetisches Schuljahr in der aktuellen (leeren) Datenbank
+    
+    Die Buchungen werden gleichmäßig über alle Slots von SCHOOL_DAYS Schultagen
+    verteilt; jede Buchung hat students_per_booking eigene Schüler, eine
+    Benachrichtigung (jede zweite gelesen) und die passenden Zeilen in
+    BookingStudent und SlotOccupancy. Jeder blocked_every-te Tag ist in der
+    6. Stunde blockiert. Schülerzeilen werden per executemany geschrieben,
+    100.000 Buchungen (3 Mio. Schülerzeilen) dauern damit einige Minuten.
+    
+    Args:
+        bookings: Anzahl der Buchungen
+        students_per_booking: Schüler pro Buchung
+        teachers: Anzahl der Lehrkräfte, auf die die Buchungen verteilt werden
+        blocked_every: Abstand der blockierten Tage (0 = keine Blockierungen)
+        seed: Startwert des Zufallsgenerators (gleiche Daten bei gleichem seed)
+    
+    Returns:
+        Dict mit 'days', 'teachers', 'admin', 'students' (Stichprobe gebuchter
+        Schüler als (date, period, name, klasse)) und 'max_students'
+    """
+    rng = random.Random(seed)
+    days = school_days()
+    blocked = {(day, PERIODS) for day in days[::blocked_every]} if blocked_every else set()
+    slots = [(day, period) for day in days for period in range(1, PERIODS + 1) if (day, period) not in blocked]
+    
+    per_slot = -(-bookings // len(slots))
+    # Platz für die create_booking-Fälle des Benchmarks lassen
+    max_students = per_slot * students_per_booking + 1000
+    
+    admin = User.objects.create_user('benchmark-admin', 'admin@example.org', is_staff=True)
+    User.objects.bulk_create([
+        User(username=f'benchmark-teacher-{i}', first_name='Lehrkraft', last_name=str(i), email=f'teacher{i}@example.org')
+        for i in range(teachers)
+    ])
+    users = list(User.objects.filter(username__startswith='benchmark-teacher-').order_by('id'))
+    
+    TimeSlot.objects.bulk_create([
+        TimeSlot(
+            weekday=weekday,
+            period=period,
+            label=f'{period}. Stunde',
+            start_time=time(7 + period, 0),
+            end_time=time(7 + period, 45),
+            max_students=max_students,
+        )
+        for weekday in WEEKDAY_CODES[:5]
+        for period in range(1, PERIODS + 1)
+    ])
+    BlockedSlot.objects.bulk_create([
+        BlockedSlot(date=day, weekday=WEEKDAY_CODES[day.weekday()], period=period, reason='Benchmark', blocked_by=admin)
+        for day, period in sorted(blocked)
+    ])
+    
+    student_table = BookingStudent._meta.db_table
+    student_sql = (
+        f'INSERT INTO {student_table} (booking_id, date, period, name, klasse, name_norm, klasse_norm) '
+        f'VALUES (%s, %s, %s, %s, %s, %s, %s)'
+    )
+    occupancy = {}
+    sample = []
+    now = timezone.now()
+    
+    for start in range(0, bookings, batch_size):
+        batch = []
+        for number in range(start, min(start + batch_size, bookings)):
+            day, period = slots[number % len(slots)]
+            offer_type, offer_label = OFFERS[number % len(OFFERS)]
+            teacher = users[number % len(users)]
+            klasse = f'{5 + number % 6}{"abcd"[number % 4]}'
+            # Feste IDs, weil bulk_create unter MySQL keine IDs zurückliefert
+            booking = Booking(
+                id=number + 1,
+                date=day,
+                weekday=WEEKDAY_CODES[day.weekday()],
+                period=period,
+                teacher=teacher,
+                teacher_name=f'Lehrkraft {teacher.last_name}',
+                teacher_class=klasse,
+                offer_type=offer_type,
+                offer_label=offer_label,
+                created_at=now - timedelta(minutes=bookings - number),
+            )
+            booking.students = [
+                {'name': f'Schüler {number}-{i}', 'klasse': klasse} for i in range(students_per_booking)
+            ]
+            batch.append(booking)
+        
+        with transaction.atomic():
+            Booking.objects.bulk_create(batch)
+            rows = []
+            for booking in batch:
+                for student in booking.students:
+                    rows.append((
+                        booking.id, booking.date, booking.period, student['name'], student['klasse'],
+                        student['name'].lower(), student['klasse'].lower(),
+                    ))
+                occupancy[(booking.date, booking.period)] = occupancy.get((booking.date, booking.period), 0) + students_per_booking
+            with connection.cursor() as cursor:
+                cursor.executemany(student_sql, rows)
+            
+            Notification.objects.bulk_create([
+                Notification(
+                    booking=booking,
+                    notification_type='new_booking',
+                    message=f'Neue Buchung: {booking.offer_label} am {booking.date.strftime("%d.%m.%Y")}',
+                    is_read=index % 2 == 0,
+                    read_at=now if index % 2 == 0 else None,
+                    created_at=booking.created_at,
+                    metadata_json=json.dumps({'date': booking.date.isoformat(), 'period': booking.period}),
+                )
+                for index, booking in enumerate(batch, start=start)
+            ])
+        
+        booking = rng.choice(batch)
+        student = rng.choice(booking.students)
+        sample.append((booking.date, booking.period, student['name'], student['klasse']))
+    
+    SlotOccupancy.objects.bulk_create([
+        SlotOccupancy(date=day, period=period, student_count=count)
+        for (day, period), count in occupancy.items()
+    ], batch_size=batch_size)
+    
+    return {
+        'days': days,
+        'teachers': users,
+        'admin': admin,
+        'students': sample,
+        'max_students': max_students,
+    }
@@ -0,0 +1,27 @@
+from contextlib import contextmanager
+from django.db import connection
+import os
+import tempfile
+
+
+@contextmanager
+def scratch_database():
+    """
+    Legt für die Dauer des Blocks eine leere, migrierte Testdatenbank an
+    
+    Verwendet die konfigurierte Datenbank (SQLite oder MySQL) mit dem üblichen
+    Testpräfix. Unter SQLite wird statt :memory: eine Datei angelegt, damit
+    Journal, PRAGMAs und Sperren wie im Betrieb wirken und mehrere Threads
+    dieselbe Datenbank sehen.
+    """
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    old_test_name = test_settings.get('NAME')
+    if connection.vendor == 'sqlite':
+        test_settings['NAME'] = os.path.join(tempfile.gettempdir(), f'sportoase-benchmark-{os.getpid()}.sqlite3')
+    
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings['NAME'] = old_test_name
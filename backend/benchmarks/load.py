@@ -0,0 +1,270 @@
+from datetime import timedelta
+from http.cookies import SimpleCookie
+from importlib import import_module
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections
+from backend.benchmarks import data
+from backend.benchmarks.suite import percentile
+from backend.db.retry import is_lock_error
+from backend.models import BookingStudent, SlotOccupancy, TimeSlot
+from backend.services.booking_service import WEEKDAY_CODES
+import io
+import json
+import random
+import sys
+import threading
+import time
+
+
+class WSGIClient:
+    """
+    Minimaler HTTP-Client, der eine WSGI-Anwendung direkt aufruft (ohne Netzwerk)
+    
+    Merkt sich Cookies aus Set-Cookie und sendet das CSRF-Token als Header mit.
+    """
+    
+    def __init__(self, application, cookies=None):
+        self.application = application
+        self.cookies = dict(cookies or {})
+    
+    def request(self, method, path, body=None):
+        """
+        Returns:
+            Tuple (HTTP-Status, Antwort als bytes)
+        """
+        path, _, query = path.partition('?')
+        payload = json.dumps(body).encode('utf-8') if body is not None else b''
+        environ = {
+            'REQUEST_METHOD': method,
+            'SCRIPT_NAME': '',
+            'PATH_INFO': path,
+            'QUERY_STRING': query,
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'REMOTE_ADDR': '127.0.0.1',
+            'HTTP_HOST': 'localhost',
+            'CONTENT_TYPE': 'application/json',
+            'CONTENT_LENGTH': str(len(payload)),
+            'wsgi.input': io.BytesIO(payload),
+            'wsgi.errors': sys.stderr,
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        if self.cookies:
+            environ['HTTP_COOKIE'] = '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+        if 'csrftoken' in self.cookies:
+            environ['HTTP_X_CSRFTOKEN'] = self.cookies['csrftoken']
+        
+        response = {}
+        
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = headers
+        
+        result = self.application(environ, start_response)
+        try:
+            content = b''.join(result)
+        finally:
+            # Löst request_finished aus (Verbindungen schließen wie im Server)
+            if hasattr(result, 'close'):
+                result.close()
+        
+        for name, value in response['headers']:
+            if name.lower() == 'set-cookie':
+                for morsel in SimpleCookie(value).values():
+                    self.cookies[morsel.key] = morsel.value
+        return response['status'], content
+
+
+class LoadHarness:
+    """
+    Lastsimulation für den Ansturm, wenn viele Lehrkräfte gleichzeitig buchen
+    
+    Mehrere Threads schicken eine gemischte Folge von Requests direkt an die
+    WSGI-Anwendung: Wochenübersichten (GET /slots/week), Buchungen, die alle
+    um dieselben Slots konkurrieren (POST /book), und Admin-Abfragen der
+    Benachrichtigungen. Danach wird geprüft, ob ein Slot überbucht wurde oder
+    der Belegungszähler von den tatsächlich gebuchten Schülern abweicht.
+    """
+    OPERATIONS = ('week', 'book', 'notifications')
+    
+    def __init__(self, application, mix, threads=16, requests=2000, hot_slots=1, class_size=25,
+                 capacity=200, bookings=1000, seed=1):
+        """
+        Args:
+            application: WSGI-Anwendung (backend.wsgi.application)
+            mix: Dict Operation -> Gewicht, z.B. {'week': 60, 'book': 30, 'notifications': 10}
+            threads: Anzahl paralleler Clients
+            requests: Gesamtzahl der Requests
+            hot_slots: Anzahl der Slots (Stunden desselben Tages), um die gebucht wird
+            class_size: Schüler pro Buchung
+            capacity: max_students der umkämpften Slots
+            bookings: Umfang der Hintergrunddaten (siehe benchmarks.data.generate)
+            seed: Startwert für die Reihenfolge der Requests
+        """
+        unknown = set(mix) - set(self.OPERATIONS)
+        if unknown:
+            raise ValueError(f"Unbekannte Operationen: {', '.join(sorted(unknown))}")
+        self.application = application
+        self.mix = mix
+        self.threads = threads
+        self.requests = requests
+        self.hot_slots = hot_slots
+        self.class_size = class_size
+        self.capacity = capacity
+        self.bookings = bookings
+        self.rng = random.Random(seed)
+        self.samples = []
+        self._lock = threading.Lock()
+    
+    def _session(self, user):
+        store = import_module(settings.SESSION_ENGINE).SessionStore()
+        store[SESSION_KEY] = str(user.pk)
+        store[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+        store[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        store.create()
+        return store.session_key
+    
+    def _client(self, user):
+        client = WSGIClient(self.application, {settings.SESSION_COOKIE_NAME: self._session(user)})
+        status, _ = client.request('GET', '/api/sportoase/csrf')
+        if status != 200:
+            raise RuntimeError(f"CSRF-Token nicht erhältlich (HTTP {status})")
+        return client
+    
+    def prepare(self):
+        """Erzeugt Hintergrunddaten, Benutzer mit Sessions und die umkämpften Slots"""
+        generated = data.generate(self.bookings, teachers=max(self.threads, 10))
+        
+        content_type, _ = ContentType.objects.get_or_create(app_label='sportoase', model='sportoase')
+        use, _ = Permission.objects.get_or_create(codename='user', content_type=content_type, defaults={'name': 'SportOase nutzen'})
+        manage, _ = Permission.objects.get_or_create(codename='admin', content_type=content_type, defaults={'name': 'SportOase verwalten'})
+        for teacher in generated['teachers']:
+            teacher.user_permissions.add(use)
+        generated['admin'].user_permissions.add(use, manage)
+        
+        # Erster Montag nach dem generierten Schuljahr, dort gibt es noch keine Buchungen
+        last_day = generated['days'][-1]
+        self.hot_date = last_day + timedelta(days=7 - last_day.weekday())
+        self.hot_periods = list(range(1, self.hot_slots + 1))
+        TimeSlot.objects.filter(weekday=WEEKDAY_CODES[self.hot_date.weekday()], period__in=self.hot_periods).update(
+            max_students=self.capacity
+        )
+        
+        self.clients = [
+            (self._client(generated['teachers'][i % len(generated['teachers'])]), self._client(generated['admin']))
+            for i in range(self.threads)
+        ]
+        
+        operations = list(self.mix)
+        weights = [self.mix[name] for name in operations]
+        self.plan = self.rng.choices(operations, weights=weights, k=self.requests)
+    
+    def _execute(self, number, operation, teacher, admin):
+        if operation == 'week':
+            return teacher.request('GET', f'/api/sportoase/slots/week?start_date={self.hot_date.isoformat()}')
+        if operation == 'notifications':
+            if number % 2:
+                return admin.request('GET', '/api/sportoase/notifications/unread-count')
+            return admin.request('GET', '/api/sportoase/notifications?unread_only=true&limit=50')
+        return teacher.request('POST', '/api/sportoase/book', {
+            'date': self.hot_date.isoformat(),
+            'weekday': WEEKDAY_CODES[self.hot_date.weekday()],
+            'period': self.hot_periods[number % len(self.hot_periods)],
+            'students': [{'name': f'Last {number}-{i}', 'klasse': '6c'} for i in range(self.class_size)],
+            'offer_type': 'sport',
+            'offer_label': 'Lasttest',
+        })
+    
+    def _worker(self, index, queue, start):
+        teacher, admin = self.clients[index]
+        samples = []
+        start.wait()
+        try:
+            while True:
+                with self._lock:
+                    if not queue:
+                        break
+                    number, operation = queue.pop()
+                started = time.perf_counter()
+                try:
+                    status, content = self._execute(number, operation, teacher, admin)
+                    lock_error = status >= 500 and is_lock_error(content.decode('utf-8', 'replace'))
+                except Exception as e:
+                    status, lock_error = 0, is_lock_error(str(e))
+                samples.append((operation, status, time.perf_counter() - started, lock_error))
+        finally:
+            connections.close_all()
+            with self._lock:
+                self.samples.extend(samples)
+    
+    def run(self):
+        """Führt den Plan mit allen Threads aus, Rückgabe: Laufzeit in Sekunden"""
+        queue = list(reversed(list(enumerate(self.plan))))
+        start = threading.Barrier(self.threads + 1)
+        workers = [threading.Thread(target=self._worker, args=(i, queue, start)) for i in range(self.threads)]
+        for worker in workers:
+            worker.start()
+        start.wait()
+        started = time.perf_counter()
+        for worker in workers:
+            worker.join()
+        self.elapsed = time.perf_counter() - started
+        return self.elapsed
+    
+    def violations(self):
+        """
+        Prüft die umkämpften Slots auf Überbuchung und Zählerabweichungen
+        
+        Returns:
+            Liste von Meldungen (leer, wenn alles konsistent ist)
+        """
+        problems = []
+        for period in self.hot_periods:
+            booked = BookingStudent.objects.filter(date=self.hot_date, period=period).count()
+            counter = SlotOccupancy.objects.filter(date=self.hot_date, period=period).values_list('student_count', flat=True).first() or 0
+            if booked > self.capacity:
+                problems.append(f"{period}. Stunde überbucht: {booked} Schüler bei {self.capacity} Plätzen")
+            if booked != counter:
+                problems.append(f"{period}. Stunde: Belegungszähler {counter}, gebucht {booked}")
+        return problems
+    
+    def report(self):
+        """Dict mit Durchsatz, Latenzen, Statuscodes und Lock-Fehlern pro Operation und gesamt"""
+        def summarize(samples):
+            timings = [elapsed * 1000 for _, _, elapsed, _ in samples]
+            statuses = {}
+            for _, status, _, _ in samples:
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+            return {
+                'requests': len(samples),
+                'throughput': round(len(samples) / self.elapsed, 1),
+                'p50_ms': round(percentile(timings, 0.50), 2),
+                'p95_ms': round(percentile(timings, 0.95), 2),
+                'p99_ms': round(percentile(timings, 0.99), 2),
+                'max_ms': round(max(timings), 2),
+                'statuses': statuses,
+                'lock_errors': sum(1 for sample in samples if sample[3]),
+            }
+        
+        operations = {
+            name: summarize([sample for sample in self.samples if sample[0] == name])
+            for name in self.OPERATIONS
+            if any(sample[0] == name for sample in self.samples)
+        }
+        return {
+            'database': connections['default'].vendor,
+            'threads': self.threads,
+            'elapsed_s': round(self.elapsed, 2),
+            'total': summarize(self.samples),
+            'operations': operations,
+            'booked_students': BookingStudent.objects.filter(date=self.hot_date).count(),
+            'violations': self.violations(),
+        }
@@ -0,0 +1,220 @@
+from datetime import timedelta
+from django.db import connection, transaction
+from backend.models import Notification
+from backend.services.availability_cache import AvailabilityCache
+from backend.services.booking_service import BookingService, WEEKDAY_CODES
+from backend.views.admin import NOTIFICATION_PAGES
+import math
+import time
+
+
+class _Rollback(Exception):
+    pass
+
+
+class QueryCounter:
+    """execute_wrapper, der die ausgeführten SQL-Abfragen zählt"""
+    
+    def __init__(self):
+        self.count = 0
+    
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def percentile(values, fraction):
+    """Perzentil nach der Nearest-Rank-Methode"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class BenchmarkSuite:
+    """
+    Zeitmessung der zentralen BookingService-Aufrufe auf generierten Daten
+    
+    Jeder Fall ist eine Methode case_<name>, die für einen Durchlauf eine
+    Funktion ohne Argumente zurückgibt; nur deren Aufruf wird gemessen.
+    Vorbereitung (z.B. Cache-Invalidierung) läuft außerhalb der Messung.
+    Schreibende Fälle laufen in einer Transaktion, die danach zurückgerollt
+    wird, damit alle Durchläufe denselben Datenbestand sehen.
+    """
+    WRITE_CASES = ['create_booking', 'create_booking_large']
+    
+    def __init__(self, data, iterations=30, warmup=3):
+        """
+        Args:
+            data: Rückgabewert von benchmarks.data.generate()
+            iterations: Gemessene Durchläufe pro Fall
+            warmup: Ungemessene Durchläufe vorab
+        """
+        self.data = data
+        self.iterations = iterations
+        self.warmup = warmup
+        self.run_number = 0
+    
+    @classmethod
+    def all_cases(cls):
+        return [name[len('case_'):] for name in dir(cls) if name.startswith('case_') and callable(getattr(cls, name))]
+    
+    def _day(self):
+        days = self.data['days']
+        return days[(self.run_number * 7) % len(days)]
+    
+    def _student(self):
+        students = self.data['students']
+        return students[self.run_number % len(students)]
+    
+    def _teacher(self):
+        teachers = self.data['teachers']
+        return teachers[self.run_number % len(teachers)]
+    
+    def case_get_available_slots(self):
+        day = self._day()
+        AvailabilityCache.invalidate(day)
+        return lambda: BookingService.get_available_slots(day)
+    
+    def case_get_available_slots_cached(self):
+        day = self._day()
+        BookingService.get_available_slots(day)
+        return lambda: BookingService.get_available_slots(day)
+    
+    def case_week_overview(self):
+        day = self._day()
+        monday = day - timedelta(day.weekday())
+        friday = monday + timedelta(4)
+        for offset in range(5):
+            AvailabilityCache.invalidate(monday + timedelta(offset))
+        return lambda: BookingService.get_slots_for_range(monday, friday)
+    
+    def _create_booking(self, students):
+        day = self._day()
+        teacher = self._teacher()
+        number = self.run_number
+        students = [{'name': f'Benchmark {number}-{i}', 'klasse': '7b'} for i in range(students)]
+        return lambda: BookingService.create_booking(
+            date=day,
+            weekday=WEEKDAY_CODES[day.weekday()],
+            period=1,
+            teacher=teacher,
+            students=students,
+            offer_type='sport',
+            offer_label='Benchmark',
+        )
+    
+    def case_create_booking(self):
+        return self._create_booking(30)
+    
+    def case_create_booking_large(self):
+        return self._create_booking(150)
+    
+    def case_check_student_double_booking(self):
+        day, period, name, klasse = self._student()
+        return lambda: BookingService.check_student_double_booking(name, klasse, day, period)
+    
+    def case_check_student_double_booking_miss(self):
+        day, period, _, _ = self._student()
+        return lambda: BookingService.check_student_double_booking('Nicht Gebucht', '5a', day, period)
+    
+    def case_get_user_bookings(self):
+        teacher = self._teacher()
+        return lambda: [booking.to_dict() for booking in BookingService.get_user_bookings(teacher)]
+    
+    def case_notifications_page(self):
+        return lambda: [n.to_dict() for n in NOTIFICATION_PAGES.page(Notification.objects.all())[0]]
+    
+    def case_notifications_unread_page(self):
+        return lambda: [n.to_dict() for n in NOTIFICATION_PAGES.page(Notification.objects.filter(is_read=False))[0]]
+    
+    def case_search_students(self):
+        _, _, name, _ = self._student()
+        days = self.data['days']
+        return lambda: BookingService.search_students(days[0], days[-1], name=name)
+    
+    def _measure_once(self, name, counter):
+        prepare = getattr(self, f'case_{name}')
+        self.run_number += 1
+        
+        if name not in self.WRITE_CASES:
+            call = prepare()
+            counter.count = 0
+            started = time.perf_counter()
+            call()
+            return time.perf_counter() - started, counter.count
+        
+        try:
+            with transaction.atomic():
+                call = prepare()
+                counter.count = 0
+                started = time.perf_counter()
+                call()
+                elapsed, queries = time.perf_counter() - started, counter.count
+                raise _Rollback()
+        except _Rollback:
+            pass
+        return elapsed, queries
+    
+    def run_case(self, name):
+        """
+        Misst einen Fall
+        
+        Returns:
+            Dict mit p50_ms, p95_ms, p99_ms, mean_ms, max_ms und queries (Median)
+        """
+        counter = QueryCounter()
+        timings = []
+        queries = []
+        with connection.execute_wrapper(counter):
+            for run in range(self.warmup + self.iterations):
+                elapsed, count = self._measure_once(name, counter)
+                if run >= self.warmup:
+                    timings.append(elapsed * 1000)
+                    queries.append(count)
+        
+        return {
+            'p50_ms': round(percentile(timings, 0.50), 3),
+            'p95_ms': round(percentile(timings, 0.95), 3),
+            'p99_ms': round(percentile(timings, 0.99), 3),
+            'mean_ms': round(sum(timings) / len(timings), 3),
+            'max_ms': round(max(timings), 3),
+            'queries': percentile(queries, 0.50),
+        }
+    
+    def run(self, cases=None):
+        """Misst alle (oder die angegebenen) Fälle, Rückgabe: Dict Fallname -> Ergebnis"""
+        return {name: self.run_case(name) for name in (cases or self.all_cases())}
+
+
+def compare(results, baseline, tolerance=0.25, min_delta_ms=1.0):
+    """
+    Vergleicht Ergebnisse mit einer gespeicherten Baseline
+    
+    Eine Regression ist jede zusätzliche Abfrage oder ein p50, der die
+    Baseline um mehr als tolerance (relativ) und min_delta_ms (absolut)
+    übersteigt. Fälle oder Größen, die in der Baseline fehlen, werden
+    übersprungen.
+    
+    Args:
+        results: Dict Größe -> Fallname -> Ergebnis (wie run() pro Größe)
+        baseline: Dict im selben Format
+    
+    Returns:
+        Liste von Meldungen (leer ohne Regressionen)
+    """
+    regressions = []
+    for scale, cases in results.items():
+        for name, result in cases.items():
+            reference = baseline.get(scale, {}).get(name)
+            if not reference:
+                continue
+            if result['queries'] > reference['queries']:
+                regressions.append(
+                    f"{scale}/{name}: {result['queries']} statt {reference['queries']} Abfragen"
+                )
+            limit = max(reference['p50_ms'] * (1 + tolerance), reference['p50_ms'] + min_delta_ms)
+            if result['p50_ms'] > limit:
+                regressions.append(
+                    f"{scale}/{name}: p50 {result['p50_ms']:.2f} ms statt {reference['p50_ms']:.2f} ms "
+                    f"(Grenze {limit:.2f} ms)"
+                )
+    return regressions
@@ -0,0 +1 @@
+# SportOase Database Package
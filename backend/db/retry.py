@@ -0,0 +1,37 @@
+from django.db import connection, OperationalError
+from backend.services.metrics import Metrics
+import functools
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def is_lock_error(error):
+    """Prüft, ob ein OperationalError ein Lock-Timeout ist (SQLite oder MySQL)"""
+    message = str(error).lower()
+    return 'database is locked' in message or 'lock wait timeout' in message or 'deadlock' in message
+
+
+def retry_on_lock(attempts=3, delay=0.1):
+    """
+    Wiederholt eine Schreibtransaktion bei Lock-Timeouts
+    
+    Muss außerhalb von transaction.atomic stehen. Läuft der Aufruf bereits in
+    einer äußeren Transaktion, wird nicht wiederholt, weil diese nach dem Fehler
+    ohnehin zurückgerollt werden muss.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except OperationalError as e:
+                    if attempt == attempts or connection.in_atomic_block or not is_lock_error(e):
+                        raise
+                    logger.warning(f"Lock-Timeout in {func.__name__}, Versuch {attempt}/{attempts}: {e}")
+                    Metrics.inc('lock_retries', function=func.__name__)
+                    time.sleep(delay * attempt)
+        return wrapper
+    return decorator
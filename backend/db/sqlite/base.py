@@ -0,0 +1,37 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite-Backend mit konfigurierbarem Produktionsprofil
+    
+    Zusätzliche Schlüssel in OPTIONS:
+    - pragmas: Dict von PRAGMAs, die für jede neue Verbindung gesetzt werden
+      (z.B. journal_mode=WAL, busy_timeout=20000, synchronous=NORMAL)
+    - transaction_mode: DEFERRED, IMMEDIATE oder EXCLUSIVE für transaction.atomic
+    
+    Mit BEGIN IMMEDIATE holt sich eine Schreibtransaktion den Schreib-Lock gleich
+    zu Beginn und wartet dabei bis zu busy_timeout. Bei BEGIN (DEFERRED) würde das
+    spätere Upgrade vom Lese- zum Schreib-Lock sofort mit "database is locked"
+    abbrechen, wenn ein anderer Worker gerade schreibt.
+    """
+    PROFILE_OPTIONS = ('pragmas', 'transaction_mode')
+    TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+    
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        for key in self.PROFILE_OPTIONS:
+            params.pop(key, None)
+        return params
+    
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.settings_dict['OPTIONS'].get('pragmas', {}).items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+    
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict['OPTIONS'].get('transaction_mode', 'DEFERRED').upper()
+        if mode not in self.TRANSACTION_MODES:
+            raise ValueError(f"Ungültiger transaction_mode: {mode}")
+        self.cursor().execute(f'BEGIN {mode}')
@@ -1,7 +1,9 @@
 from django.contrib import admin
 from django.urls import path, include
+from backend.views.metrics import metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/sportoase/', include('backend.urls')),
+    path('metrics', metrics, name='metrics'),
 ]
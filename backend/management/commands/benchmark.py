@@ -0,0 +1,90 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from backend.benchmarks import data
+from backend.benchmarks.database import scratch_database
+from backend.benchmarks.suite import BenchmarkSuite, compare
+import json
+import os
+import platform
+import sqlite3
+import time
+import django
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(data.__file__), 'baseline.json')
+
+
+class Command(BaseCommand):
+    help = 'Misst BookingService auf synthetischen Daten (eigene Testdatenbank) und vergleicht mit einer Baseline'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', type=int, nargs='+', default=[1000, 10000], help='Anzahl Buchungen pro Lauf (z.B. 1000 10000 100000)')
+        parser.add_argument('--students', type=int, default=30, help='Schüler pro Buchung')
+        parser.add_argument('--iterations', type=int, default=30, help='Gemessene Durchläufe pro Fall')
+        parser.add_argument('--warmup', type=int, default=3, help='Ungemessene Durchläufe pro Fall')
+        parser.add_argument('--cases', nargs='+', choices=BenchmarkSuite.all_cases(), help='Nur diese Fälle messen')
+        parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline-Datei (JSON) für den Vergleich')
+        parser.add_argument('--save-baseline', action='store_true', help='Ergebnisse als neue Baseline speichern statt zu vergleichen')
+        parser.add_argument('--output', help='Ergebnisse zusätzlich als JSON in diese Datei schreiben')
+        parser.add_argument('--tolerance', type=float, default=0.25, help='Erlaubte relative Verschlechterung des p50')
+    
+    def handle(self, *args, **options):
+        results = {}
+        # Eigener In-Memory-Cache und keine Metriken: der Benchmark darf weder den Cache
+        # noch die /metrics-Zähler der Anwendung verändern
+        caches = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'sportoase-benchmark'}}
+        with override_settings(CACHES=caches, METRICS_ENABLED=False, OUTBOX_DISPATCH='worker', DEBUG=False):
+            for scale in options['scales']:
+                results[str(scale)] = self.run_scale(scale, options)
+        
+        report = {
+            'meta': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'sqlite': sqlite3.sqlite_version if connection.vendor == 'sqlite' else None,
+                'machine': platform.machine(),
+                'students_per_booking': options['students'],
+                'iterations': options['iterations'],
+            },
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        
+        if options['save_baseline']:
+            with open(options['baseline'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Baseline gespeichert: {options['baseline']}"))
+            return
+        
+        if not os.path.exists(options['baseline']):
+            self.stdout.write(f"Keine Baseline unter {options['baseline']}, Vergleich übersprungen")
+            return
+        
+        with open(options['baseline'], encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline['results'], tolerance=options['tolerance'])
+        if regressions:
+            for message in regressions:
+                self.stderr.write(self.style.ERROR(f"Regression: {message}"))
+            raise CommandError(f"{len(regressions)} Regressionen gegenüber {options['baseline']}")
+        self.stdout.write(self.style.SUCCESS('Keine Regressionen gegenüber der Baseline'))
+    
+    def run_scale(self, scale, options):
+        with scratch_database():
+            started = time.perf_counter()
+            generated = data.generate(scale, students_per_booking=options['students'])
+            self.stdout.write(f"\n{scale} Buchungen erzeugt in {time.perf_counter() - started:.1f} s")
+            
+            suite = BenchmarkSuite(generated, iterations=options['iterations'], warmup=options['warmup'])
+            results = {}
+            for name in options['cases'] or suite.all_cases():
+                results[name] = result = suite.run_case(name)
+                self.stdout.write(
+                    f"  {name:40} p50 {result['p50_ms']:9.2f} ms  p95 {result['p95_ms']:9.2f} ms  "
+                    f"p99 {result['p99_ms']:9.2f} ms  {result['queries']:3} Abfragen"
+                )
+            return results
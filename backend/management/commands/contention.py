@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from backend.benchmarks.contention import ContentionCheck
+from backend.benchmarks.database import scratch_database
+
+
+class Command(BaseCommand):
+    help = 'Bucht denselben Slot aus vielen Threads und prüft, dass er nicht überbucht wird (eigene Testdatenbank)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16, help='Parallele Threads')
+        parser.add_argument('--attempts', type=int, default=10, help='Buchungsversuche pro Thread')
+        parser.add_argument('--class-size', type=int, default=5, help='Schüler pro Buchung')
+        parser.add_argument('--capacity', type=int, default=100, help='Plätze im Slot')
+        parser.add_argument('--max-lock-errors', type=int, help='Mit Fehler enden, wenn mehr Buchungen an Lock-Timeouts scheitern')
+        parser.add_argument('--sqlite-profile', choices=['plain', 'tuned'], help='Abbrechen, wenn unter SQLite ein anderes SQLITE_PROFILE aktiv ist')
+    
+    def handle(self, *args, **options):
+        active_profile = ContentionCheck.sqlite_profile()
+        if options['sqlite_profile'] and active_profile and active_profile != options['sqlite_profile']:
+            raise CommandError(f"Aktives SQLite-Profil ist '{active_profile}', SQLITE_PROFILE={options['sqlite_profile']} setzen")
+        
+        # Eigener In-Memory-Cache und keine Metriken, wie bei benchmark und loadtest
+        caches = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'sportoase-contention'}}
+        with override_settings(CACHES=caches, METRICS_ENABLED=False, OUTBOX_DISPATCH='worker', DEBUG=False), scratch_database():
+            check = ContentionCheck(
+                threads=options['threads'],
+                attempts=options['attempts'],
+                class_size=options['class_size'],
+                capacity=options['capacity'],
+            )
+            check.prepare()
+            check.run()
+            report = check.report()
+        
+        outcomes = report['outcomes']
+        self.stdout.write(
+            f"{report['engine']}, {report['threads']} Threads, {report['attempts']} Buchungsversuche: "
+            f"{outcomes['booked']} gebucht, {outcomes['capacity']} wegen Kapazität abgelehnt, "
+            f"{outcomes['lock_errors']} Lock-Fehler, {outcomes['errors']} andere Fehler"
+        )
+        self.stdout.write(f"Gebuchte Schüler: {report['booked_students']} von {report['capacity']} Plätzen")
+        for message in report['errors']:
+            self.stderr.write(message)
+        
+        if report['violations']:
+            for message in report['violations']:
+                self.stderr.write(self.style.ERROR(message))
+            raise CommandError('Slot überbucht oder Belegungszähler inkonsistent')
+        if outcomes['errors']:
+            raise CommandError('Unerwartete Fehler beim Buchen')
+        if options['max_lock_errors'] is not None and outcomes['lock_errors'] > options['max_lock_errors']:
+            raise CommandError(f"{outcomes['lock_errors']} Lock-Fehler, erlaubt sind {options['max_lock_errors']}")
+        self.stdout.write(self.style.SUCCESS('Keine Überbuchung, Belegungszähler konsistent'))
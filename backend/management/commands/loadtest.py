@@ -0,0 +1,83 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from backend.benchmarks.database import scratch_database
+from backend.benchmarks.load import LoadHarness
+import json
+
+
+def parse_mix(value):
+    """'week=60,book=30,notifications=10' -> Dict"""
+    try:
+        mix = {name.strip(): int(weight) for name, weight in (part.split('=') for part in value.split(','))}
+    except ValueError:
+        raise CommandError('--mix im Format week=60,book=30,notifications=10 angeben')
+    unknown = set(mix) - set(LoadHarness.OPERATIONS)
+    if unknown:
+        raise CommandError(f"Unbekannte Operationen in --mix: {', '.join(sorted(unknown))}")
+    if not any(mix.values()):
+        raise CommandError('--mix braucht mindestens ein Gewicht > 0')
+    return mix
+
+
+class Command(BaseCommand):
+    help = 'Simuliert viele gleichzeitige Clients direkt gegen die WSGI-Anwendung (eigene Testdatenbank)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16, help='Parallele Clients')
+        parser.add_argument('--requests', type=int, default=2000, help='Gesamtzahl der Requests')
+        parser.add_argument('--mix', default='week=60,book=30,notifications=10', help='Gewichte der Operationen week, book, notifications')
+        parser.add_argument('--hot-slots', type=int, default=1, help='Anzahl der umkämpften Slots (Stunden desselben Tages)')
+        parser.add_argument('--class-size', type=int, default=25, help='Schüler pro Buchung')
+        parser.add_argument('--capacity', type=int, default=200, help='Plätze pro umkämpftem Slot')
+        parser.add_argument('--bookings', type=int, default=1000, help='Buchungen in den Hintergrunddaten')
+        parser.add_argument('--seed', type=int, default=1, help='Startwert für die Reihenfolge der Requests')
+        parser.add_argument('--output', help='Bericht zusätzlich als JSON in diese Datei schreiben')
+    
+    def handle(self, *args, **options):
+        from backend.wsgi import application
+        
+        mix = parse_mix(options['mix'])
+        # Eigener In-Memory-Cache und keine Metriken: der Lasttest darf weder den Cache
+        # noch die /metrics-Zähler der Anwendung verändern
+        caches = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'sportoase-loadtest'}}
+        with override_settings(CACHES=caches, METRICS_ENABLED=False, DEBUG=False), scratch_database():
+            harness = LoadHarness(
+                application,
+                mix,
+                threads=options['threads'],
+                requests=options['requests'],
+                hot_slots=options['hot_slots'],
+                class_size=options['class_size'],
+                capacity=options['capacity'],
+                bookings=options['bookings'],
+                seed=options['seed'],
+            )
+            harness.prepare()
+            harness.run()
+            report = harness.report()
+        
+        self.print_report(report)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        
+        if report['violations']:
+            for message in report['violations']:
+                self.stderr.write(self.style.ERROR(message))
+            raise CommandError('Inkonsistente Belegung nach dem Lasttest')
+    
+    def print_report(self, report):
+        total = report['total']
+        self.stdout.write(
+            f"{report['database']}, {report['threads']} Threads: {total['requests']} Requests in "
+            f"{report['elapsed_s']} s ({total['throughput']} req/s), {total['lock_errors']} Lock-Fehler"
+        )
+        for name, result in report['operations'].items():
+            statuses = ', '.join(f"{status}: {count}" for status, count in sorted(result['statuses'].items()))
+            self.stdout.write(
+                f"  {name:14} {result['requests']:6} req  p50 {result['p50_ms']:8.2f} ms  p95 {result['p95_ms']:8.2f} ms  "
+                f"p99 {result['p99_ms']:8.2f} ms  Lock-Fehler {result['lock_errors']:3}  [{statuses}]"
+            )
+        self.stdout.write(f"Gebuchte Schüler im umkämpften Slot: {report['booked_students']}")
+        if not report['violations']:
+            self.stdout.write(self.style.SUCCESS('Keine Überbuchung, Belegungszähler konsistent'))
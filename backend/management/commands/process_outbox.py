@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from backend.services.outbox import Outbox
+import time
+
+
+class Command(BaseCommand):
+    help = 'Verarbeitet Outbox-Ereignisse (Benachrichtigungen und andere Nebenwirkungen von Buchungen)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Ereignisse pro Durchlauf')
+        parser.add_argument('--interval', type=float, default=2.0, help='Wartezeit in Sekunden, wenn nichts zu tun ist')
+        parser.add_argument('--once', action='store_true', help='Alle fälligen Ereignisse verarbeiten und beenden')
+    
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        
+        try:
+            while True:
+                close_old_connections()
+                result = Outbox.process_batch(batch_size=batch_size)
+                if any(result.values()):
+                    self.stdout.write(
+                        f"{result['processed']} verarbeitet, {result['retried']} zurückgestellt, "
+                        f"{result['failed']} fehlgeschlagen"
+                    )
+                
+                if sum(result.values()) < batch_size:
+                    if options['once']:
+                        break
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from backend.services.notification_retention import NotificationRetention
+import time
+
+
+class Command(BaseCommand):
+    help = 'Löscht bzw. archiviert alte gelesene Benachrichtigungen und fasst ältere pro Typ und Tag zusammen'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=getattr(settings, 'NOTIFICATION_RETENTION_DAYS', 365),
+            help='Gelesene Benachrichtigungen älter als N Tage löschen',
+        )
+        parser.add_argument(
+            '--compact-after', type=int, default=getattr(settings, 'NOTIFICATION_COMPACT_AFTER_DAYS', 30),
+            help='Gelesene Benachrichtigungen älter als N Tage pro Typ und Tag zusammenfassen (0 = aus)',
+        )
+        parser.add_argument(
+            '--outbox-days', type=int, default=getattr(settings, 'OUTBOX_RETENTION_DAYS', 30),
+            help='Erledigte Outbox-Ereignisse älter als N Tage löschen (0 = aus)',
+        )
+        parser.add_argument('--archive', help='Gelöschte Benachrichtigungen an diese gzip-JSONL-Datei anhängen')
+        parser.add_argument('--batch-size', type=int, default=NotificationRetention.BATCH_SIZE, help='Zeilen pro Transaktion')
+        parser.add_argument('--loop', action='store_true', help='Dauerhaft laufen und alle --interval Sekunden wiederholen')
+        parser.add_argument('--interval', type=int, default=24 * 60 * 60, help='Abstand der Läufe im --loop-Modus')
+    
+    def handle(self, *args, **options):
+        try:
+            while True:
+                close_old_connections()
+                self.run_once(options)
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+    
+    def run_once(self, options):
+        batch_size = options['batch_size']
+        
+        deleted = NotificationRetention.prune(options['days'], batch_size=batch_size, archive_path=options['archive'])
+        self.stdout.write(f"{deleted} Benachrichtigungen gelöscht")
+        
+        if options['compact_after']:
+            summaries, removed = NotificationRetention.compact(options['compact_after'], batch_size=batch_size)
+            self.stdout.write(f"{removed} Benachrichtigungen zu {summaries} Zusammenfassungen verdichtet")
+        
+        if options['outbox_days']:
+            pruned = NotificationRetention.prune_outbox(options['outbox_days'], batch_size=batch_size)
+            self.stdout.write(f"{pruned} Outbox-Ereignisse gelöscht")
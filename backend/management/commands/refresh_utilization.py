@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+from backend.models import Booking
+from backend.services.analytics import UtilizationRollup
+
+
+class Command(BaseCommand):
+    help = 'Berechnet die täglichen Belegungs-Rollups neu (standardmäßig nur für kürzlich geänderte Tage)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--since-hours', type=int, default=25, help='Tage mit Änderungen der letzten N Stunden neu berechnen')
+        parser.add_argument('--start-date', help='Zeitraum neu berechnen: Startdatum (YYYY-MM-DD)')
+        parser.add_argument('--end-date', help='Zeitraum neu berechnen: Enddatum (YYYY-MM-DD)')
+        parser.add_argument('--all', action='store_true', help='Alle Tage mit Buchungen neu berechnen')
+    
+    def handle(self, *args, **options):
+        if options['all']:
+            bounds = Booking.objects.aggregate(first=Min('date'), last=Max('date'))
+            if not bounds['first']:
+                self.stdout.write("Keine Buchungen vorhanden")
+                return
+            written = UtilizationRollup.refresh_range(bounds['first'], bounds['last'])
+        elif options['start_date'] or options['end_date']:
+            try:
+                start_date = datetime.strptime(options['start_date'], '%Y-%m-%d').date()
+                end_date = datetime.strptime(options['end_date'], '%Y-%m-%d').date()
+            except (TypeError, ValueError):
+                raise CommandError('--start-date und --end-date im Format YYYY-MM-DD angeben')
+            written = UtilizationRollup.refresh_range(start_date, end_date)
+        else:
+            dates = UtilizationRollup.changed_dates(timezone.now() - timedelta(hours=options['since_hours']))
+            written = UtilizationRollup.refresh(dates)
+            self.stdout.write(f"{len(dates)} geänderte Tage")
+        
+        self.stdout.write(f"{written} Rollup-Zeilen geschrieben")
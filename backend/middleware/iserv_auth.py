@@ -1,5 +1,7 @@
 from django.contrib.auth.models import User
 from django.conf import settings
+from django.core.cache import cache
+import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,6 +18,21 @@ class IServAuthMiddleware:
     
     For development/testing outside IServ, it falls back to standard Django auth.
     """
+    ISERV_HEADERS = (
+        'HTTP_X_ISERV_USER',
+        'HTTP_X_ISERV_EMAIL',
+        'HTTP_X_ISERV_FIRSTNAME',
+        'HTTP_X_ISERV_LASTNAME',
+        'HTTP_X_ISERV_GROUPS',
+    )
+    FINGERPRINT_CACHE_KEY = 'sportoase:iserv:fingerprint:{username}'
+    FINGERPRINT_TIMEOUT = 24 * 60 * 60
+    
+    PERMISSION_NAMES = {
+        'user': 'Can use SportOase',
+        'admin': 'Can administer SportOase',
+    }
+    _permission_cache = {}
     
     def __init__(self, get_response):
         self.get_response = get_response
@@ -40,6 +57,10 @@ class IServAuthMiddleware:
         - HTTP_X_ISERV_GROUPS: Comma-separated list of groups
         
         Adjust header names based on your IServ configuration.
+        
+        A fingerprint of these headers is kept in the cache per username. If it
+        matches, the user and permissions are already in sync and only the user
+        row is read; otherwise only changed fields and permissions are written.
         """
         username = request.META.get('HTTP_X_ISERV_USER')
         
@@ -47,31 +68,81 @@ class IServAuthMiddleware:
             return
         
         try:
-            user, created = User.objects.get_or_create(
-                username=username,
-                defaults={
-                    'email': request.META.get('HTTP_X_ISERV_EMAIL', ''),
-                    'first_name': request.META.get('HTTP_X_ISERV_FIRSTNAME', ''),
-                    'last_name': request.META.get('HTTP_X_ISERV_LASTNAME', ''),
-                }
-            )
+            fingerprint = self._fingerprint(request)
+            fingerprint_key = self.FINGERPRINT_CACHE_KEY.format(username=username)
             
-            if not created:
-                user.email = request.META.get('HTTP_X_ISERV_EMAIL', user.email)
-                user.first_name = request.META.get('HTTP_X_ISERV_FIRSTNAME', user.first_name)
-                user.last_name = request.META.get('HTTP_X_ISERV_LASTNAME', user.last_name)
-                user.save()
+            user = None
+            if cache.get(fingerprint_key) == fingerprint:
+                user = User.objects.filter(username=username).first()
             
-            self._sync_permissions(user, request)
+            if user is None:
+                user = self._sync_user(username, request)
+                # Remember the headers only after a complete sync, otherwise the next request syncs again
+                if self._sync_permissions(user, request):
+                    cache.set(fingerprint_key, fingerprint, timeout=self.FINGERPRINT_TIMEOUT)
             
             from django.contrib.auth import login
             login(request, user, backend='django.contrib.auth.backends.ModelBackend')
             
             logger.info(f"IServ user authenticated: {username}")
-            
+        
         except Exception as e:
             logger.error(f"IServ authentication error: {str(e)}")
     
+    def _fingerprint(self, request):
+        """Hash over all IServ headers relevant for user data and permissions"""
+        values = [request.META.get(header, '') for header in self.ISERV_HEADERS]
+        return hashlib.sha1('\x1f'.join(values).encode('utf-8')).hexdigest()
+    
+    def _sync_user(self, username, request):
+        """Create the user or update only the fields that differ from the headers"""
+        user, created = User.objects.get_or_create(
+            username=username,
+            defaults={
+                'email': request.META.get('HTTP_X_ISERV_EMAIL', ''),
+                'first_name': request.META.get('HTTP_X_ISERV_FIRSTNAME', ''),
+                'last_name': request.META.get('HTTP_X_ISERV_LASTNAME', ''),
+            }
+        )
+        
+        if not created:
+            changed = []
+            for field, header in (
+                ('email', 'HTTP_X_ISERV_EMAIL'),
+                ('first_name', 'HTTP_X_ISERV_FIRSTNAME'),
+                ('last_name', 'HTTP_X_ISERV_LASTNAME'),
+            ):
+                value = request.META.get(header, getattr(user, field))
+                if getattr(user, field) != value:
+                    setattr(user, field, value)
+                    changed.append(field)
+            
+            if changed:
+                user.save(update_fields=changed)
+        
+        return user
+    
+    @classmethod
+    def _get_permission(cls, codename):
+        """
+        Resolve a SportOase permission once per process.
+        
+        The Permission objects never change at runtime, so the ContentType
+        lookup and get_or_create only run on the first login of each worker.
+        """
+        if codename not in cls._permission_cache:
+            from django.contrib.auth.models import Permission
+            from django.contrib.contenttypes.models import ContentType
+            
+            content_type = ContentType.objects.get_by_natural_key('backend', 'booking')
+            perm, _ = Permission.objects.get_or_create(
+                codename=codename,
+                content_type=content_type,
+                defaults={'name': cls.PERMISSION_NAMES[codename]},
+            )
+            cls._permission_cache[codename] = perm
+        return cls._permission_cache[codename]
+    
     def _sync_permissions(self, user, request):
         """
         Sync IServ groups/permissions to Django user permissions.
@@ -79,38 +150,39 @@ class IServAuthMiddleware:
         Maps IServ groups to Django permissions:
         - Teachers -> sportoase.user permission
         - Admins -> sportoase.admin permission
-        """
-        from django.contrib.auth.models import Permission
-        from django.contrib.contenttypes.models import ContentType
         
+        Only missing permissions are added; permissions granted manually
+        (or no longer granted by IServ) are left untouched.
+        
+        Returns:
+            True if the permissions are in sync, False after an error
+        """
         iserv_groups = request.META.get('HTTP_X_ISERV_GROUPS', '').split(',')
         iserv_groups = [g.strip().lower() for g in iserv_groups if g.strip()]
         
         try:
-            content_type = ContentType.objects.get(app_label='backend', model='booking')
-            
+            wanted = set()
             if 'lehrer' in iserv_groups or 'teachers' in iserv_groups:
-                perm, _ = Permission.objects.get_or_create(
-                    codename='user',
-                    name='Can use SportOase',
-                    content_type=content_type
-                )
-                user.user_permissions.add(perm)
+                wanted.add('user')
             
             if 'admin' in iserv_groups or 'administrators' in iserv_groups:
-                perm, _ = Permission.objects.get_or_create(
-                    codename='admin',
-                    name='Can administer SportOase',
-                    content_type=content_type
-                )
-                user.user_permissions.add(perm)
-                
-                admin_perm, _ = Permission.objects.get_or_create(
-                    codename='user',
-                    name='Can use SportOase',
-                    content_type=content_type
-                )
-                user.user_permissions.add(admin_perm)
+                wanted.update(['admin', 'user'])
             
+            managed = {codename: self._get_permission(codename) for codename in self.PERMISSION_NAMES}
+            current = set(
+                user.user_permissions.filter(
+                    id__in=[perm.id for perm in managed.values()]
+                ).values_list('id', flat=True)
+            )
+            wanted_ids = {managed[codename].id for codename in wanted}
+            
+            to_add = wanted_ids - current
+            if to_add:
+                user.user_permissions.add(*to_add)
+            return True
+        
         except Exception as e:
+            # Cached Permission objects may be stale (e.g. after a restore), resolve them again next time
+            type(self)._permission_cache.clear()
             logger.error(f"Error syncing permissions: {str(e)}")
+            return False
@@ -0,0 +1,34 @@
+from contextlib import ExitStack
+from django.db import connections
+from backend.middleware.query_timing import QueryRecorder
+from backend.services.metrics import Metrics, LATENCY_BUCKETS, QUERY_BUCKETS
+import time
+
+
+class MetricsMiddleware:
+    """
+    Erfasst Dauer und Anzahl der SQL-Abfragen jedes Requests pro View (Histogramme)
+    sowie die Statuscodes für /metrics
+    
+    Als Label dient der URL-Name (z.B. 'sportoase:create_booking'), damit die
+    Anzahl der Zeitreihen begrenzt bleibt; nicht aufgelöste URLs zählen als 'unmatched'.
+    """
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+        
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unmatched'
+        Metrics.observe('request_duration_seconds', elapsed, LATENCY_BUCKETS, view=view)
+        Metrics.observe('request_queries', recorder.count, QUERY_BUCKETS, view=view)
+        Metrics.inc('responses', view=view, status=response.status_code)
+        return response
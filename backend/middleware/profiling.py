@@ -0,0 +1,65 @@
+from backend.services.permission_cache import PermissionSnapshot
+from backend.services.profiling import ProfileStore
+import cProfile
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilingMiddleware:
+    """
+    Profiliert einzelne Requests von Admins mit cProfile
+    
+    Aktiviert wird das Profil pro Request über den Header 'X-SportOase-Profile: 1'
+    oder den Query-Parameter '_profile=1', und nur für Benutzer mit
+    sportoase.admin. Ohne Flag wird der Request unverändert durchgereicht.
+    Das Profil landet im ProfileStore, sein Name im Antwort-Header
+    X-SportOase-Profile. Steht hinter der Authentifizierung; Session- und
+    Anmeldungsaufwand ist daher nicht enthalten, bei Streaming-Antworten nur
+    die Zeit bis zum Beginn der Antwort.
+    """
+    HEADER = 'HTTP_X_SPORTOASE_PROFILE'
+    PARAMETER = '_profile'
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def _requested(self, request):
+        if self.HEADER in request.META:
+            return request.META[self.HEADER] not in ('', '0')
+        return request.GET.get(self.PARAMETER, '0') not in ('', '0')
+    
+    def __call__(self, request):
+        if not self._requested(request):
+            return self.get_response(request)
+        
+        user = getattr(request, 'user', None)
+        if not (user and user.is_authenticated and PermissionSnapshot.get(user)['admin']):
+            return self.get_response(request)
+        
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        duration_ms = (time.perf_counter() - started) * 1000
+        
+        try:
+            name = ProfileStore.save(profiler, {
+                'method': request.method,
+                'path': request.path,
+                'query': request.META.get('QUERY_STRING', ''),
+                'user': user.username,
+                'status': response.status_code,
+                'duration_ms': round(duration_ms, 1),
+            })
+        except OSError as e:
+            # Ein fehlgeschlagenes Profil darf den eigentlichen Request nicht scheitern lassen
+            logger.error(f"Profil für {request.path} konnte nicht gespeichert werden: {e}")
+            return response
+        
+        response['X-SportOase-Profile'] = name
+        return response
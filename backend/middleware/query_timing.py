@@ -0,0 +1,89 @@
+from collections import Counter
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class QueryRecorder:
+    """execute_wrapper, der Anzahl, Dauer und Text der SQL-Abfragen eines Requests sammelt"""
+    
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+    
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.statements[sql] += 1
+    
+    def duplicates(self, threshold):
+        """
+        Abfragen, die mit gleichem SQL-Text (ohne Parameter) mindestens threshold-mal liefen
+        
+        Typisches Zeichen für N+1: dieselbe Abfrage pro Objekt einer Liste.
+        
+        Returns:
+            Liste von (sql, Anzahl), häufigste zuerst
+        """
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+
+class QueryTimingMiddleware:
+    """
+    Misst Gesamtdauer, Anzahl und Dauer der SQL-Abfragen jedes Requests
+    
+    Opt-in über QUERY_TIMING_ENABLED. Jede Antwort bekommt einen
+    Server-Timing-Header (in den Entwicklertools des Browsers sichtbar):
+    
+        Server-Timing: db;dur=12.4;desc="18 Abfragen", total;dur=35.0, n1;desc="12x gleiche Abfrage"
+    
+    Requests ab QUERY_TIMING_SLOW_MS oder mit Abfragen, die mindestens
+    QUERY_TIMING_DUPLICATE_THRESHOLD-mal wiederholt wurden, werden als eine
+    JSON-Zeile geloggt. Bei Streaming-Antworten (Export, Änderungsstream)
+    zählt nur die Zeit bis zum Beginn der Antwort.
+    """
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, 'QUERY_TIMING_SLOW_MS', 500)
+        self.duplicate_threshold = getattr(settings, 'QUERY_TIMING_DUPLICATE_THRESHOLD', 5)
+    
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = recorder.duration * 1000
+        duplicates = recorder.duplicates(self.duplicate_threshold)
+        
+        metrics = [f'db;dur={db_ms:.1f};desc="{recorder.count} Abfragen"', f'total;dur={total_ms:.1f}']
+        if duplicates:
+            metrics.append(f'n1;desc="{duplicates[0][1]}x gleiche Abfrage"')
+        response['Server-Timing'] = ', '.join(metrics)
+        
+        if total_ms >= self.slow_ms or duplicates:
+            logger.warning(json.dumps({
+                'event': 'slow_request' if total_ms >= self.slow_ms else 'repeated_queries',
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'user': getattr(getattr(request, 'user', None), 'pk', None),
+                'total_ms': round(total_ms, 1),
+                'db_ms': round(db_ms, 1),
+                'queries': recorder.count,
+                'repeated': [{'sql': sql[:300], 'count': count} for sql, count in duplicates[:5]],
+            }, ensure_ascii=False))
+        return response
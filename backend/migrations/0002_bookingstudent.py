@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingStudent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('period', models.IntegerField()),
+                ('name', models.CharField(max_length=200)),
+                ('klasse', models.CharField(blank=True, max_length=50)),
+                ('name_norm', models.CharField(max_length=200)),
+                ('klasse_norm', models.CharField(blank=True, max_length=50)),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_rows', to='backend.booking')),
+            ],
+            options={
+                'db_table': 'sportoase_booking_students',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='bookingstudent',
+            constraint=models.UniqueConstraint(fields=('date', 'period', 'name_norm', 'klasse_norm'), name='sportoase_unique_student_per_slot'),
+        ),
+    ]
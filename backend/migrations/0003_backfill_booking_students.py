@@ -0,0 +1,113 @@
+import json
+import logging
+
+from django.db import migrations, transaction
+
+
+CHUNK_SIZE = 500
+
+logger = logging.getLogger('backend.migrations')
+
+
+def _normalize(value):
+    return (value or '').strip().lower()
+
+
+def backfill_booking_students(apps, schema_editor):
+    """
+    Überträgt Booking.students_json in die Tabelle sportoase_booking_students.
+
+    Läuft in Blöcken von CHUNK_SIZE Buchungen, jeder Block in einer eigenen
+    kurzen Transaktion, damit die Datenbank währenddessen benutzbar bleibt.
+    Bereits vorhandene Zeilen (z.B. von neuen Buchungen) werden übersprungen.
+
+    Ein Schüler kann pro Slot nur einmal in der Tabelle stehen. Doppelte
+    Einträge aus Altdaten (im selben Slot mehrfach gebucht) und Einträge, die
+    kein Objekt sind, werden nicht übernommen, sondern mit Buchungs-ID als
+    Warnung protokolliert, damit sie von Hand bereinigt werden können. Die
+    Belegungszähler (0005) zählen nur die übernommenen Schüler.
+    """
+    Booking = apps.get_model('backend', 'Booking')
+    BookingStudent = apps.get_model('backend', 'BookingStudent')
+
+    duplicates = 0
+    malformed = 0
+    last_id = 0
+    while True:
+        chunk = list(
+            Booking.objects.filter(id__gt=last_id)
+            .order_by('id')
+            .values('id', 'date', 'period', 'students_json')[:CHUNK_SIZE]
+        )
+        if not chunk:
+            break
+
+        # Bereits übernommene Schüler der betroffenen Tage: Schlüssel -> Buchungs-ID
+        taken = {
+            (row['date'], row['period'], row['name_norm'], row['klasse_norm']): row['booking_id']
+            for row in BookingStudent.objects.filter(date__in={booking['date'] for booking in chunk})
+            .values('date', 'period', 'name_norm', 'klasse_norm', 'booking_id')
+        }
+
+        rows = []
+        for booking in chunk:
+            try:
+                students = json.loads(booking['students_json'])
+            except (TypeError, ValueError):
+                students = None
+            if not isinstance(students, list):
+                malformed += 1
+                logger.warning(f"Buchung {booking['id']}: students_json ist keine Liste, keine Schüler übernommen")
+                continue
+            added = set()
+            for index, student in enumerate(students):
+                if not isinstance(student, dict):
+                    malformed += 1
+                    logger.warning(f"Buchung {booking['id']}: Schüler-Eintrag {index} ist kein Objekt ({student!r}), übersprungen")
+                    continue
+                key = (booking['date'], booking['period'], _normalize(student.get('name')), _normalize(student.get('klasse')))
+                if key in added or taken.get(key, booking['id']) != booking['id']:
+                    duplicates += 1
+                    other = booking['id'] if key in added else taken[key]
+                    logger.warning(
+                        f"Buchung {booking['id']}: {student.get('name', '')} ({student.get('klasse', '')}) ist am "
+                        f"{booking['date']} in der {booking['period']}. Stunde bereits in Buchung {other}, übersprungen"
+                    )
+                    continue
+                added.add(key)
+                if key in taken:
+                    continue
+                taken[key] = booking['id']
+                rows.append(BookingStudent(
+                    booking_id=booking['id'],
+                    date=booking['date'],
+                    period=booking['period'],
+                    name=student.get('name', ''),
+                    klasse=student.get('klasse', ''),
+                    name_norm=_normalize(student.get('name')),
+                    klasse_norm=_normalize(student.get('klasse')),
+                ))
+
+        with transaction.atomic():
+            BookingStudent.objects.bulk_create(rows, ignore_conflicts=True)
+
+        last_id = chunk[-1]['id']
+
+    if duplicates or malformed:
+        logger.warning(
+            f"BookingStudent-Backfill: {duplicates} doppelte und {malformed} ungültige Schüler-Einträge nicht übernommen "
+            f"(Details oben); Booking.students_json ist unverändert"
+        )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('backend', '0002_bookingstudent'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_booking_students, migrations.RunPython.noop),
+    ]
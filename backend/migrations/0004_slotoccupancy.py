@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:48
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0003_backfill_booking_students'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlotOccupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('period', models.IntegerField()),
+                ('student_count', models.IntegerField(default=0)),
+                ('version', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'sportoase_slot_occupancy',
+                'unique_together': {('date', 'period')},
+            },
+        ),
+    ]
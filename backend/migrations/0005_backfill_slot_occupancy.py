@@ -0,0 +1,63 @@
+from django.db import migrations, transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+CHUNK_SIZE = 500
+
+
+def backfill_slot_occupancy(apps, schema_editor):
+    """
+    Befüllt sportoase_slot_occupancy aus den Schülerzeilen bestehender Buchungen.
+
+    Fehlende Zähler werden aus einer Aggregatabfrage in Blöcken von CHUNK_SIZE
+    Zeilen angelegt. Danach wird jeder Zähler, auch ein bereits vorhandener
+    (z.B. von einer Buchung während der Migration), blockweise mit einem
+    UPDATE aus der aktuellen Zahl der Schülerzeilen neu berechnet.
+    """
+    BookingStudent = apps.get_model('backend', 'BookingStudent')
+    SlotOccupancy = apps.get_model('backend', 'SlotOccupancy')
+
+    counts = list(
+        BookingStudent.objects.values('date', 'period')
+        .annotate(student_count=Count('id'))
+        .order_by('date', 'period')
+    )
+
+    for start in range(0, len(counts), CHUNK_SIZE):
+        rows = [
+            SlotOccupancy(date=c['date'], period=c['period'], student_count=c['student_count'])
+            for c in counts[start:start + CHUNK_SIZE]
+        ]
+        with transaction.atomic():
+            SlotOccupancy.objects.bulk_create(rows, ignore_conflicts=True)
+
+    booked = Coalesce(
+        Subquery(
+            BookingStudent.objects.filter(date=OuterRef('date'), period=OuterRef('period'))
+            .order_by().values('date').annotate(count=Count('id')).values('count'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+    last_id = 0
+    while True:
+        ids = list(SlotOccupancy.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:CHUNK_SIZE])
+        if not ids:
+            break
+        with transaction.atomic():
+            SlotOccupancy.objects.filter(id__in=ids).update(student_count=booked)
+        last_id = ids[-1]
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('backend', '0004_slotoccupancy'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_slot_occupancy, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-17 22:56
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0005_backfill_slot_occupancy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='outbox_event_id',
+            field=models.BigIntegerField(blank=True, null=True, unique=True),
+        ),
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(max_length=50)),
+                ('payload_json', models.TextField(blank=True)),
+                ('status', models.CharField(choices=[('pending', 'Ausstehend'), ('processing', 'In Bearbeitung'), ('done', 'Erledigt'), ('failed', 'Fehlgeschlagen')], default='pending', max_length=20)),
+                ('attempts', models.IntegerField(default=0)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'sportoase_outbox',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'available_at'], name='sportoase_outbox_due_idx')],
+            },
+        ),
+    ]
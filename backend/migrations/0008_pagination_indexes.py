@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0007_notification_unread_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blockedslot',
+            index=models.Index(fields=['-date', 'period', 'id'], name='sportoase_blocked_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['-date', 'period', 'id'], name='sportoase_booking_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['-created_at', 'id'], name='sportoase_notif_page_idx'),
+        ),
+    ]
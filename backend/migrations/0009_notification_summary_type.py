@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0008_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('new_booking', 'Neue Buchung'), ('booking_updated', 'Buchung aktualisiert'), ('booking_deleted', 'Buchung gelöscht'), ('slot_blocked', 'Slot blockiert'), ('summary', 'Zusammenfassung')], max_length=50),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0009_notification_summary_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='series_key',
+            field=models.CharField(blank=True, db_index=True, max_length=36, null=True),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0010_booking_series_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyClassUtilization',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('klasse', models.CharField(blank=True, max_length=50)),
+                ('booking_count', models.IntegerField(default=0)),
+                ('student_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'sportoase_daily_class_utilization',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailySlotUtilization',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('weekday', models.CharField(max_length=3)),
+                ('period', models.IntegerField()),
+                ('teacher_id', models.IntegerField()),
+                ('teacher_name', models.CharField(max_length=100)),
+                ('offer_type', models.CharField(max_length=10)),
+                ('booking_count', models.IntegerField(default=0)),
+                ('student_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'sportoase_daily_slot_utilization',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyslotutilization',
+            constraint=models.UniqueConstraint(fields=('date', 'period', 'teacher_id', 'offer_type'), name='sportoase_unique_slot_utilization'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyclassutilization',
+            constraint=models.UniqueConstraint(fields=('date', 'klasse'), name='sportoase_unique_class_utilization'),
+        ),
+    ]
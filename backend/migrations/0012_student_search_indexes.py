@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0011_daily_utilization'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookingstudent',
+            index=models.Index(fields=['name_norm', 'date'], name='sportoase_student_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookingstudent',
+            index=models.Index(fields=['klasse_norm', 'date'], name='sportoase_student_klasse_idx'),
+        ),
+    ]
@@ -4,6 +4,11 @@ from django.utils import timezone
 import json
 
 
+def normalize_student_value(value):
+    """Normalisiert Name/Klasse eines Schülers für Vergleiche"""
+    return (value or '').strip().lower()
+
+
 class TimeSlot(models.Model):
     """Zeitslots mit anpassbaren Namen für verschiedene Perioden"""
     WEEKDAY_CHOICES = [
@@ -53,6 +58,9 @@ class Booking(models.Model):
     
     calendar_event_id = models.CharField(max_length=200, blank=True, null=True)
     
+    # Gemeinsamer Schlüssel aller Termine einer Serienbuchung
+    series_key = models.CharField(max_length=36, blank=True, null=True, db_index=True)
+    
     created_at = models.DateTimeField(default=timezone.now, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -62,6 +70,7 @@ class Booking(models.Model):
         indexes = [
             models.Index(fields=['date', 'period']),
             models.Index(fields=['teacher']),
+            models.Index(fields=['-date', 'period', 'id'], name='sportoase_booking_page_idx'),
         ]
     
     def __str__(self):
@@ -85,25 +94,117 @@ class Booking(models.Model):
         """Count of students in this booking"""
         return len(self.students)
     
-    def to_dict(self):
-        """Convert to dictionary for API responses"""
-        return {
-            'id': self.id,
-            'date': self.date.strftime('%Y-%m-%d'),
-            'weekday': self.weekday,
-            'period': self.period,
-            'teacher_id': self.teacher.id,
-            'teacher_name': self.teacher_name,
-            'teacher_class': self.teacher_class,
-            'teacher_email': self.teacher.email,
-            'students': self.students,
-            'student_count': self.student_count,
-            'offer_type': self.offer_type,
-            'offer_label': self.offer_label,
-            'calendar_event_id': self.calendar_event_id,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
+    DICT_FIELDS = {
+        'id': ['id'],
+        'date': ['date'],
+        'weekday': ['weekday'],
+        'period': ['period'],
+        'teacher_id': ['teacher'],
+        'teacher_name': ['teacher_name'],
+        'teacher_class': ['teacher_class'],
+        'teacher_email': ['teacher__email'],
+        'students': ['students_json'],
+        'student_count': ['students_json'],
+        'offer_type': ['offer_type'],
+        'offer_label': ['offer_label'],
+        'calendar_event_id': ['calendar_event_id'],
+        'series_key': ['series_key'],
+        'created_at': ['created_at'],
+        'updated_at': ['updated_at'],
+    }
+    
+    @classmethod
+    def columns_for_fields(cls, fields=None):
+        """Gibt die für to_dict(fields) benötigten Spalten (für QuerySet.only) zurück"""
+        columns = {'id', 'date', 'period'}
+        for field in fields or cls.DICT_FIELDS:
+            columns.update(cls.DICT_FIELDS[field])
+        return sorted(columns)
+    
+    def to_dict(self, fields=None):
+        """Convert to dictionary for API responses (optional nur mit ausgewählten Feldern)"""
+        if fields is None:
+            fields = self.DICT_FIELDS
+        students = self.students if 'students' in fields or 'student_count' in fields else None
+        values = {
+            'id': lambda: self.id,
+            'date': lambda: self.date.strftime('%Y-%m-%d'),
+            'weekday': lambda: self.weekday,
+            'period': lambda: self.period,
+            'teacher_id': lambda: self.teacher_id,
+            'teacher_name': lambda: self.teacher_name,
+            'teacher_class': lambda: self.teacher_class,
+            'teacher_email': lambda: self.teacher.email,
+            'students': lambda: students,
+            'student_count': lambda: len(students),
+            'offer_type': lambda: self.offer_type,
+            'offer_label': lambda: self.offer_label,
+            'calendar_event_id': lambda: self.calendar_event_id,
+            'series_key': lambda: self.series_key,
+            'created_at': lambda: self.created_at.isoformat(),
+            'updated_at': lambda: self.updated_at.isoformat(),
         }
+        return {field: values[field]() for field in fields}
+
+
+class BookingStudent(models.Model):
+    """Einzelner Schüler einer Buchung mit normalisierten Spalten für indizierte Abfragen"""
+    booking = models.ForeignKey(Booking, on_delete=models.CASCADE, related_name='student_rows')
+    date = models.DateField()
+    period = models.IntegerField()
+    
+    name = models.CharField(max_length=200)
+    klasse = models.CharField(max_length=50, blank=True)
+    name_norm = models.CharField(max_length=200)
+    klasse_norm = models.CharField(max_length=50, blank=True)
+    
+    class Meta:
+        db_table = 'sportoase_booking_students'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'period', 'name_norm', 'klasse_norm'],
+                name='sportoase_unique_student_per_slot',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['name_norm', 'date'], name='sportoase_student_name_idx'),
+            models.Index(fields=['klasse_norm', 'date'], name='sportoase_student_klasse_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} - {self.period}. Stunde: {self.name} ({self.klasse})"
+    
+    @classmethod
+    def rows_for_booking(cls, booking):
+        """Erzeugt (ungespeicherte) Schülerzeilen aus den Schülern einer Buchung"""
+        return [
+            cls(
+                booking=booking,
+                date=booking.date,
+                period=booking.period,
+                name=student.get('name', ''),
+                klasse=student.get('klasse', ''),
+                name_norm=normalize_student_value(student.get('name')),
+                klasse_norm=normalize_student_value(student.get('klasse')),
+            )
+            for student in booking.students
+        ]
+
+
+class SlotOccupancy(models.Model):
+    """Laufender Belegungszähler pro Datum und Stunde, wird in der Buchungstransaktion gepflegt"""
+    date = models.DateField()
+    period = models.IntegerField()
+    student_count = models.IntegerField(default=0)
+    version = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        unique_together = ['date', 'period']
+        db_table = 'sportoase_slot_occupancy'
+    
+    def __str__(self):
+        return f"{self.date} - {self.period}. Stunde: {self.student_count} Schüler (v{self.version})"
 
 
 class BlockedSlot(models.Model):
@@ -122,6 +223,7 @@ class BlockedSlot(models.Model):
         db_table = 'sportoase_blocked_slots'
         indexes = [
             models.Index(fields=['date', 'period']),
+            models.Index(fields=['-date', 'period', 'id'], name='sportoase_blocked_page_idx'),
         ]
     
     def __str__(self):
@@ -148,21 +250,29 @@ class Notification(models.Model):
         ('booking_updated', 'Buchung aktualisiert'),
         ('booking_deleted', 'Buchung gelöscht'),
         ('slot_blocked', 'Slot blockiert'),
+        ('summary', 'Zusammenfassung'),
     ]
     
     booking = models.ForeignKey(Booking, on_delete=models.CASCADE, related_name='notifications', null=True, blank=True)
     notification_type = models.CharField(max_length=50, choices=NOTIFICATION_TYPES)
     message = models.CharField(max_length=500)
     
-    is_read = models.BooleanField(default=False, db_index=True)
+    is_read = models.BooleanField(default=False)
     read_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now, db_index=True)
     
     metadata_json = models.TextField(blank=True)
     
+    # Ereignis, aus dem die Benachrichtigung entstanden ist (siehe OutboxEvent)
+    outbox_event_id = models.BigIntegerField(null=True, blank=True, unique=True)
+    
     class Meta:
         ordering = ['-created_at']
         db_table = 'sportoase_notifications'
+        indexes = [
+            models.Index(fields=['is_read', 'created_at'], name='sportoase_notif_unread_idx'),
+            models.Index(fields=['-created_at', 'id'], name='sportoase_notif_page_idx'),
+        ]
     
     def __str__(self):
         return f"{self.get_notification_type_display()}: {self.message[:50]}"
@@ -186,7 +296,7 @@ class Notification(models.Model):
         """Convert to dictionary for API responses"""
         return {
             'id': self.id,
-            'booking_id': self.booking.id if self.booking else None,
+            'booking_id': self.booking_id,
             'notification_type': self.notification_type,
             'message': self.message,
             'is_read': self.is_read,
@@ -194,3 +304,95 @@ class Notification(models.Model):
             'created_at': self.created_at.isoformat(),
             'metadata': self.metadata,
         }
+
+
+class DailySlotUtilization(models.Model):
+    """Vorberechnete Belegung pro Tag, Stunde, Lehrkraft und Angebotsart (siehe UtilizationRollup)"""
+    date = models.DateField()
+    weekday = models.CharField(max_length=3)
+    period = models.IntegerField()
+    teacher_id = models.IntegerField()
+    teacher_name = models.CharField(max_length=100)
+    offer_type = models.CharField(max_length=10)
+    
+    booking_count = models.IntegerField(default=0)
+    student_count = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'sportoase_daily_slot_utilization'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'period', 'teacher_id', 'offer_type'],
+                name='sportoase_unique_slot_utilization',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} - {self.period}. Stunde: {self.student_count} Schüler ({self.teacher_name})"
+
+
+class DailyClassUtilization(models.Model):
+    """Vorberechnete Anzahl gebuchter Schüler und Buchungen pro Tag und Klasse"""
+    date = models.DateField()
+    klasse = models.CharField(max_length=50, blank=True)
+    
+    booking_count = models.IntegerField(default=0)
+    student_count = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'sportoase_daily_class_utilization'
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'klasse'], name='sportoase_unique_class_utilization'),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} - {self.klasse}: {self.student_count} Schüler"
+
+class OutboxEvent(models.Model):
+    """
+    Ereignisse, die in der Buchungstransaktion geschrieben und später vom
+    Worker (manage.py process_outbox) verarbeitet werden
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Ausstehend'),
+        (STATUS_PROCESSING, 'In Bearbeitung'),
+        (STATUS_DONE, 'Erledigt'),
+        (STATUS_FAILED, 'Fehlgeschlagen'),
+    ]
+    
+    event_type = models.CharField(max_length=50)
+    payload_json = models.TextField(blank=True)
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.IntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(default=timezone.now)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['id']
+        db_table = 'sportoase_outbox'
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='sportoase_outbox_due_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.event_type} #{self.id} ({self.status})"
+    
+    @property
+    def payload(self):
+        """Parse payload from JSON"""
+        if not self.payload_json:
+            return {}
+        return json.loads(self.payload_json)
+    
+    @payload.setter
+    def payload(self, value):
+        """Set payload as JSON"""
+        self.payload_json = json.dumps(value, ensure_ascii=False, default=str)
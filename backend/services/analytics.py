@@ -0,0 +1,189 @@
+from datetime import datetime, timedelta
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+from backend.models import (
+    Booking, BookingStudent, BlockedSlot, TimeSlot, DailySlotUtilization, DailyClassUtilization, OutboxEvent
+)
+from backend.services.booking_service import WEEKDAY_CODES
+import json
+
+
+MAX_ANALYTICS_DAYS = 400
+
+GROUPINGS = ['slot', 'weekday', 'date', 'teacher', 'offer_type', 'class']
+
+# Outbox-Ereignisse, nach denen die Rollups der betroffenen Tage neu berechnet werden
+BOOKING_EVENTS = ['booking_created', 'booking_deleted', 'booking_series_created']
+
+
+class UtilizationRollup:
+    """
+    Tägliche Belegungs-Rollups für Auswertungen
+    
+    Die Tabellen werden pro Tag komplett neu berechnet, aber nur für Tage mit
+    Änderungen: der Outbox-Worker ruft refresh() für die Tage neuer und
+    gelöschter Buchungen auf, zusätzlich kann manage.py refresh_utilization
+    ganze Zeiträume nachziehen. Auswertungen lesen ausschließlich die Rollups.
+    """
+    
+    @staticmethod
+    @transaction.atomic
+    def refresh(dates):
+        """
+        Berechnet die Rollups für die übergebenen Tage neu
+        
+        Args:
+            dates: Iterable von datetime.date objects
+        
+        Returns:
+            Anzahl geschriebener Rollup-Zeilen
+        """
+        dates = sorted(set(dates))
+        if not dates:
+            return 0
+        
+        slot_rows = (
+            Booking.objects.filter(date__in=dates)
+            .values('date', 'weekday', 'period', 'teacher_id', 'offer_type')
+            .annotate(
+                teacher_name=Max('teacher_name'),
+                booking_count=Count('id', distinct=True),
+                student_count=Count('student_rows'),
+            )
+            .order_by()
+        )
+        class_rows = (
+            BookingStudent.objects.filter(date__in=dates)
+            .values('date', 'klasse_norm')
+            .annotate(booking_count=Count('booking_id', distinct=True), student_count=Count('id'))
+            .order_by()
+        )
+        
+        DailySlotUtilization.objects.filter(date__in=dates).delete()
+        DailyClassUtilization.objects.filter(date__in=dates).delete()
+        slots = DailySlotUtilization.objects.bulk_create([DailySlotUtilization(**row) for row in slot_rows])
+        classes = DailyClassUtilization.objects.bulk_create([
+            DailyClassUtilization(
+                date=row['date'],
+                klasse=row['klasse_norm'],
+                booking_count=row['booking_count'],
+                student_count=row['student_count'],
+            )
+            for row in class_rows
+        ])
+        return len(slots) + len(classes)
+    
+    @staticmethod
+    def event_dates(payload):
+        """Gibt die Tage eines Outbox-Ereignisses ('date' oder 'dates') als date objects zurück"""
+        values = payload['dates'] if 'dates' in payload else [payload['date']]
+        return [datetime.strptime(value, '%Y-%m-%d').date() for value in values]
+    
+    @classmethod
+    def changed_dates(cls, since):
+        """
+        Tage mit Buchungsänderungen seit einem Zeitpunkt
+        
+        Gelöschte Buchungen sind nur noch über ihr Outbox-Ereignis erkennbar,
+        deshalb werden beide Quellen ausgewertet.
+        """
+        dates = set(Booking.objects.filter(updated_at__gte=since).values_list('date', flat=True).distinct())
+        events = OutboxEvent.objects.filter(created_at__gte=since, event_type__in=BOOKING_EVENTS)
+        for payload_json in events.values_list('payload_json', flat=True):
+            dates.update(cls.event_dates(json.loads(payload_json)))
+        return sorted(dates)
+    
+    @classmethod
+    def refresh_range(cls, start_date, end_date, chunk_days=31):
+        """Berechnet einen Zeitraum in Blöcken von chunk_days Tagen neu (je eine Transaktion)"""
+        written = 0
+        current = start_date
+        while current <= end_date:
+            chunk_end = min(current + timedelta(days=chunk_days - 1), end_date)
+            written += cls.refresh([current + timedelta(days=i) for i in range((chunk_end - current).days + 1)])
+            current = chunk_end + timedelta(days=1)
+        return written
+    
+    @staticmethod
+    def _slot_capacity(start_date, end_date):
+        """
+        Plätze pro (weekday, period) im Zeitraum: Anzahl der Termine ohne
+        Blockierung mal max_students des TimeSlots
+        """
+        occurrences = {code: 0 for code in WEEKDAY_CODES}
+        for i in range((end_date - start_date).days + 1):
+            occurrences[WEEKDAY_CODES[(start_date + timedelta(days=i)).weekday()]] += 1
+        
+        blocked = {
+            (row['weekday'], row['period']): row['count']
+            for row in BlockedSlot.objects.filter(date__gte=start_date, date__lte=end_date)
+            .values('weekday', 'period').annotate(count=Count('id')).order_by()
+        }
+        return {
+            (weekday, period): (occurrences[weekday] - blocked.get((weekday, period), 0)) * max_students
+            for weekday, period, max_students in TimeSlot.objects.values_list('weekday', 'period', 'max_students')
+        }
+    
+    @classmethod
+    def report(cls, start_date, end_date, group_by='slot'):
+        """
+        Aggregiert die Rollups eines Zeitraums
+        
+        Args:
+            start_date: datetime.date object (inklusive)
+            end_date: datetime.date object (inklusive)
+            group_by: 'slot' (Wochentag und Stunde, mit Auslastung), 'weekday', 'date',
+                      'teacher', 'offer_type' oder 'class'
+        
+        Returns:
+            Liste von Dicts mit den Gruppierungsfeldern, 'booking_count' und 'student_count'
+        """
+        if group_by not in GROUPINGS:
+            raise ValueError(f"Ungültige Gruppierung, erlaubt: {', '.join(GROUPINGS)}")
+        if end_date < start_date:
+            raise ValueError("Das Enddatum liegt vor dem Startdatum")
+        if (end_date - start_date).days + 1 > MAX_ANALYTICS_DAYS:
+            raise ValueError(f"Der Zeitraum darf höchstens {MAX_ANALYTICS_DAYS} Tage umfassen")
+        
+        totals = {'booking_count': Sum('booking_count'), 'student_count': Sum('student_count')}
+        
+        if group_by == 'class':
+            rows = (
+                DailyClassUtilization.objects.filter(date__gte=start_date, date__lte=end_date)
+                .values('klasse').annotate(**totals).order_by('klasse')
+            )
+            return list(rows)
+        
+        slots = DailySlotUtilization.objects.filter(date__gte=start_date, date__lte=end_date)
+        if group_by == 'teacher':
+            rows = slots.values('teacher_id').annotate(teacher_name=Max('teacher_name'), **totals).order_by('-student_count')
+            return list(rows)
+        if group_by == 'offer_type':
+            return list(slots.values('offer_type').annotate(**totals).order_by('offer_type'))
+        if group_by == 'date':
+            return [
+                {**row, 'date': row['date'].strftime('%Y-%m-%d')}
+                for row in slots.values('date').annotate(**totals).order_by('date')
+            ]
+        if group_by == 'weekday':
+            rows = {row['weekday']: row for row in slots.values('weekday').annotate(**totals).order_by()}
+            return [rows[code] for code in WEEKDAY_CODES if code in rows]
+        
+        capacity = cls._slot_capacity(start_date, end_date)
+        used = {
+            (row['weekday'], row['period']): row
+            for row in slots.values('weekday', 'period').annotate(**totals).order_by()
+        }
+        result = []
+        for weekday, period in sorted(capacity, key=lambda key: (WEEKDAY_CODES.index(key[0]), key[1])):
+            row = used.get((weekday, period), {'booking_count': 0, 'student_count': 0})
+            seats = capacity[(weekday, period)]
+            result.append({
+                'weekday': weekday,
+                'period': period,
+                'booking_count': row['booking_count'],
+                'student_count': row['student_count'],
+                'capacity': seats,
+                'utilization': round(row['student_count'] / seats, 4) if seats > 0 else None,
+            })
+        return result
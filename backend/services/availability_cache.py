@@ -0,0 +1,186 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+import threading
+import time
+
+
+class AvailabilityCache:
+    """
+    Versionierter Cache für die Slot-Verfügbarkeit einzelner Tage
+    
+    Jeder Tag hat einen eigenen Versionszähler, zusätzlich gibt es einen globalen
+    Zähler für Änderungen, die alle Tage betreffen (z.B. TimeSlot-Labels). Die
+    Schlüssel der gecachten Tage enthalten beide Versionen, sodass ein Erhöhen
+    der Version alte Einträge sofort unsichtbar macht. Mit einem prozessübergreifenden
+    Backend (FileBasedCache, DatabaseCache, Redis) teilen sich alle WSGI-Worker
+    denselben Stand.
+    """
+    KEY_PREFIX = 'sportoase:availability'
+    GLOBAL_VERSION_KEY = f'{KEY_PREFIX}:version:global'
+    HITS_KEY = f'{KEY_PREFIX}:stats:hits'
+    MISSES_KEY = f'{KEY_PREFIX}:stats:misses'
+    
+    STATS_FLUSH_INTERVAL = 50
+    
+    _lock = threading.Lock()
+    _local_stats = {'hits': 0, 'misses': 0}
+    _pending_stats = {'hits': 0, 'misses': 0}
+    
+    @classmethod
+    def _cache(cls):
+        return caches[getattr(settings, 'AVAILABILITY_CACHE_ALIAS', 'default')]
+    
+    @classmethod
+    def _timeout(cls):
+        return getattr(settings, 'AVAILABILITY_CACHE_TIMEOUT', 24 * 60 * 60)
+    
+    @classmethod
+    def _version_key(cls, date):
+        return f'{cls.KEY_PREFIX}:version:{date.isoformat()}'
+    
+    @classmethod
+    def _data_key(cls, date, global_version, version, variant):
+        return f'{cls.KEY_PREFIX}:day:{variant}:{date.isoformat()}:{global_version}:{version}'
+    
+    @staticmethod
+    def _initial_version():
+        # Zeitbasierter Startwert: geht ein Zähler verloren (Eviction, Neustart),
+        # kollidiert die neue Version nicht mit einer früher ausgelieferten.
+        return time.time_ns() // 1000
+    
+    @classmethod
+    def get_versions(cls, dates):
+        """
+        Gibt die aktuellen Versionen für die übergebenen Tage zurück
+        
+        Returns:
+            Tuple (globale Version, Dict date -> Version)
+        """
+        cache = cls._cache()
+        keys = {cls._version_key(date): date for date in dates}
+        keys[cls.GLOBAL_VERSION_KEY] = None
+        
+        found = cache.get_many(list(keys))
+        missing = [key for key in keys if key not in found]
+        if missing:
+            for key in missing:
+                cache.add(key, cls._initial_version(), timeout=None)
+            found.update(cache.get_many(missing))
+        
+        versions = {date: found.get(key, 0) for key, date in keys.items() if date is not None}
+        return found.get(cls.GLOBAL_VERSION_KEY, 0), versions
+    
+    @classmethod
+    def get_range(cls, start_date, end_date, loader, variant='full'):
+        """
+        Gibt die Tage eines Zeitraums aus dem Cache zurück
+        
+        Fehlende Tage werden mit einem einzigen Aufruf von loader(start, end) für
+        die Spanne der fehlenden Tage nachgeladen und in den Cache geschrieben.
+        
+        Args:
+            start_date: datetime.date object (inklusive)
+            end_date: datetime.date object (inklusive)
+            loader: Callable (start_date, end_date) -> List von Tages-Dictionaries
+            variant: Name der Darstellung (z.B. 'full' oder 'summary'), wird getrennt gecacht
+        
+        Returns:
+            List von Dictionaries mit 'date', 'weekday' und 'slots' pro Tag
+        """
+        dates = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        return cls._get_days(dates, loader, variant)
+    
+    @classmethod
+    def _get_days(cls, dates, loader, variant):
+        cache = cls._cache()
+        global_version, versions = cls.get_versions(dates)
+        keys = {date: cls._data_key(date, global_version, versions[date], variant) for date in dates}
+        
+        found = cache.get_many(list(keys.values()))
+        missing = [date for date in dates if keys[date] not in found]
+        cls._record(hits=len(dates) - len(missing), misses=len(missing))
+        
+        if missing:
+            loaded = loader(min(missing), max(missing))
+            by_date = {day['date']: day for day in loaded}
+            fresh = {}
+            for date in missing:
+                day = by_date.get(date.strftime('%Y-%m-%d'))
+                if day is not None:
+                    fresh[keys[date]] = day
+            cache.set_many(fresh, timeout=cls._timeout())
+            found.update(fresh)
+        
+        return [found[keys[date]] for date in dates if keys[date] in found]
+    
+    @classmethod
+    def invalidate(cls, *dates):
+        """Erhöht die Version der Tage, sobald die laufende Transaktion committed ist"""
+        def bump():
+            cache = cls._cache()
+            for date in set(dates):
+                cls._bump(cache, cls._version_key(date))
+        transaction.on_commit(bump)
+    
+    @classmethod
+    def invalidate_all(cls):
+        """Erhöht die globale Version, sobald die laufende Transaktion committed ist"""
+        transaction.on_commit(lambda: cls._bump(cls._cache(), cls.GLOBAL_VERSION_KEY))
+    
+    @classmethod
+    def _bump(cls, cache, key):
+        if not cache.add(key, cls._initial_version(), timeout=None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, cls._initial_version(), timeout=None)
+    
+    @classmethod
+    def _record(cls, hits, misses):
+        with cls._lock:
+            cls._local_stats['hits'] += hits
+            cls._local_stats['misses'] += misses
+            cls._pending_stats['hits'] += hits
+            cls._pending_stats['misses'] += misses
+            pending = dict(cls._pending_stats)
+            if sum(pending.values()) < cls.STATS_FLUSH_INTERVAL:
+                return
+            cls._pending_stats = {'hits': 0, 'misses': 0}
+        cls._flush_stats(pending)
+    
+    @classmethod
+    def _flush_stats(cls, pending):
+        cache = cls._cache()
+        for key, value in ((cls.HITS_KEY, pending['hits']), (cls.MISSES_KEY, pending['misses'])):
+            if not value:
+                continue
+            if not cache.add(key, value, timeout=None):
+                try:
+                    cache.incr(key, value)
+                except ValueError:
+                    cache.set(key, value, timeout=None)
+    
+    @classmethod
+    def stats(cls):
+        """
+        Gibt die Hit/Miss-Zähler zurück
+        
+        'process' enthält die Zähler dieses Worker-Prozesses, 'shared' die im
+        Cache aufsummierten Zähler aller Prozesse (in Blöcken von
+        STATS_FLUSH_INTERVAL Zugriffen aktualisiert).
+        """
+        with cls._lock:
+            local = dict(cls._local_stats)
+        shared_values = cls._cache().get_many([cls.HITS_KEY, cls.MISSES_KEY])
+        shared = {
+            'hits': shared_values.get(cls.HITS_KEY, 0),
+            'misses': shared_values.get(cls.MISSES_KEY, 0),
+        }
+        
+        def with_ratio(counters):
+            total = counters['hits'] + counters['misses']
+            return {**counters, 'hit_ratio': round(counters['hits'] / total, 4) if total else None}
+        
+        return {'process': with_ratio(local), 'shared': with_ratio(shared)}
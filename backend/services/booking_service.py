@@ -1,72 +1,219 @@
-from datetime import datetime, timedelta
-from django.db.models import Q, Count, Sum
-from django.db import transaction
-from backend.models import Booking, TimeSlot, BlockedSlot, Notification
+from datetime import timedelta
+from django.db.models import Q, F, Count, Sum
+from django.db import transaction, IntegrityError
+from django.utils import timezone
+from backend.models import (
+    Booking, BookingStudent, SlotOccupancy, TimeSlot, BlockedSlot, Notification, normalize_student_value
+)
+from backend.services.availability_cache import AvailabilityCache
+from backend.services.permission_cache import PermissionSnapshot
+from backend.services.outbox import Outbox
+from backend.services.change_feed import ChangeFeed
+from backend.services.metrics import Metrics
+from backend.db.retry import retry_on_lock
 import json
+import uuid
+
+
+WEEKDAY_CODES = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+MAX_RANGE_DAYS = 92
+
+MAX_SERIES_DAYS = 190
+
+MAX_STUDENT_SEARCH_DAYS = 400
+
+MAX_STUDENT_SEARCH_RESULTS = 500
+
+SLOT_FIELDS = [
+    'period', 'weekday', 'label', 'start_time', 'end_time', 'max_students',
+    'current_students', 'available_spots', 'is_available', 'is_blocked',
+    'blocked_reason', 'booking_count', 'bookings',
+]
+
+
+class StudentConflictError(ValueError):
+    """Ein oder mehrere Schüler sind für den gewünschten Slot bereits gebucht"""
+    
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        super().__init__(' '.join(c['booking_info'] for c in conflicts))
+
+
+class CapacityExceededError(ValueError):
+    """Der Slot hat nicht mehr genügend freie Plätze"""
+    pass
+
+
+class SeriesConflictError(ValueError):
+    """Mindestens ein Termin einer Serienbuchung ist nicht buchbar"""
+    
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        super().__init__(f"{len(conflicts)} Termin(e) der Serie sind nicht buchbar.")
 
 
 class BookingService:
     """Service-Klasse für Buchungslogik"""
     
     @staticmethod
-    def get_available_slots(date, user=None):
+    def get_available_slots(date, user=None, include_bookings=True, booking_fields=None):
         """
         Gibt alle verfügbaren Slots für ein bestimmtes Datum zurück
         
         Args:
             date: datetime.date object
             user: Optional - Django User object für Filterung
+            include_bookings: False liefert nur Zähler und Flags ohne eingebettete Buchungen
+            booking_fields: Optional - Liste der Buchungsfelder (siehe Booking.DICT_FIELDS)
         
         Returns:
             List von Dictionaries mit Slot-Informationen
         """
-        weekday_map = {
-            0: 'Mon', 1: 'Tue', 2: 'Wed', 3: 'Thu', 4: 'Fri',
-            5: 'Sat', 6: 'Sun'
-        }
-        weekday = weekday_map.get(date.weekday(), 'Mon')
+        return BookingService.get_slots_for_range(date, date, user, include_bookings, booking_fields)[0]['slots']
+    
+    @staticmethod
+    def get_slots_for_range(start_date, end_date, user=None, include_bookings=True, booking_fields=None):
+        """
+        Gibt die Slots aller Tage eines Zeitraums zurück
         
-        timeslots = TimeSlot.objects.filter(weekday=weekday).order_by('period')
+        Die Tage werden aus dem AvailabilityCache gelesen; nur fehlende oder
+        veraltete Tage werden über load_slots_for_range aus der Datenbank geladen.
         
-        bookings = Booking.objects.filter(date=date)
-        blocked_slots = BlockedSlot.objects.filter(date=date)
+        Args:
+            start_date: datetime.date object (inklusive)
+            end_date: datetime.date object (inklusive)
+            user: Optional - Django User object für Filterung
+            include_bookings: False liefert nur Zähler und Flags ohne eingebettete Buchungen
+            booking_fields: Optional - Liste der Buchungsfelder (siehe Booking.DICT_FIELDS)
         
-        booking_dict = {}
-        for booking in bookings:
-            period = booking.period
-            if period not in booking_dict:
-                booking_dict[period] = []
-            booking_dict[period].append(booking)
+        Returns:
+            List von Dictionaries mit 'date', 'weekday' und 'slots' pro Tag
+        """
+        if not include_bookings:
+            variant = 'summary'
+        elif booking_fields:
+            variant = 'full:' + ','.join(sorted(booking_fields))
+        else:
+            variant = 'full'
         
-        blocked_dict = {bs.period: bs for bs in blocked_slots}
+        def loader(start, end):
+            return BookingService.load_slots_for_range(start, end, include_bookings, booking_fields)
         
-        result = []
-        for slot in timeslots:
-            period_bookings = booking_dict.get(slot.period, [])
-            student_count = sum(b.student_count for b in period_bookings)
-            
-            is_blocked = slot.period in blocked_dict
-            is_available = not is_blocked and student_count < slot.max_students
+        return AvailabilityCache.get_range(start_date, end_date, loader, variant)
+    
+    @staticmethod
+    def load_slots_for_range(start_date, end_date, include_bookings=True, booking_fields=None):
+        """
+        Lädt die Slots aller Tage eines Zeitraums direkt aus der Datenbank
+        
+        Lädt Zeitslots, Buchungen (inkl. Lehrkraft), Blockierungen und Belegungen
+        mit je einer Abfrage für den gesamten Zeitraum und gruppiert im Speicher.
+        Die Anzahl der Abfragen ist damit unabhängig von der Länge des Zeitraums.
+        Ohne eingebettete Buchungen werden statt der Buchungszeilen nur die
+        Buchungsanzahlen pro Slot abgefragt; mit booking_fields werden nur die
+        dafür nötigen Spalten geladen.
+        
+        Args:
+            start_date: datetime.date object (inklusive)
+            end_date: datetime.date object (inklusive)
+            include_bookings: False liefert nur Zähler und Flags ohne eingebettete Buchungen
+            booking_fields: Optional - Liste der Buchungsfelder (siehe Booking.DICT_FIELDS)
+        
+        Returns:
+            List von Dictionaries mit 'date', 'weekday' und 'slots' pro Tag
+        """
+        timeslot_dict = {}
+        for slot in TimeSlot.objects.all().order_by('period'):
+            timeslot_dict.setdefault(slot.weekday, []).append(slot)
+        
+        booking_dict = {}
+        booking_counts = {}
+        if include_bookings:
+            bookings = Booking.objects.filter(
+                date__range=(start_date, end_date)
+            ).order_by('date', 'period', 'id')
+            columns = Booking.columns_for_fields(booking_fields)
+            if 'teacher__email' in columns:
+                bookings = bookings.select_related('teacher')
+            bookings = bookings.only(*columns)
             
-            slot_info = {
-                'period': slot.period,
-                'weekday': slot.weekday,
-                'label': slot.label,
-                'start_time': slot.start_time.strftime('%H:%M'),
-                'end_time': slot.end_time.strftime('%H:%M'),
-                'max_students': slot.max_students,
-                'current_students': student_count,
-                'available_spots': max(0, slot.max_students - student_count),
-                'is_available': is_available,
-                'is_blocked': is_blocked,
-                'blocked_reason': blocked_dict[slot.period].reason if is_blocked else None,
-                'bookings': [b.to_dict() for b in period_bookings],
-            }
+            for booking in bookings:
+                key = (booking.date, booking.period)
+                booking_dict.setdefault(key, []).append(booking.to_dict(booking_fields))
+            booking_counts = {key: len(items) for key, items in booking_dict.items()}
+        else:
+            counts = Booking.objects.filter(
+                date__range=(start_date, end_date)
+            ).order_by().values_list('date', 'period').annotate(count=Count('id'))
+            booking_counts = {(date, period): count for date, period, count in counts}
+        
+        blocked_slots = BlockedSlot.objects.filter(
+            date__range=(start_date, end_date)
+        ).values_list('date', 'period', 'reason')
+        occupancy = SlotOccupancy.objects.filter(
+            date__range=(start_date, end_date)
+        ).values_list('date', 'period', 'student_count')
+        
+        blocked_dict = {(date, period): reason for date, period, reason in blocked_slots}
+        student_counts = {(date, period): count for date, period, count in occupancy}
+        
+        result = []
+        date = start_date
+        while date <= end_date:
+            day_slots = []
+            for slot in timeslot_dict.get(WEEKDAY_CODES[date.weekday()], []):
+                key = (date, slot.period)
+                student_count = student_counts.get(key, 0)
+                
+                is_blocked = key in blocked_dict
+                is_available = not is_blocked and student_count < slot.max_students
+                
+                slot_info = {
+                    'period': slot.period,
+                    'weekday': slot.weekday,
+                    'label': slot.label,
+                    'start_time': slot.start_time.strftime('%H:%M'),
+                    'end_time': slot.end_time.strftime('%H:%M'),
+                    'max_students': slot.max_students,
+                    'current_students': student_count,
+                    'available_spots': max(0, slot.max_students - student_count),
+                    'is_available': is_available,
+                    'is_blocked': is_blocked,
+                    'blocked_reason': blocked_dict.get(key),
+                    'booking_count': booking_counts.get(key, 0),
+                }
+                if include_bookings:
+                    slot_info['bookings'] = booking_dict.get(key, [])
+                
+                day_slots.append(slot_info)
             
-            result.append(slot_info)
+            result.append({
+                'date': date.strftime('%Y-%m-%d'),
+                'weekday': date.strftime('%A'),
+                'slots': day_slots,
+            })
+            date += timedelta(days=1)
         
         return result
     
+    @staticmethod
+    def project_slots(slots, fields):
+        """Reduziert Slot-Dictionaries auf die angegebenen Felder"""
+        return [{field: slot[field] for field in fields if field in slot} for slot in slots]
+    
+    @staticmethod
+    def slots_to_columns(slots, fields=None):
+        """
+        Wandelt eine Slot-Liste in parallele Arrays um (ein Array pro Feld)
+        
+        Returns:
+            Dict Feldname -> Liste der Werte in Slot-Reihenfolge
+        """
+        if fields is None:
+            fields = list(slots[0].keys()) if slots else []
+        return {field: [slot.get(field) for slot in slots] for field in fields}
+    
     @staticmethod
     def check_student_double_booking(student_name, student_class, date, period, exclude_booking_id=None):
         """
@@ -75,24 +222,116 @@ class BookingService:
         Returns:
             Dict mit 'is_booked' (bool) und 'booking_info' (str) oder None
         """
-        bookings = Booking.objects.filter(date=date, period=period)
+        rows = BookingStudent.objects.filter(
+            date=date,
+            period=period,
+            name_norm=normalize_student_value(student_name),
+            klasse_norm=normalize_student_value(student_class),
+        )
         
         if exclude_booking_id:
-            bookings = bookings.exclude(id=exclude_booking_id)
-        
-        for booking in bookings:
-            students = booking.students
-            for student in students:
-                if (student.get('name', '').strip().lower() == student_name.strip().lower() and 
-                    student.get('klasse', '').strip().lower() == student_class.strip().lower()):
-                    return {
-                        'is_booked': True,
-                        'booking_info': f"{student_name} ({student_class}) ist bereits in '{booking.offer_label}' bei {booking.teacher_name} gebucht."
-                    }
+            rows = rows.exclude(booking_id=exclude_booking_id)
+        
+        row = rows.select_related('booking').first()
+        if row:
+            booking = row.booking
+            return {
+                'is_booked': True,
+                'booking_info': f"{student_name} ({student_class}) ist bereits in '{booking.offer_label}' bei {booking.teacher_name} gebucht."
+            }
         
         return {'is_booked': False, 'booking_info': None}
     
     @staticmethod
+    def check_students_double_booking(students, date, period, exclude_booking_id=None):
+        """
+        Prüft eine komplette Schülerliste in einem Durchlauf auf Doppelbuchungen
+        
+        Lädt die bereits gebuchten Schüler des Slots einmalig in ein normalisiertes
+        Lookup und meldet alle Konflikte gleichzeitig, inklusive Schülern, die
+        mehrfach in der Liste stehen.
+        
+        Returns:
+            Liste von Dicts mit 'name', 'klasse' und 'booking_info' (leer ohne Konflikte)
+        """
+        rows = BookingStudent.objects.filter(date=date, period=period)
+        
+        if exclude_booking_id:
+            rows = rows.exclude(booking_id=exclude_booking_id)
+        
+        occupied = {
+            (row['name_norm'], row['klasse_norm']): row
+            for row in rows.values('name_norm', 'klasse_norm', 'booking__offer_label', 'booking__teacher_name')
+        }
+        
+        conflicts = []
+        seen = set()
+        for student in students:
+            name = student.get('name', '')
+            klasse = student.get('klasse', '')
+            key = (normalize_student_value(name), normalize_student_value(klasse))
+            
+            if key in occupied:
+                row = occupied[key]
+                info = f"{name} ({klasse}) ist bereits in '{row['booking__offer_label']}' bei {row['booking__teacher_name']} gebucht."
+            elif key in seen:
+                info = f"{name} ({klasse}) ist mehrfach in der Buchung aufgeführt."
+            else:
+                seen.add(key)
+                continue
+            
+            conflicts.append({'name': name, 'klasse': klasse, 'booking_info': info})
+        
+        return conflicts
+    
+    @staticmethod
+    def _reserve_capacity(date, period, count):
+        """
+        Erhöht den Belegungszähler eines Slots innerhalb der laufenden Transaktion
+        
+        Das UPDATE ist an die freie Kapazität gebunden (Compare-and-Swap auf
+        student_count), sodass parallele Buchungen den Slot nicht überfüllen können.
+        
+        Raises:
+            CapacityExceededError wenn nicht genügend Plätze frei sind
+        """
+        max_students = TimeSlot.objects.filter(
+            weekday=WEEKDAY_CODES[date.weekday()], period=period
+        ).values_list('max_students', flat=True).first()
+        
+        # Fehlt der Zähler, mit den bereits gebuchten Schülern beginnen (z.B. Altdaten vor dem Backfill)
+        SlotOccupancy.objects.get_or_create(
+            date=date, period=period,
+            defaults={'student_count': BookingStudent.objects.filter(date=date, period=period).count()},
+        )
+        
+        occupancy = SlotOccupancy.objects.filter(date=date, period=period)
+        if max_students is not None:
+            occupancy = occupancy.filter(student_count__lte=max_students - count)
+        
+        updated = occupancy.update(
+            student_count=F('student_count') + count,
+            version=F('version') + 1,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            current = SlotOccupancy.objects.filter(date=date, period=period).values_list('student_count', flat=True).first() or 0
+            Metrics.inc('booking_rejections', reason='capacity')
+            raise CapacityExceededError(
+                f"Nicht genügend freie Plätze: {max(0, max_students - current)} frei, {count} angefragt."
+            )
+    
+    @staticmethod
+    def _release_capacity(date, period, count):
+        """Verringert den Belegungszähler eines Slots (z.B. beim Löschen einer Buchung)"""
+        SlotOccupancy.objects.filter(date=date, period=period).update(
+            student_count=F('student_count') - count,
+            version=F('version') + 1,
+            updated_at=timezone.now(),
+        )
+    
+    @staticmethod
+    @retry_on_lock()
     @transaction.atomic
     def create_booking(date, weekday, period, teacher, students, offer_type, offer_label, 
                       teacher_name=None, teacher_class=None):
@@ -114,14 +353,15 @@ class BookingService:
             Booking object oder None bei Fehler
         """
         if BlockedSlot.objects.filter(date=date, period=period).exists():
+            Metrics.inc('booking_rejections', reason='blocked')
             raise ValueError("Dieser Slot ist blockiert")
         
-        for student in students:
-            check = BookingService.check_student_double_booking(
-                student['name'], student['klasse'], date, period
-            )
-            if check['is_booked']:
-                raise ValueError(check['booking_info'])
+        conflicts = BookingService.check_students_double_booking(students, date, period)
+        if conflicts:
+            Metrics.inc('booking_rejections', reason='double_booking')
+            raise StudentConflictError(conflicts)
+        
+        BookingService._reserve_capacity(date, period, len(students))
         
         booking = Booking.objects.create(
             date=date,
@@ -135,14 +375,219 @@ class BookingService:
             offer_label=offer_label,
         )
         
-        Notification.objects.create(
-            booking=booking,
-            notification_type='new_booking',
-            message=f"Neue Buchung: {offer_label} von {teacher_name} am {date.strftime('%d.%m.%Y')} - {period}. Stunde",
+        try:
+            with transaction.atomic():
+                BookingStudent.objects.bulk_create(BookingStudent.rows_for_booking(booking))
+        except IntegrityError:
+            Metrics.inc('booking_rejections', reason='double_booking')
+            raise ValueError("Mindestens ein Schüler ist für diesen Slot bereits gebucht.")
+        
+        AvailabilityCache.invalidate(date)
+        transaction.on_commit(lambda: Metrics.inc('bookings_created'))
+        
+        Outbox.publish(
+            'booking_created',
+            booking_id=booking.id,
+            date=date,
+            period=period,
+            offer_label=offer_label,
+            teacher_name=booking.teacher_name,
         )
         
         return booking
     
+    @staticmethod
+    def series_dates(weekday, start_date, end_date):
+        """Gibt alle Daten eines Wochentags ('Mon', 'Tue', ...) im Zeitraum zurück"""
+        first = start_date + timedelta(days=(WEEKDAY_CODES.index(weekday) - start_date.weekday()) % 7)
+        if first > end_date:
+            return []
+        return [first + timedelta(weeks=i) for i in range((end_date - first).days // 7 + 1)]
+    
+    @staticmethod
+    def check_series(dates, period, students):
+        """
+        Prüft alle Termine einer Serie auf Blockierungen, freie Plätze und Doppelbuchungen
+        
+        Statt einer Prüfung pro Termin läuft je eine Abfrage über alle Termine.
+        
+        Returns:
+            Dict date -> Liste von Fehlermeldungen (nur Termine mit Konflikten)
+        """
+        problems = {}
+        
+        for date, reason in BlockedSlot.objects.filter(date__in=dates, period=period).values_list('date', 'reason'):
+            problems.setdefault(date, []).append(f"Slot ist blockiert ({reason})")
+        
+        max_students = TimeSlot.objects.filter(
+            weekday=WEEKDAY_CODES[dates[0].weekday()], period=period
+        ).values_list('max_students', flat=True).first()
+        if max_students is not None:
+            occupancy = dict(
+                SlotOccupancy.objects.filter(date__in=dates, period=period).values_list('date', 'student_count')
+            )
+            for date in dates:
+                free = max_students - occupancy.get(date, 0)
+                if free < len(students):
+                    problems.setdefault(date, []).append(
+                        f"Nicht genügend freie Plätze: {max(0, free)} frei, {len(students)} angefragt."
+                    )
+        
+        wanted = {
+            (normalize_student_value(s.get('name')), normalize_student_value(s.get('klasse'))): s
+            for s in students
+        }
+        rows = BookingStudent.objects.filter(
+            date__in=dates,
+            period=period,
+            name_norm__in={name for name, _ in wanted},
+        ).values('date', 'name_norm', 'klasse_norm', 'booking__offer_label', 'booking__teacher_name')
+        for row in rows:
+            student = wanted.get((row['name_norm'], row['klasse_norm']))
+            if student:
+                problems.setdefault(row['date'], []).append(
+                    f"{student.get('name', '')} ({student.get('klasse', '')}) ist bereits in "
+                    f"'{row['booking__offer_label']}' bei {row['booking__teacher_name']} gebucht."
+                )
+        
+        return problems
+    
+    @staticmethod
+    @retry_on_lock()
+    @transaction.atomic
+    def create_booking_series(weekday, period, start_date, end_date, teacher, students, offer_type, offer_label,
+                              teacher_name=None, teacher_class=None, skip_conflicts=False):
+        """
+        Bucht einen Wochentag und eine Stunde wöchentlich für einen Zeitraum
+        
+        Alle Termine werden gemeinsam geprüft und in einer Transaktion mit
+        bulk_create angelegt; für die ganze Serie entsteht eine Benachrichtigung.
+        
+        Args:
+            weekday: String ('Mon', 'Tue', etc.)
+            period: Integer (1-6)
+            start_date: datetime.date object (inklusive)
+            end_date: datetime.date object (inklusive)
+            teacher: Django User object
+            students: List of dicts with student info
+            offer_type: String
+            offer_label: String
+            teacher_name: Optional string
+            teacher_class: Optional string
+            skip_conflicts: Termine mit Konflikten auslassen statt die ganze Serie abzulehnen
+        
+        Returns:
+            Dict mit 'series_key', 'bookings' (Liste von Booking) und 'conflicts'
+            (Liste von Dicts mit 'date' und 'errors' der ausgelassenen Termine)
+        
+        Raises:
+            SeriesConflictError wenn Termine Konflikte haben (und skip_conflicts nicht gesetzt
+            ist) oder kein Termin buchbar ist
+        """
+        if weekday not in WEEKDAY_CODES:
+            raise ValueError("Ungültiger Wochentag")
+        if end_date < start_date:
+            raise ValueError("Das Enddatum liegt vor dem Startdatum")
+        if (end_date - start_date).days + 1 > MAX_SERIES_DAYS:
+            raise ValueError(f"Der Zeitraum darf höchstens {MAX_SERIES_DAYS} Tage umfassen")
+        if not students:
+            raise ValueError("Keine Schüler angegeben")
+        
+        dates = BookingService.series_dates(weekday, start_date, end_date)
+        if not dates:
+            raise ValueError("Im Zeitraum liegt kein Termin an diesem Wochentag")
+        
+        seen = set()
+        duplicates = []
+        for student in students:
+            key = (normalize_student_value(student.get('name')), normalize_student_value(student.get('klasse')))
+            if key in seen:
+                duplicates.append({
+                    'name': student.get('name', ''),
+                    'klasse': student.get('klasse', ''),
+                    'booking_info': f"{student.get('name', '')} ({student.get('klasse', '')}) ist mehrfach in der Buchung aufgeführt.",
+                })
+            seen.add(key)
+        if duplicates:
+            Metrics.inc('booking_rejections', reason='double_booking')
+            raise StudentConflictError(duplicates)
+        
+        problems = BookingService.check_series(dates, period, students)
+        conflicts = [
+            {'date': date.strftime('%Y-%m-%d'), 'errors': problems[date]}
+            for date in dates if date in problems
+        ]
+        dates = [date for date in dates if date not in problems]
+        if (conflicts and not skip_conflicts) or not dates:
+            Metrics.inc('booking_rejections', reason='series_conflict')
+            raise SeriesConflictError(conflicts)
+        
+        # Belegung: fehlende Zähler anlegen, dann ein an die Kapazität gebundenes UPDATE für alle Termine
+        max_students = TimeSlot.objects.filter(weekday=weekday, period=period).values_list('max_students', flat=True).first()
+        booked = dict(
+            BookingStudent.objects.filter(date__in=dates, period=period)
+            .order_by().values_list('date').annotate(count=Count('id'))
+        )
+        SlotOccupancy.objects.bulk_create(
+            [SlotOccupancy(date=date, period=period, student_count=booked.get(date, 0)) for date in dates],
+            ignore_conflicts=True,
+        )
+        occupancy = SlotOccupancy.objects.filter(date__in=dates, period=period)
+        if max_students is not None:
+            occupancy = occupancy.filter(student_count__lte=max_students - len(students))
+        updated = occupancy.update(
+            student_count=F('student_count') + len(students),
+            version=F('version') + 1,
+            updated_at=timezone.now(),
+        )
+        if updated != len(dates):
+            Metrics.inc('booking_rejections', reason='capacity')
+            raise CapacityExceededError("Die freien Plätze haben sich während der Buchung geändert. Bitte erneut versuchen.")
+        
+        series_key = str(uuid.uuid4())
+        teacher_name = teacher_name or teacher.get_full_name() or teacher.username
+        Booking.objects.bulk_create([
+            Booking(
+                date=date,
+                weekday=weekday,
+                period=period,
+                teacher=teacher,
+                teacher_name=teacher_name,
+                teacher_class=teacher_class or '',
+                students=students,
+                offer_type=offer_type,
+                offer_label=offer_label,
+                series_key=series_key,
+            )
+            for date in dates
+        ])
+        # bulk_create liefert nicht auf allen Backends (MySQL) die IDs zurück
+        bookings = list(Booking.objects.filter(series_key=series_key).order_by('date'))
+        
+        try:
+            with transaction.atomic():
+                BookingStudent.objects.bulk_create(
+                    [row for booking in bookings for row in BookingStudent.rows_for_booking(booking)]
+                )
+        except IntegrityError:
+            Metrics.inc('booking_rejections', reason='double_booking')
+            raise ValueError("Mindestens ein Schüler ist für einen Termin der Serie bereits gebucht.")
+        
+        AvailabilityCache.invalidate(*dates)
+        transaction.on_commit(lambda: Metrics.inc('bookings_created', len(bookings)))
+        
+        Outbox.publish(
+            'booking_series_created',
+            series_key=series_key,
+            dates=dates,
+            weekday=weekday,
+            period=period,
+            offer_label=offer_label,
+            teacher_name=teacher_name,
+        )
+        
+        return {'series_key': series_key, 'bookings': bookings, 'conflicts': conflicts}
+    
     @staticmethod
     def get_user_bookings(user, start_date=None, end_date=None):
         """
@@ -156,7 +601,8 @@ class BookingService:
         Returns:
             QuerySet von Booking objects
         """
-        bookings = Booking.objects.filter(teacher=user)
+        # teacher für to_dict() gleich mitladen, sonst eine Abfrage pro Buchung
+        bookings = Booking.objects.filter(teacher=user).select_related('teacher')
         
         if start_date:
             bookings = bookings.filter(date__gte=start_date)
@@ -166,6 +612,69 @@ class BookingService:
         return bookings.order_by('-date', 'period')
     
     @staticmethod
+    def search_students(start_date, end_date, name=None, klasse=None, limit=MAX_STUDENT_SEARCH_RESULTS):
+        """
+        Sucht gebuchte Schüler über einen Zeitraum
+        
+        Liest nur die Schülerzeilen (BookingStudent) über die Indizes
+        (name_norm, date) bzw. (klasse_norm, date). Der Name wird als Präfix
+        verglichen, und zwar als Bereichsabfrage statt LIKE, damit der Index
+        auch unter SQLite genutzt wird. Namenssuchen werden in Indexreihenfolge
+        gelesen und erst nach dem Limit nach Datum sortiert; mit ORDER BY date
+        würde SQLite den Unique-Index (date, ...) wählen und den ganzen
+        Zeitraum durchsuchen.
+        
+        Args:
+            start_date: datetime.date object (inklusive)
+            end_date: datetime.date object (inklusive)
+            name: Optional - Anfang des Schülernamens
+            klasse: Optional - Klasse (exakt)
+            limit: Maximale Anzahl Treffer
+        
+        Returns:
+            Tuple (Liste von Treffer-Dicts sortiert nach Datum und Stunde, truncated)
+        """
+        name_norm = normalize_student_value(name)
+        klasse_norm = normalize_student_value(klasse)
+        if not name_norm and not klasse_norm:
+            raise ValueError("Name oder Klasse erforderlich")
+        if end_date < start_date:
+            raise ValueError("Das Enddatum liegt vor dem Startdatum")
+        if (end_date - start_date).days + 1 > MAX_STUDENT_SEARCH_DAYS:
+            raise ValueError(f"Der Zeitraum darf höchstens {MAX_STUDENT_SEARCH_DAYS} Tage umfassen")
+        
+        rows = BookingStudent.objects.filter(date__gte=start_date, date__lte=end_date)
+        if name_norm:
+            rows = rows.filter(name_norm__gte=name_norm, name_norm__lt=name_norm + '\U0010ffff')
+        if klasse_norm:
+            rows = rows.filter(klasse_norm=klasse_norm)
+        
+        ordering = ['name_norm', 'date', 'period'] if name_norm else ['date', 'period', 'name_norm']
+        rows = list(
+            rows.order_by(*ordering)
+            .values(
+                'booking_id', 'date', 'period', 'name', 'name_norm', 'klasse',
+                'booking__weekday', 'booking__teacher_name', 'booking__offer_label',
+            )[:limit + 1]
+        )
+        truncated = len(rows) > limit
+        rows = sorted(rows[:limit], key=lambda row: (row['date'], row['period'], row['name_norm']))
+        return [
+            {
+                'booking_id': row['booking_id'],
+                'date': row['date'].strftime('%Y-%m-%d'),
+                'weekday': row['booking__weekday'],
+                'period': row['period'],
+                'name': row['name'],
+                'klasse': row['klasse'],
+                'teacher_name': row['booking__teacher_name'],
+                'offer_label': row['booking__offer_label'],
+            }
+            for row in rows
+        ], truncated
+    
+    @staticmethod
+    @retry_on_lock()
     @transaction.atomic
     def block_slot(date, weekday, period, admin_user, reason='Beratung'):
         """
@@ -181,7 +690,7 @@ class BookingService:
         Returns:
             BlockedSlot object
         """
-        if not admin_user.has_perm('sportoase.admin'):
+        if not PermissionSnapshot.get(admin_user)['admin']:
             raise PermissionError("Nur Admins dürfen Slots blockieren")
         
         if BlockedSlot.objects.filter(date=date, period=period).exists():
@@ -195,14 +704,14 @@ class BookingService:
             blocked_by=admin_user,
         )
         
-        Notification.objects.create(
-            notification_type='slot_blocked',
-            message=f"Slot blockiert: {date.strftime('%d.%m.%Y')} - {period}. Stunde ({reason})",
-        )
+        AvailabilityCache.invalidate(date)
+        
+        Outbox.publish('slot_blocked', blocked_id=blocked.id, date=date, period=period, reason=reason)
         
         return blocked
     
     @staticmethod
+    @retry_on_lock()
     @transaction.atomic
     def unblock_slot(date, period, admin_user):
         """
@@ -216,7 +725,7 @@ class BookingService:
         Returns:
             True bei Erfolg
         """
-        if not admin_user.has_perm('sportoase.admin'):
+        if not PermissionSnapshot.get(admin_user)['admin']:
             raise PermissionError("Nur Admins dürfen Slots entsperren")
         
         blocked = BlockedSlot.objects.filter(date=date, period=period).first()
@@ -224,9 +733,138 @@ class BookingService:
             raise ValueError("Slot ist nicht blockiert")
         
         blocked.delete()
+        AvailabilityCache.invalidate(date)
+        Outbox.publish('slot_unblocked', date=date, period=period)
         return True
     
     @staticmethod
+    def _bulk_slot_selection(start_date, end_date, periods=None, weekdays=None):
+        """
+        Bildet die (date, period)-Paare für Sammel-Blockierungen
+        
+        Returns:
+            Tuple (Liste der Daten, Liste der Stunden)
+        """
+        if end_date < start_date:
+            raise ValueError("Das Enddatum liegt vor dem Startdatum")
+        if (end_date - start_date).days + 1 > MAX_RANGE_DAYS:
+            raise ValueError(f"Der Zeitraum darf höchstens {MAX_RANGE_DAYS} Tage umfassen")
+        
+        weekdays = weekdays or WEEKDAY_CODES[:5]
+        if any(weekday not in WEEKDAY_CODES for weekday in weekdays):
+            raise ValueError("Ungültiger Wochentag")
+        if periods is None:
+            periods = sorted(set(TimeSlot.objects.values_list('period', flat=True)))
+        elif not periods or any(not isinstance(period, int) for period in periods):
+            raise ValueError("Ungültige Stunden")
+        
+        dates = [
+            start_date + timedelta(days=i)
+            for i in range((end_date - start_date).days + 1)
+            if WEEKDAY_CODES[(start_date + timedelta(days=i)).weekday()] in weekdays
+        ]
+        return dates, sorted(set(periods))
+    
+    @staticmethod
+    @retry_on_lock()
+    @transaction.atomic
+    def block_slots(start_date, end_date, admin_user, periods=None, weekdays=None, reason='Beratung'):
+        """
+        Blockiert alle Slots eines Zeitraums (z.B. Ferien, Prüfungszeiten) in einer Transaktion
+        
+        Args:
+            start_date: datetime.date object (inklusive)
+            end_date: datetime.date object (inklusive)
+            admin_user: Django User object (Admin)
+            periods: Optional - Liste von Stunden (Standard: alle konfigurierten)
+            weekdays: Optional - Liste von Wochentagen ('Mon', ...; Standard: Mo–Fr)
+            reason: String - Grund der Blockierung
+        
+        Returns:
+            Dict mit 'blocked' (neu blockiert), 'already_blocked' (Liste von Dicts mit
+            'date' und 'period') und 'with_bookings' (Slots mit bestehenden Buchungen,
+            zusätzlich 'booking_count')
+        """
+        if not PermissionSnapshot.get(admin_user)['admin']:
+            raise PermissionError("Nur Admins dürfen Slots blockieren")
+        
+        dates, periods = BookingService._bulk_slot_selection(start_date, end_date, periods, weekdays)
+        if not dates:
+            return {'blocked': [], 'already_blocked': [], 'with_bookings': []}
+        
+        existing = set(
+            BlockedSlot.objects.filter(date__in=dates, period__in=periods).values_list('date', 'period')
+        )
+        new_slots = [(date, period) for date in dates for period in periods if (date, period) not in existing]
+        
+        BlockedSlot.objects.bulk_create(
+            [
+                BlockedSlot(
+                    date=date,
+                    weekday=WEEKDAY_CODES[date.weekday()],
+                    period=period,
+                    reason=reason,
+                    blocked_by=admin_user,
+                )
+                for date, period in new_slots
+            ],
+            ignore_conflicts=True,
+        )
+        
+        with_bookings = [
+            {'date': row['date'].strftime('%Y-%m-%d'), 'period': row['period'], 'booking_count': row['booking_count']}
+            for row in Booking.objects.filter(date__in=dates, period__in=periods)
+            .values('date', 'period')
+            .annotate(booking_count=Count('id'))
+            .order_by('date', 'period')
+        ]
+        
+        if new_slots:
+            blocked_dates = sorted({date for date, _ in new_slots})
+            AvailabilityCache.invalidate(*blocked_dates)
+            Outbox.publish(
+                'slots_blocked',
+                dates=blocked_dates,
+                periods=periods,
+                count=len(new_slots),
+                reason=reason,
+            )
+        
+        def as_dicts(slots):
+            return [{'date': date.strftime('%Y-%m-%d'), 'period': period} for date, period in sorted(slots)]
+        
+        return {
+            'blocked': as_dicts(new_slots),
+            'already_blocked': as_dicts(existing),
+            'with_bookings': with_bookings,
+        }
+    
+    @staticmethod
+    @retry_on_lock()
+    @transaction.atomic
+    def unblock_slots(start_date, end_date, admin_user, periods=None, weekdays=None):
+        """
+        Gibt alle blockierten Slots eines Zeitraums mit einem DELETE wieder frei
+        
+        Returns:
+            Anzahl freigegebener Slots
+        """
+        if not PermissionSnapshot.get(admin_user)['admin']:
+            raise PermissionError("Nur Admins dürfen Slots entsperren")
+        
+        dates, periods = BookingService._bulk_slot_selection(start_date, end_date, periods, weekdays)
+        blocked = BlockedSlot.objects.filter(date__in=dates, period__in=periods)
+        unblocked_dates = sorted(set(blocked.values_list('date', flat=True)))
+        if not unblocked_dates:
+            return 0
+        
+        deleted = blocked.delete()[0]
+        AvailabilityCache.invalidate(*unblocked_dates)
+        Outbox.publish('slots_unblocked', dates=unblocked_dates, periods=periods)
+        return deleted
+    
+    @staticmethod
+    @retry_on_lock()
     @transaction.atomic
     def delete_booking(booking_id, user):
         """
@@ -243,29 +881,101 @@ class BookingService:
         if not booking:
             raise ValueError("Buchung nicht gefunden")
         
-        if booking.teacher != user and not user.has_perm('sportoase.admin'):
+        if booking.teacher_id != user.id and not PermissionSnapshot.get(user)['admin']:
             raise PermissionError("Keine Berechtigung zum Löschen dieser Buchung")
         
-        Notification.objects.create(
-            notification_type='booking_deleted',
-            message=f"Buchung gelöscht: {booking.offer_label} von {booking.teacher_name} am {booking.date.strftime('%d.%m.%Y')}",
+        Outbox.publish(
+            'booking_deleted',
+            booking_id=booking.id,
+            date=booking.date,
+            period=booking.period,
+            offer_label=booking.offer_label,
+            teacher_name=booking.teacher_name,
         )
         
+        BookingService._release_capacity(booking.date, booking.period, booking.student_rows.count())
         booking.delete()
+        AvailabilityCache.invalidate(booking.date)
+        transaction.on_commit(lambda: Metrics.inc('bookings_deleted'))
         return True
     
+    @staticmethod
+    @retry_on_lock()
+    @transaction.atomic
+    def update_timeslot_label(timeslot_id, label):
+        """
+        Aktualisiert das Label eines TimeSlots
+        
+        Args:
+            timeslot_id: Integer
+            label: String
+        
+        Returns:
+            TimeSlot object
+        
+        Raises:
+            TimeSlot.DoesNotExist wenn der TimeSlot nicht existiert
+        """
+        timeslot = TimeSlot.objects.get(id=timeslot_id)
+        timeslot.label = label
+        timeslot.save()
+        
+        AvailabilityCache.invalidate_all()
+        Outbox.publish('timeslots_updated', timeslot_id=timeslot.id)
+        return timeslot
+    
     @staticmethod
     def get_unread_notifications(limit=50):
         """Gibt ungelesene Benachrichtigungen zurück"""
         return Notification.objects.filter(is_read=False).order_by('-created_at')[:limit]
     
+    @staticmethod
+    def count_unread_notifications():
+        """
+        Gibt die Anzahl ungelesener Benachrichtigungen zurück
+        
+        Neue und gelesene Benachrichtigungen erhöhen die Sequenz des
+        Änderungsstroms; Badge-Abfragen dazwischen kommen ohne Datenbankzugriff aus.
+        """
+        return ChangeFeed.cached('unread_count', lambda: Notification.objects.filter(is_read=False).count())
+    
     @staticmethod
     def mark_notification_read(notification_id):
         """Markiert eine Benachrichtigung als gelesen"""
-        notification = Notification.objects.filter(id=notification_id).first()
-        if notification:
-            notification.is_read = True
-            notification.read_at = datetime.now()
-            notification.save()
+        if BookingService.mark_notifications_read(ids=[notification_id]):
             return True
-        return False
+        return Notification.objects.filter(id=notification_id).exists()
+    
+    @staticmethod
+    def mark_notifications_read(ids=None, up_to_id=None, before=None):
+        """
+        Markiert Benachrichtigungen mit einem einzigen UPDATE als gelesen
+        
+        Mindestens eine Auswahl ist erforderlich; mehrere werden kombiniert.
+        
+        Args:
+            ids: Optional - Liste von Notification-IDs
+            up_to_id: Optional - alle Benachrichtigungen mit ID <= up_to_id
+            before: Optional - datetime, alle Benachrichtigungen bis zu diesem Zeitpunkt
+        
+        Returns:
+            Anzahl der neu als gelesen markierten Benachrichtigungen
+        
+        Raises:
+            ValueError: wenn weder ids noch up_to_id noch before angegeben ist
+        """
+        if ids is None and up_to_id is None and before is None:
+            raise ValueError('"ids", "up_to_id" oder "before" angeben')
+        
+        notifications = Notification.objects.filter(is_read=False)
+        if ids is not None:
+            notifications = notifications.filter(id__in=ids)
+        if up_to_id is not None:
+            notifications = notifications.filter(id__lte=up_to_id)
+        if before is not None:
+            notifications = notifications.filter(created_at__lte=before)
+        
+        updated = notifications.update(is_read=True, read_at=timezone.now())
+        if updated:
+            ChangeFeed.touch()
+        return updated
@@ -0,0 +1,220 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from datetime import timedelta
+from backend.models import Notification, OutboxEvent
+import json
+import time
+
+
+class ChangeFeed:
+    """
+    Änderungsstrom für Benachrichtigungen und Slot-Verfügbarkeit
+    
+    Quelle der Änderungen sind die Tabellen sportoase_outbox (Buchungen,
+    Blockierungen, Labels) und sportoase_notifications, deren IDs als Cursor
+    dienen. Zusätzlich wird nach jedem Commit ein Sequenzzähler im Cache
+    erhöht; wartende Streams lesen nur diesen Zähler und fragen die Datenbank
+    erst, wenn er sich geändert hat.
+    
+    Unter SQLite werden Schreibtransaktionen nacheinander committed, IDs werden
+    also in aufsteigender Reihenfolge sichtbar. Unter MySQL wird die ID beim
+    INSERT vergeben, sichtbar wird die Zeile aber erst beim Commit; eine Zeile
+    mit kleinerer ID kann also nach einer größeren erscheinen. read() liefert
+    deshalb nur Zeilen bis zur ersten Lücke in den IDs und überspringt eine
+    Lücke erst, wenn die Zeile danach älter als CHANGE_FEED_GAP_GRACE Sekunden
+    ist (dann war die fehlende ID ein Rollback oder ist gelöscht).
+    """
+    SEQUENCE_KEY = 'sportoase:changes:sequence'
+    BATCH_SIZE = 200
+    GAP_GRACE = 10
+    
+    # Ereignistypen, die die Verfügbarkeit einzelner Tage ('date' bzw. 'dates') oder aller Tage ändern
+    DATE_EVENTS = {
+        'booking_created', 'booking_deleted', 'booking_series_created',
+        'slot_blocked', 'slot_unblocked', 'slots_blocked', 'slots_unblocked',
+    }
+    GLOBAL_EVENTS = {'timeslots_updated'}
+    
+    @classmethod
+    def _cache(cls):
+        return caches[getattr(settings, 'AVAILABILITY_CACHE_ALIAS', 'default')]
+    
+    @staticmethod
+    def _initial_sequence():
+        # Zeitbasierter Startwert: nach Verdrängung oder Leeren des Caches beginnt
+        # der Zähler nicht wieder bei 1 und trifft keine alten cached()-Einträge
+        return time.time_ns() // 1000
+    
+    @classmethod
+    def touch(cls):
+        """Erhöht den Sequenzzähler, sobald die laufende Transaktion committed ist"""
+        def bump():
+            cache = cls._cache()
+            if not cache.add(cls.SEQUENCE_KEY, cls._initial_sequence(), timeout=None):
+                try:
+                    cache.incr(cls.SEQUENCE_KEY)
+                except ValueError:
+                    cache.add(cls.SEQUENCE_KEY, cls._initial_sequence(), timeout=None)
+        transaction.on_commit(bump)
+    
+    @classmethod
+    def sequence(cls):
+        cache = cls._cache()
+        value = cache.get(cls.SEQUENCE_KEY)
+        if value is None:
+            cache.add(cls.SEQUENCE_KEY, cls._initial_sequence(), timeout=None)
+            value = cache.get(cls.SEQUENCE_KEY, 0)
+        return value
+    
+    @classmethod
+    def cached(cls, name, compute):
+        """Gibt einen bis zur nächsten Änderung gültigen Wert aus dem Cache zurück"""
+        cache = cls._cache()
+        key = f'sportoase:changes:cached:{name}:{cls.sequence()}'
+        value = cache.get(key)
+        if value is None:
+            value = compute()
+            cache.set(key, value, timeout=getattr(settings, 'AVAILABILITY_CACHE_TIMEOUT', 24 * 60 * 60))
+        return value
+    
+    @staticmethod
+    def format_cursor(outbox_id, notification_id):
+        return f'{outbox_id}-{notification_id}'
+    
+    @classmethod
+    def parse_cursor(cls, value):
+        """
+        Liest einen Cursor der Form '<outbox_id>-<notification_id>'
+        
+        Returns:
+            Tuple (outbox_id, notification_id) oder None bei fehlendem/ungültigem Cursor
+        """
+        try:
+            outbox_id, notification_id = (int(part) for part in value.split('-'))
+        except (AttributeError, ValueError):
+            return None
+        return outbox_id, notification_id
+    
+    @classmethod
+    def current_cursor(cls):
+        """Cursor auf den aktuellen Stand (ohne bereits vorhandene Änderungen)"""
+        return (
+            OutboxEvent.objects.aggregate(last=Max('id'))['last'] or 0,
+            Notification.objects.aggregate(last=Max('id'))['last'] or 0,
+        )
+    
+    @classmethod
+    def _settled(cls, rows, last_id):
+        """
+        Kürzt rows (nach ID sortiert, (id, created_at, ...)) vor der ersten Lücke,
+        die noch jünger als die Wartezeit ist
+        
+        Returns:
+            Tuple (gekürzte Liste, ob Zeilen zurückgehalten wurden)
+        """
+        grace = timedelta(seconds=getattr(settings, 'CHANGE_FEED_GAP_GRACE', cls.GAP_GRACE))
+        threshold = timezone.now() - grace
+        expected = last_id + 1
+        for index, row in enumerate(rows):
+            if row[0] != expected and row[1] > threshold:
+                return rows[:index], True
+            expected = row[0] + 1
+        return rows, False
+    
+    @classmethod
+    def read(cls, cursor, include_notifications=True):
+        """
+        Liest die Änderungen nach einem Cursor
+        
+        Args:
+            cursor: Tuple (outbox_id, notification_id)
+            include_notifications: Benachrichtigungen mitliefern (nur für Admins)
+        
+        Returns:
+            Tuple (Liste von (Ereignisname, Daten, Cursor), neuer Cursor, weitere Änderungen vorhanden,
+            Änderungen wegen einer ID-Lücke zurückgehalten)
+        """
+        outbox_id, notification_id = cursor
+        messages = []
+        
+        fetched = list(
+            OutboxEvent.objects.filter(id__gt=outbox_id)
+            .order_by('id')
+            .values_list('id', 'created_at', 'event_type', 'payload_json')[:cls.BATCH_SIZE]
+        )
+        rows, pending = cls._settled(fetched, outbox_id)
+        dates = set()
+        all_dates = False
+        for row_id, _, event_type, payload_json in rows:
+            outbox_id = row_id
+            if event_type in cls.GLOBAL_EVENTS:
+                all_dates = True
+            elif event_type in cls.DATE_EVENTS:
+                payload = json.loads(payload_json)
+                dates.update(payload['dates'] if 'dates' in payload else [payload['date']])
+        if dates or all_dates:
+            messages.append(('availability', {'dates': sorted(dates), 'all': all_dates}, (outbox_id, notification_id)))
+        
+        notifications = []
+        if include_notifications:
+            fetched_notifications = list(
+                Notification.objects.filter(id__gt=notification_id).order_by('id')[:cls.BATCH_SIZE]
+            )
+            settled, held_back = cls._settled(
+                [(notification.id, notification.created_at, notification) for notification in fetched_notifications],
+                notification_id,
+            )
+            pending = pending or held_back
+            notifications = [notification for _, _, notification in settled]
+            for notification in notifications:
+                notification_id = notification.id
+                # Zusammenfassungen der Aufbewahrung ersetzen alte, gelesene Benachrichtigungen
+                # und sind nicht neu; der Cursor läuft trotzdem über sie hinweg
+                if notification.notification_type == 'summary':
+                    continue
+                messages.append(('notification', notification.to_dict(), (outbox_id, notification_id)))
+        
+        more = len(rows) == cls.BATCH_SIZE or len(notifications) == cls.BATCH_SIZE
+        return messages, (outbox_id, notification_id), more, pending
+    
+    @classmethod
+    def stream(cls, cursor, include_notifications=True, timeout=None, poll_interval=None, heartbeat=15):
+        """
+        Generator für einen Server-Sent-Events-Stream
+        
+        Läuft höchstens timeout Sekunden; der Browser (EventSource) verbindet
+        sich danach mit dem letzten Cursor als Last-Event-ID neu.
+        """
+        timeout = timeout or getattr(settings, 'CHANGE_STREAM_TIMEOUT', 55)
+        poll_interval = poll_interval or getattr(settings, 'CHANGE_STREAM_POLL_INTERVAL', 1.0)
+        deadline = time.monotonic() + timeout
+        last_sequence = None
+        last_write = time.monotonic()
+        
+        yield f'retry: 3000\nid: {cls.format_cursor(*cursor)}\n\n'
+        
+        while time.monotonic() < deadline:
+            sequence = cls.sequence()
+            if sequence != last_sequence:
+                last_sequence = sequence
+                messages, cursor, more, pending = cls.read(cursor, include_notifications)
+                for event, data, message_cursor in messages:
+                    yield (
+                        f'id: {cls.format_cursor(*message_cursor)}\nevent: {event}\n'
+                        f'data: {json.dumps(data, ensure_ascii=False)}\n\n'
+                    )
+                    last_write = time.monotonic()
+                if more:
+                    last_sequence = None
+                    continue
+                if pending:
+                    # Zurückgehaltene Zeilen beim nächsten Durchlauf erneut lesen, auch ohne neue Änderung
+                    last_sequence = None
+            
+            if time.monotonic() - last_write >= heartbeat:
+                yield ': ping\n\n'
+                last_write = time.monotonic()
+            time.sleep(poll_interval)
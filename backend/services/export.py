@@ -0,0 +1,209 @@
+from xml.sax.saxutils import escape
+from backend.models import Booking
+import csv
+import re
+import zipfile
+
+
+# In XML 1.0 nicht erlaubte Steuerzeichen
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+class _ChunkBuffer:
+    """Datei-Ersatz, der Geschriebenes sammelt, bis es als Chunk abgeholt wird"""
+    
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+    
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+    
+    def tell(self):
+        return self.position
+    
+    def flush(self):
+        pass
+    
+    def take(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class BookingExport:
+    """
+    Export von Buchungen als CSV oder XLSX
+    
+    Die Buchungen werden mit QuerySet.iterator() blockweise gelesen und Zeile
+    für Zeile ausgegeben; der Speicherbedarf hängt nicht vom Zeitraum ab.
+    """
+    CHUNK_SIZE = 500
+    
+    COLUMNS = [
+        ('id', 'ID'),
+        ('date', 'Datum'),
+        ('weekday', 'Wochentag'),
+        ('period', 'Stunde'),
+        ('teacher_username', 'Benutzer'),
+        ('teacher_name', 'Lehrkraft'),
+        ('teacher_email', 'E-Mail'),
+        ('teacher_class', 'Klasse der Lehrkraft'),
+        ('offer_type', 'Angebotsart'),
+        ('offer_label', 'Angebot'),
+        ('student_count', 'Anzahl Schüler'),
+        ('students', 'Schüler'),
+        ('created_at', 'Erstellt am'),
+    ]
+    STUDENT_COLUMNS = [
+        ('student_name', 'Schüler'),
+        ('student_klasse', 'Klasse'),
+    ]
+    
+    @classmethod
+    def columns(cls, expand_students=False):
+        if not expand_students:
+            return cls.COLUMNS
+        return [column for column in cls.COLUMNS if column[0] != 'students'] + cls.STUDENT_COLUMNS
+    
+    @classmethod
+    def rows(cls, start_date, end_date, expand_students=False):
+        """
+        Gibt die Exportzeilen des Zeitraums als Listen in Spaltenreihenfolge zurück (Generator)
+        
+        Args:
+            start_date: datetime.date object (inklusive)
+            end_date: datetime.date object (inklusive)
+            expand_students: eine Zeile pro Schüler statt einer Zeile pro Buchung
+        """
+        keys = [key for key, _ in cls.columns(expand_students)]
+        bookings = (
+            Booking.objects.filter(date__gte=start_date, date__lte=end_date)
+            .select_related('teacher')
+            .order_by('date', 'period', 'id')
+            .iterator(chunk_size=cls.CHUNK_SIZE)
+        )
+        for booking in bookings:
+            students = booking.students
+            values = {
+                'id': booking.id,
+                'date': booking.date.strftime('%Y-%m-%d'),
+                'weekday': booking.weekday,
+                'period': booking.period,
+                'teacher_username': booking.teacher.username,
+                'teacher_name': booking.teacher_name,
+                'teacher_email': booking.teacher.email,
+                'teacher_class': booking.teacher_class,
+                'offer_type': booking.offer_type,
+                'offer_label': booking.offer_label,
+                'student_count': len(students),
+                'students': '; '.join(f"{s.get('name', '')} ({s.get('klasse', '')})" for s in students),
+                'created_at': booking.created_at.strftime('%Y-%m-%d %H:%M'),
+            }
+            if not expand_students:
+                yield [values[key] for key in keys]
+                continue
+            for student in students:
+                values['student_name'] = student.get('name', '')
+                values['student_klasse'] = student.get('klasse', '')
+                yield [values[key] for key in keys]
+    
+    @staticmethod
+    def _csv_safe(value):
+        # Formel-Injection in Tabellenkalkulationen verhindern
+        if isinstance(value, str) and value[:1] in ('=', '+', '-', '@'):
+            return "'" + value
+        return value
+    
+    @classmethod
+    def stream_csv(cls, start_date, end_date, expand_students=False):
+        """
+        CSV mit Semikolon als Trennzeichen und BOM (Excel mit deutschen Ländereinstellungen)
+        
+        Gibt einen Generator von str-Chunks zurück.
+        """
+        class Echo:
+            def write(self, value):
+                return value
+        
+        writer = csv.writer(Echo(), delimiter=';')
+        yield '\ufeff' + writer.writerow([title for _, title in cls.columns(expand_students)])
+        for row in cls.rows(start_date, end_date, expand_students):
+            yield writer.writerow([cls._csv_safe(value) for value in row])
+    
+    @staticmethod
+    def _xlsx_cell(column, row, value):
+        ref = ''
+        index = column + 1
+        while index:
+            index, remainder = divmod(index - 1, 26)
+            ref = chr(65 + remainder) + ref
+        ref += str(row)
+        if isinstance(value, int):
+            return f'<c r="{ref}"><v>{value}</v></c>'
+        text = escape(INVALID_XML_CHARS.sub('', str(value)))
+        return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+    
+    @classmethod
+    def stream_xlsx(cls, start_date, end_date, expand_students=False, flush_rows=200):
+        """
+        XLSX-Datei mit einem Tabellenblatt (Inline-Strings, ohne Formatierung)
+        
+        Das ZIP-Archiv wird direkt in einen Puffer geschrieben, der alle
+        flush_rows Zeilen geleert wird. Gibt einen Generator von bytes-Chunks zurück.
+        """
+        buffer = _ChunkBuffer()
+        with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('[Content_Types].xml', (
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                '<Default Extension="xml" ContentType="application/xml"/>'
+                '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                '</Types>'
+            ))
+            archive.writestr('_rels/.rels', (
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+                '</Relationships>'
+            ))
+            archive.writestr('xl/workbook.xml', (
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+                '<sheets><sheet name="Buchungen" sheetId="1" r:id="rId1"/></sheets>'
+                '</workbook>'
+            ))
+            archive.writestr('xl/_rels/workbook.xml.rels', (
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+                '</Relationships>'
+            ))
+            yield buffer.take()
+            
+            with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+                sheet.write((
+                    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+                ).encode('utf-8'))
+                
+                header = [title for _, title in cls.columns(expand_students)]
+                rows = cls.rows(start_date, end_date, expand_students)
+                sheet.write(cls._xlsx_row(1, header))
+                for row_number, row in enumerate(rows, start=2):
+                    sheet.write(cls._xlsx_row(row_number, row))
+                    if row_number % flush_rows == 0:
+                        yield buffer.take()
+                
+                sheet.write(b'</sheetData></worksheet>')
+        yield buffer.take()
+    
+    @classmethod
+    def _xlsx_row(cls, row_number, values):
+        cells = ''.join(cls._xlsx_cell(column, row_number, value) for column, value in enumerate(values))
+        return f'<row r="{row_number}">{cells}</row>'.encode('utf-8')
@@ -0,0 +1,226 @@
+from django.conf import settings
+import atexit
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+HELP = {
+    'sportoase_request_duration_seconds': ('histogram', 'Dauer der Requests pro View'),
+    'sportoase_request_queries': ('histogram', 'SQL-Abfragen pro Request und View'),
+    'sportoase_responses_total': ('counter', 'Antworten pro View und Statuscode'),
+    'sportoase_bookings_created_total': ('counter', 'Angelegte Buchungen'),
+    'sportoase_bookings_deleted_total': ('counter', 'Gelöschte Buchungen'),
+    'sportoase_booking_rejections_total': ('counter', 'Abgelehnte Buchungen nach Grund'),
+    'sportoase_lock_retries_total': ('counter', 'Wiederholungen nach Lock-Timeouts'),
+}
+
+
+class Metrics:
+    """
+    Prozessübergreifende Zähler und Histogramme im Prometheus-Format
+    
+    Jeder Worker-Prozess sammelt im Speicher und schreibt höchstens alle
+    METRICS_FLUSH_INTERVAL Sekunden eine eigene JSON-Datei nach METRICS_DIR
+    (atomar per os.replace). /metrics summiert die Dateien aller Prozesse.
+    Dateien beendeter Prozesse (z.B. Cron-Läufe) werden dabei in archive.json
+    zusammengeführt und gelöscht, damit Zähler nicht zurückspringen und das
+    Verzeichnis nicht wächst. Es sollte beim Start des Dienstes geleert werden.
+    Mit METRICS_ENABLED = False wird nichts gezählt und keine Datei geschrieben.
+    """
+    _lock = threading.Lock()
+    _counters = {}
+    _histograms = {}
+    _last_flush = 0.0
+    _file = None
+    
+    @staticmethod
+    def _directory():
+        return str(getattr(settings, 'METRICS_DIR', os.path.join(tempfile.gettempdir(), 'sportoase-metrics')))
+    
+    @staticmethod
+    def enabled():
+        return getattr(settings, 'METRICS_ENABLED', True)
+    
+    @staticmethod
+    def _key(name, labels):
+        return json.dumps([name, sorted(labels.items())])
+    
+    @classmethod
+    def inc(cls, name, amount=1, **labels):
+        """Erhöht den Zähler name (ohne Präfix und _total) um amount"""
+        if not cls.enabled():
+            return
+        key = cls._key(f'sportoase_{name}_total', labels)
+        with cls._lock:
+            cls._counters[key] = cls._counters.get(key, 0) + amount
+        cls.flush()
+    
+    @classmethod
+    def observe(cls, name, value, buckets, **labels):
+        """Trägt value in das Histogramm name (ohne Präfix) mit den Obergrenzen buckets ein"""
+        if not cls.enabled():
+            return
+        key = cls._key(f'sportoase_{name}', labels)
+        with cls._lock:
+            histogram = cls._histograms.get(key)
+            if histogram is None:
+                histogram = cls._histograms[key] = {'buckets': list(buckets), 'counts': [0] * len(buckets), 'sum': 0, 'count': 0}
+            for index, bound in enumerate(histogram['buckets']):
+                if value <= bound:
+                    histogram['counts'][index] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+        cls.flush()
+    
+    @classmethod
+    def flush(cls, force=False):
+        """Schreibt den Stand dieses Prozesses, wenn das Flush-Intervall abgelaufen ist"""
+        if not cls.enabled():
+            return
+        now = time.monotonic()
+        if not force and now - cls._last_flush < getattr(settings, 'METRICS_FLUSH_INTERVAL', 5):
+            return
+        with cls._lock:
+            cls._last_flush = now
+            snapshot = json.dumps({'counters': cls._counters, 'histograms': cls._histograms})
+            if cls._file is None:
+                os.makedirs(cls._directory(), exist_ok=True)
+                # PID plus Startzeit: ein neuer Prozess mit wiederverwendeter PID überschreibt keine alten Zähler
+                cls._file = os.path.join(cls._directory(), f'metrics-{os.getpid()}-{time.time_ns()}.json')
+                atexit.register(cls.flush, force=True)
+            temporary = f'{cls._file}.tmp'
+            with open(temporary, 'w', encoding='utf-8') as f:
+                f.write(snapshot)
+            os.replace(temporary, cls._file)
+    
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def _add(counters, histograms, data):
+        for key, value in data['counters'].items():
+            counters[key] = counters.get(key, 0) + value
+        for key, histogram in data['histograms'].items():
+            total = histograms.setdefault(key, {
+                'buckets': histogram['buckets'], 'counts': [0] * len(histogram['buckets']), 'sum': 0, 'count': 0,
+            })
+            total['counts'] = [a + b for a, b in zip(total['counts'], histogram['counts'])]
+            total['sum'] += histogram['sum']
+            total['count'] += histogram['count']
+    
+    @staticmethod
+    def _alive(path):
+        """Ob der Prozess, der die Datei metrics-<pid>-<ns>.json schreibt, noch läuft"""
+        if os.name != 'posix':
+            return True
+        try:
+            pid = int(os.path.basename(path).split('-')[1])
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except (ValueError, IndexError, PermissionError):
+            return True
+        return True
+    
+    @classmethod
+    def _archive(cls, paths):
+        """Führt die Dateien beendeter Prozesse in archive.json zusammen und löscht sie"""
+        import fcntl
+        
+        directory = cls._directory()
+        with open(os.path.join(directory, '.archive.lock'), 'w') as lock:
+            # Gleichzeitige Abrufe in mehreren Workern dürfen keine Datei doppelt übernehmen
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            archive_path = os.path.join(directory, 'archive.json')
+            archive = cls._read(archive_path) or {'counters': {}, 'histograms': {}}
+            merged = []
+            for path in paths:
+                data = cls._read(path)
+                if data is not None:
+                    cls._add(archive['counters'], archive['histograms'], data)
+                    merged.append(path)
+            if not merged:
+                return
+            with open(f'{archive_path}.tmp', 'w', encoding='utf-8') as f:
+                json.dump(archive, f)
+            os.replace(f'{archive_path}.tmp', archive_path)
+            for path in merged:
+                os.remove(path)
+    
+    @classmethod
+    def collect(cls):
+        """
+        Summiert die Dateien aller Prozesse
+        
+        Returns:
+            Tuple (counters, histograms) mit Schlüsseln wie in inc()/observe()
+        """
+        cls.flush(force=True)
+        paths = glob.glob(os.path.join(cls._directory(), 'metrics-*.json'))
+        finished = [path for path in paths if path != cls._file and not cls._alive(path)]
+        if finished:
+            cls._archive(finished)
+        
+        counters = {}
+        histograms = {}
+        for path in glob.glob(os.path.join(cls._directory(), 'metrics-*.json')) + [os.path.join(cls._directory(), 'archive.json')]:
+            data = cls._read(path)
+            if data is not None:
+                cls._add(counters, histograms, data)
+        return counters, histograms
+    
+    @staticmethod
+    def _labels(labels, extra=None):
+        pairs = list(labels) + (extra or [])
+        if not pairs:
+            return ''
+        escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+        return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+    
+    @classmethod
+    def render(cls, extra=()):
+        """
+        Gibt alle Metriken im Prometheus-Textformat (Version 0.0.4) zurück
+        
+        Args:
+            extra: beim Abruf ermittelte Werte als (Name, Typ, Hilfetext, Labels-Dict, Wert),
+                   z.B. Tabellengrößen
+        """
+        counters, histograms = cls.collect()
+        series = {}
+        for key, value in sorted(counters.items()):
+            name, labels = json.loads(key)
+            series.setdefault(name, []).append(f'{name}{cls._labels(labels)} {value}')
+        for key, histogram in sorted(histograms.items()):
+            name, labels = json.loads(key)
+            lines = series.setdefault(name, [])
+            for bound, count in zip(histogram['buckets'], histogram['counts']):
+                lines.append(f'{name}_bucket{cls._labels(labels, [("le", bound)])} {count}')
+            lines.append(f'{name}_bucket{cls._labels(labels, [("le", "+Inf")])} {histogram["count"]}')
+            lines.append(f'{name}_sum{cls._labels(labels)} {histogram["sum"]}')
+            lines.append(f'{name}_count{cls._labels(labels)} {histogram["count"]}')
+        
+        output = []
+        for name in sorted(series):
+            metric_type, help_text = HELP.get(name, ('untyped', name))
+            output += [f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}'] + series[name]
+        
+        described = set()
+        for name, metric_type, help_text, labels, value in extra:
+            if name not in described:
+                output += [f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}']
+                described.add(name)
+            output.append(f'{name}{cls._labels(sorted(labels.items()))} {value}')
+        return '\n'.join(output) + '\n'
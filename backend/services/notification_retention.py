@@ -0,0 +1,130 @@
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from backend.models import Notification, OutboxEvent
+import gzip
+import json
+import time
+
+
+class NotificationRetention:
+    """
+    Aufbewahrung und Verdichtung von Benachrichtigungen
+    
+    Alle Löschungen laufen in Blöcken von batch_size Zeilen mit je einer
+    eigenen kurzen Transaktion und einer Pause dazwischen, damit andere
+    Schreibzugriffe (Buchungen) nicht lange auf den SQLite-Schreiblock warten.
+    Ungelesene Benachrichtigungen werden nie gelöscht oder verdichtet.
+    """
+    BATCH_SIZE = 500
+    PAUSE = 0.05
+    
+    @staticmethod
+    def _delete_ids(model, ids, batch_size, pause):
+        deleted = 0
+        for start in range(0, len(ids), batch_size):
+            with transaction.atomic():
+                deleted += model.objects.filter(id__in=ids[start:start + batch_size]).delete()[0]
+            time.sleep(pause)
+        return deleted
+    
+    @classmethod
+    def prune(cls, days, batch_size=BATCH_SIZE, archive_path=None, pause=PAUSE):
+        """
+        Löscht gelesene Benachrichtigungen, die älter als days Tage sind
+        
+        Args:
+            days: Aufbewahrungsdauer in Tagen
+            batch_size: Zeilen pro Transaktion
+            archive_path: Optional - gzip-JSONL-Datei, an die gelöschte Zeilen angehängt werden
+        
+        Returns:
+            Anzahl gelöschter Benachrichtigungen
+        """
+        cutoff = timezone.now() - timedelta(days=days)
+        expired = Notification.objects.filter(is_read=True, created_at__lt=cutoff).order_by('id')
+        
+        deleted = 0
+        last_id = 0
+        while True:
+            batch = list(expired.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+            
+            if archive_path:
+                with gzip.open(archive_path, 'at', encoding='utf-8') as archive:
+                    for notification in batch:
+                        archive.write(json.dumps(notification.to_dict(), ensure_ascii=False) + '\n')
+            
+            deleted += cls._delete_ids(Notification, [n.id for n in batch], batch_size, pause)
+        return deleted
+    
+    @classmethod
+    def compact(cls, days, batch_size=BATCH_SIZE, pause=PAUSE):
+        """
+        Fasst gelesene Benachrichtigungen älter als days Tage pro Typ und Tag zusammen
+        
+        Jede Gruppe mit mehr als einer Benachrichtigung wird durch eine
+        Benachrichtigung vom Typ 'summary' ersetzt; Anzahl, Typ und Zeitraum
+        stehen in den Metadaten. Zusammenfassungen sind als gelesen markiert
+        und werden vom Änderungsstrom (ChangeFeed) nicht als neu gemeldet.
+        
+        Returns:
+            Tuple (Anzahl neuer Zusammenfassungen, Anzahl entfernter Benachrichtigungen)
+        """
+        cutoff = timezone.now() - timedelta(days=days)
+        candidates = Notification.objects.filter(is_read=True, created_at__lt=cutoff).exclude(notification_type='summary')
+        groups = (
+            candidates.annotate(day=TruncDate('created_at'))
+            .values('notification_type', 'day')
+            .annotate(count=Count('id'))
+            .filter(count__gt=1)
+            .order_by('day', 'notification_type')
+        )
+        labels = dict(Notification.NOTIFICATION_TYPES)
+        
+        summaries = 0
+        removed = 0
+        for group in list(groups):
+            rows = list(
+                candidates.annotate(day=TruncDate('created_at'))
+                .filter(notification_type=group['notification_type'], day=group['day'])
+                .order_by('created_at')
+                .values_list('id', 'created_at', 'read_at')
+            )
+            ids = [row_id for row_id, _, _ in rows]
+            read_times = [read_at for _, _, read_at in rows if read_at]
+            
+            with transaction.atomic():
+                summary = Notification(
+                    notification_type='summary',
+                    message=f"{len(rows)}× {labels.get(group['notification_type'], group['notification_type'])} am {group['day'].strftime('%d.%m.%Y')}",
+                    is_read=True,
+                    read_at=max(read_times) if read_times else None,
+                    created_at=rows[-1][1],
+                )
+                summary.metadata = {
+                    'summarized_type': group['notification_type'],
+                    'count': len(rows),
+                    'first_created_at': rows[0][1].isoformat(),
+                    'last_created_at': rows[-1][1].isoformat(),
+                }
+                summary.save()
+                removed += Notification.objects.filter(id__in=ids[:batch_size]).delete()[0]
+            removed += cls._delete_ids(Notification, ids[batch_size:], batch_size, pause)
+            summaries += 1
+        return summaries, removed
+    
+    @classmethod
+    def prune_outbox(cls, days, batch_size=BATCH_SIZE, pause=PAUSE):
+        """Löscht erledigte Outbox-Ereignisse, die älter als days Tage sind"""
+        cutoff = timezone.now() - timedelta(days=days)
+        ids = list(
+            OutboxEvent.objects.filter(status=OutboxEvent.STATUS_DONE, created_at__lt=cutoff)
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+        return cls._delete_ids(OutboxEvent, ids, batch_size, pause)
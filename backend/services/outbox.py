@@ -0,0 +1,138 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from backend.models import OutboxEvent
+from backend.services.change_feed import ChangeFeed
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Outbox:
+    """
+    Transaktionale Outbox für Nebenwirkungen von Buchungsänderungen
+    
+    publish() schreibt nur eine Zeile in sportoase_outbox, und zwar in der
+    laufenden Transaktion: Ereignisse entstehen also genau dann, wenn die
+    Buchung committed wird. Benachrichtigungen, Mails usw. erzeugen die
+    registrierten Handler später im Worker (manage.py process_outbox).
+    
+    Handler werden bei Fehlern erneut aufgerufen und müssen daher idempotent
+    sein bzw. ihre Datenbankänderungen in der übergebenen Transaktion machen.
+    """
+    MAX_ATTEMPTS = 5
+    RETRY_DELAY = 30
+    LEASE_SECONDS = 300
+    
+    _handlers = {}
+    
+    @classmethod
+    def register(cls, event_type):
+        """Decorator: registriert einen Handler handler(event) für einen Ereignistyp"""
+        def decorator(func):
+            cls._handlers.setdefault(event_type, []).append(func)
+            return func
+        return decorator
+    
+    @classmethod
+    def publish(cls, event_type, **payload):
+        """
+        Schreibt ein Ereignis in die Outbox
+        
+        Im Modus OUTBOX_DISPATCH = 'on_commit' (Entwicklung ohne Worker) wird
+        das Ereignis direkt nach dem Commit im selben Prozess verarbeitet.
+        
+        Returns:
+            OutboxEvent object
+        """
+        event = OutboxEvent(event_type=event_type)
+        event.payload = payload
+        event.save()
+        ChangeFeed.touch()
+        
+        if getattr(settings, 'OUTBOX_DISPATCH', 'worker') == 'on_commit':
+            transaction.on_commit(lambda: cls._dispatch_after_commit(event.id))
+        return event
+    
+    @classmethod
+    def _dispatch_after_commit(cls, event_id):
+        # Die Buchung ist bereits committed: ein Fehler hier (z.B. 'database is locked')
+        # darf den Request nicht scheitern lassen. Das Ereignis bleibt fällig bzw. wird
+        # nach Ablauf der Reservierung vom Worker erneut verarbeitet.
+        try:
+            cls.process_event(event_id)
+        except Exception as e:
+            logger.error(f"Outbox-Ereignis {event_id} nach Commit nicht verarbeitet, bleibt für den Worker: {e}")
+    
+    @classmethod
+    def _max_attempts(cls):
+        return getattr(settings, 'OUTBOX_MAX_ATTEMPTS', cls.MAX_ATTEMPTS)
+    
+    @classmethod
+    def _due(cls, now):
+        # Abgelaufene 'processing'-Einträge stammen von einem abgestürzten Worker
+        return OutboxEvent.objects.filter(
+            Q(status=OutboxEvent.STATUS_PENDING) | Q(status=OutboxEvent.STATUS_PROCESSING),
+            available_at__lte=now,
+        )
+    
+    @classmethod
+    def _claim(cls, event_id):
+        """Reserviert ein Ereignis für diesen Worker, gibt False zurück, wenn es bereits vergeben ist"""
+        now = timezone.now()
+        return cls._due(now).filter(id=event_id).update(
+            status=OutboxEvent.STATUS_PROCESSING,
+            attempts=F('attempts') + 1,
+            available_at=now + timedelta(seconds=cls.LEASE_SECONDS),
+        ) == 1
+    
+    @classmethod
+    def process_batch(cls, batch_size=100):
+        """
+        Verarbeitet bis zu batch_size fällige Ereignisse in Reihenfolge ihrer ID
+        
+        Returns:
+            Dict mit Anzahl 'processed', 'retried' und 'failed'
+        """
+        ids = list(cls._due(timezone.now()).order_by('id').values_list('id', flat=True)[:batch_size])
+        result = {'processed': 0, 'retried': 0, 'failed': 0}
+        for event_id in ids:
+            outcome = cls.process_event(event_id)
+            if outcome:
+                result[outcome] += 1
+        return result
+    
+    @classmethod
+    def process_event(cls, event_id):
+        """
+        Führt alle Handler eines Ereignisses aus
+        
+        Returns:
+            'processed', 'retried', 'failed' oder None, wenn das Ereignis
+            nicht (mehr) fällig war
+        """
+        if not cls._claim(event_id):
+            return None
+        event = OutboxEvent.objects.get(id=event_id)
+        
+        try:
+            with transaction.atomic():
+                for handler in cls._handlers.get(event.event_type, []):
+                    handler(event)
+                OutboxEvent.objects.filter(id=event.id).update(
+                    status=OutboxEvent.STATUS_DONE,
+                    processed_at=timezone.now(),
+                    last_error='',
+                )
+            return 'processed'
+        except Exception as e:
+            failed = event.attempts >= cls._max_attempts()
+            logger.warning(f"Outbox-Ereignis {event} fehlgeschlagen (Versuch {event.attempts}): {e}")
+            OutboxEvent.objects.filter(id=event.id).update(
+                status=OutboxEvent.STATUS_FAILED if failed else OutboxEvent.STATUS_PENDING,
+                available_at=timezone.now() + timedelta(seconds=cls.RETRY_DELAY * 2 ** (event.attempts - 1)),
+                last_error=f"{type(e).__name__}: {e}",
+            )
+            return 'failed' if failed else 'retried'
@@ -0,0 +1,98 @@
+from datetime import datetime
+from backend.models import Booking, Notification
+from backend.services.analytics import BOOKING_EVENTS, UtilizationRollup
+from backend.services.change_feed import ChangeFeed
+from backend.services.outbox import Outbox
+
+
+def _format_date(value):
+    return datetime.strptime(value, '%Y-%m-%d').strftime('%d.%m.%Y')
+
+
+def _create_notification(event, notification_type, message, booking_id=None, metadata=None):
+    # Idempotent: bei einer Wiederholung des Ereignisses keine zweite Benachrichtigung
+    if Notification.objects.filter(outbox_event_id=event.id).exists():
+        return
+    if booking_id and not Booking.objects.filter(id=booking_id).exists():
+        booking_id = None
+    notification = Notification(
+        booking_id=booking_id,
+        notification_type=notification_type,
+        message=message,
+        outbox_event_id=event.id,
+        created_at=event.created_at,
+    )
+    if metadata:
+        notification.metadata = metadata
+    notification.save()
+    ChangeFeed.touch()
+
+
+@Outbox.register('booking_created')
+def notify_booking_created(event):
+    """Benachrichtigt Admins über eine neue Buchung"""
+    data = event.payload
+    _create_notification(
+        event,
+        'new_booking',
+        f"Neue Buchung: {data['offer_label']} von {data['teacher_name']} am {_format_date(data['date'])} - {data['period']}. Stunde",
+        booking_id=data['booking_id'],
+    )
+
+
+@Outbox.register('booking_series_created')
+def notify_booking_series_created(event):
+    """Benachrichtigt Admins einmal über alle Termine einer Serienbuchung"""
+    data = event.payload
+    dates = data['dates']
+    _create_notification(
+        event,
+        'new_booking',
+        f"Neue Serienbuchung: {data['offer_label']} von {data['teacher_name']} - {len(dates)} Termine, "
+        f"{data['period']}. Stunde, {_format_date(dates[0])} bis {_format_date(dates[-1])}",
+        metadata={'series_key': data['series_key'], 'dates': dates},
+    )
+
+
+@Outbox.register('booking_deleted')
+def notify_booking_deleted(event):
+    """Benachrichtigt Admins über eine gelöschte Buchung"""
+    data = event.payload
+    _create_notification(
+        event,
+        'booking_deleted',
+        f"Buchung gelöscht: {data['offer_label']} von {data['teacher_name']} am {_format_date(data['date'])}",
+    )
+
+
+@Outbox.register('slot_blocked')
+def notify_slot_blocked(event):
+    """Benachrichtigt Admins über einen blockierten Slot"""
+    data = event.payload
+    _create_notification(
+        event,
+        'slot_blocked',
+        f"Slot blockiert: {_format_date(data['date'])} - {data['period']}. Stunde ({data['reason']})",
+    )
+
+
+@Outbox.register('slots_blocked')
+def notify_slots_blocked(event):
+    """Benachrichtigt Admins einmal über eine Sammel-Blockierung"""
+    data = event.payload
+    dates = data['dates']
+    _create_notification(
+        event,
+        'slot_blocked',
+        f"{data['count']} Slots blockiert: {_format_date(dates[0])} bis {_format_date(dates[-1])} ({data['reason']})",
+        metadata={'dates': dates, 'periods': data['periods']},
+    )
+
+
+def refresh_utilization(event):
+    """Berechnet die Belegungs-Rollups der betroffenen Tage neu"""
+    UtilizationRollup.refresh(UtilizationRollup.event_dates(event.payload))
+
+
+for event_type in BOOKING_EVENTS:
+    Outbox.register(event_type)(refresh_utilization)
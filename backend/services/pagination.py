@@ -0,0 +1,88 @@
+from django.db.models import Q
+import base64
+import json
+
+
+class CursorPaginator:
+    """
+    Keyset-Pagination über eine feste Sortierung
+    
+    Statt OFFSET enthält der Cursor die Sortierwerte des letzten Eintrags; die
+    nächste Seite beginnt mit einer WHERE-Bedingung direkt dahinter. Die Kosten
+    pro Seite hängen damit nicht davon ab, wie weit geblättert wurde, sofern
+    ein Index mit derselben Sortierung existiert. Die Sortierung muss eindeutig
+    sein (z.B. mit 'id' als letztem Feld).
+    """
+    
+    def __init__(self, ordering, default_limit=50, max_limit=500):
+        """
+        Args:
+            ordering: Liste von Feldnamen wie in order_by(), z.B. ['-date', 'period', 'id']
+            default_limit: Seitengröße ohne limit-Parameter
+            max_limit: Obergrenze für limit
+        """
+        self.ordering = ordering
+        self.fields = [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+    
+    def encode(self, obj):
+        values = [getattr(obj, name) for name, _ in self.fields]
+        raw = json.dumps([v.isoformat() if hasattr(v, 'isoformat') else v for v in values])
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+    
+    def decode(self, cursor, model):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            values = json.loads(raw)
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError
+            return [model._meta.get_field(name).to_python(value) for (name, _), value in zip(self.fields, values)]
+        except Exception:
+            raise ValueError("Ungültiger Cursor")
+    
+    def _after(self, values):
+        # (a, b, c) > (va, vb, vc) in Sortierreihenfolge:
+        # a > va OR (a = va AND b > vb) OR (a = va AND b = vb AND c > vc)
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(self.fields, values):
+            condition |= equal & Q(**{f'{name}__{"lt" if descending else "gt"}': value})
+            equal &= Q(**{name: value})
+        return condition
+    
+    def _limit(self, limit):
+        if limit in (None, ''):
+            return self.default_limit
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValueError("Ungültiges Limit")
+        if limit < 1:
+            raise ValueError("Ungültiges Limit")
+        return min(limit, self.max_limit)
+    
+    def page(self, queryset, cursor=None, limit=None):
+        """
+        Gibt eine Seite des QuerySets zurück
+        
+        Args:
+            queryset: QuerySet (wird nach self.ordering sortiert)
+            cursor: Optional - next_cursor der vorherigen Seite
+            limit: Optional - Seitengröße (int oder String aus dem Request)
+        
+        Returns:
+            Tuple (Liste der Objekte, next_cursor oder None auf der letzten Seite)
+        
+        Raises:
+            ValueError bei ungültigem Cursor oder Limit
+        """
+        limit = self._limit(limit)
+        queryset = queryset.order_by(*self.ordering)
+        if cursor:
+            queryset = queryset.filter(self._after(self.decode(cursor, queryset.model)))
+        
+        items = list(queryset[:limit + 1])
+        if len(items) > limit:
+            return items[:limit], self.encode(items[limit - 1])
+        return items, None
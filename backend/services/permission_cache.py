@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.core.cache import cache
+import time
+
+
+class PermissionSnapshot:
+    """
+    Zwischengespeicherte Berechtigungen eines Benutzers
+    
+    Der Snapshot enthält die Liste aller Berechtigungen sowie die Flags für
+    sportoase.user und sportoase.admin und liegt im (prozessübergreifenden)
+    Cache. Damit entfallen pro Request die Abfragen auf die Berechtigungstabellen.
+    Snapshots werden ungültig, wenn sich Berechtigungen eines Benutzers ändern
+    (invalidate) oder Gruppenrechte geändert werden (invalidate_all).
+    """
+    KEY_PREFIX = 'sportoase:perms'
+    GENERATION_KEY = f'{KEY_PREFIX}:generation'
+    
+    @classmethod
+    def _key(cls, user_id):
+        return f'{cls.KEY_PREFIX}:user:{user_id}'
+    
+    @classmethod
+    def _timeout(cls):
+        return getattr(settings, 'PERMISSION_SNAPSHOT_TIMEOUT', 10 * 60)
+    
+    @staticmethod
+    def build(user):
+        """Ermittelt den Snapshot direkt aus der Datenbank"""
+        permissions = sorted(user.get_all_permissions())
+        return {
+            'permissions': permissions,
+            'user': user.has_perm('sportoase.user'),
+            'admin': user.has_perm('sportoase.admin'),
+        }
+    
+    @classmethod
+    def get(cls, user):
+        """
+        Gibt den Berechtigungs-Snapshot eines angemeldeten Benutzers zurück
+        
+        Returns:
+            Dict mit 'permissions' (Liste), 'user' (bool) und 'admin' (bool)
+        """
+        cached_snapshot = getattr(user, '_sportoase_permission_snapshot', None)
+        if cached_snapshot is not None:
+            return cached_snapshot
+        
+        key = cls._key(user.pk)
+        found = cache.get_many([key, cls.GENERATION_KEY])
+        generation = found.get(cls.GENERATION_KEY, 0)
+        entry = found.get(key)
+        
+        if entry and entry.get('generation') == generation:
+            snapshot = entry['snapshot']
+        else:
+            snapshot = cls.build(user)
+            cache.set(key, {'generation': generation, 'snapshot': snapshot}, timeout=cls._timeout())
+        
+        user._sportoase_permission_snapshot = snapshot
+        return snapshot
+    
+    @classmethod
+    def invalidate(cls, user_id):
+        """Verwirft den Snapshot eines Benutzers"""
+        cache.delete(cls._key(user_id))
+    
+    @classmethod
+    def invalidate_all(cls):
+        """Verwirft alle Snapshots (z.B. nach Änderung von Gruppenrechten)"""
+        cache.set(cls.GENERATION_KEY, time.time_ns(), timeout=None)
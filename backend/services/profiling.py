@@ -0,0 +1,117 @@
+from django.conf import settings
+from django.utils import timezone
+import io
+import json
+import os
+import pstats
+import re
+import uuid
+
+
+PROFILE_NAME = re.compile(r'^\d{8}-\d{6}-\d{6}-[0-9a-f]{8}$')
+
+
+class ProfileStore:
+    """
+    Ablage der Request-Profile (cProfile) in PROFILE_DIR
+    
+    Pro Profil liegen dort <name>.prof (pstats-Format, z.B. für snakeviz) und
+    <name>.json mit Methode, Pfad, Benutzer, Status und Dauer. Es werden
+    höchstens PROFILE_MAX_FILES Profile behalten, ältere werden beim Speichern
+    gelöscht.
+    """
+    
+    @staticmethod
+    def _directory():
+        return str(getattr(settings, 'PROFILE_DIR', settings.BASE_DIR / 'profiles'))
+    
+    @classmethod
+    def _path(cls, name, extension):
+        if not PROFILE_NAME.match(name or ''):
+            raise ValueError("Ungültiger Profilname")
+        return os.path.join(cls._directory(), f'{name}.{extension}')
+    
+    @classmethod
+    def save(cls, profiler, meta):
+        """
+        Speichert ein Profil und löscht die ältesten über PROFILE_MAX_FILES
+        
+        Args:
+            profiler: beendetes cProfile.Profile
+            meta: Dict mit Angaben zum Request
+        
+        Returns:
+            Name des Profils
+        """
+        now = timezone.now()
+        name = f"{now:%Y%m%d-%H%M%S-%f}-{uuid.uuid4().hex[:8]}"
+        os.makedirs(cls._directory(), exist_ok=True)
+        
+        stats_path = cls._path(name, 'prof')
+        profiler.dump_stats(f'{stats_path}.tmp')
+        os.replace(f'{stats_path}.tmp', stats_path)
+        with open(cls._path(name, 'json'), 'w', encoding='utf-8') as f:
+            json.dump({'name': name, 'created_at': now.isoformat(), **meta}, f, ensure_ascii=False)
+        
+        cls.rotate()
+        return name
+    
+    @classmethod
+    def _names(cls):
+        try:
+            files = os.listdir(cls._directory())
+        except FileNotFoundError:
+            return []
+        # Namen beginnen mit dem Zeitstempel, absteigend sortiert = neueste zuerst
+        return sorted((f[:-5] for f in files if f.endswith('.prof') and PROFILE_NAME.match(f[:-5])), reverse=True)
+    
+    @classmethod
+    def rotate(cls):
+        """Löscht alle Profile außer den neuesten PROFILE_MAX_FILES"""
+        for name in cls._names()[getattr(settings, 'PROFILE_MAX_FILES', 50):]:
+            for extension in ('prof', 'json'):
+                try:
+                    os.remove(cls._path(name, extension))
+                except FileNotFoundError:
+                    pass
+    
+    @classmethod
+    def list(cls):
+        """
+        Returns:
+            Liste der Metadaten aller gespeicherten Profile, neueste zuerst
+        """
+        profiles = []
+        for name in cls._names():
+            try:
+                with open(cls._path(name, 'json'), encoding='utf-8') as f:
+                    meta = json.load(f)
+                meta['size'] = os.path.getsize(cls._path(name, 'prof'))
+            except (OSError, ValueError):
+                continue
+            profiles.append(meta)
+        return profiles
+    
+    @classmethod
+    def stats_path(cls, name):
+        """
+        Pfad der .prof-Datei eines Profils
+        
+        Raises:
+            ValueError: bei ungültigem Namen
+            FileNotFoundError: wenn das Profil nicht (mehr) existiert
+        """
+        path = cls._path(name, 'prof')
+        if not os.path.exists(path):
+            raise FileNotFoundError(name)
+        return path
+    
+    @classmethod
+    def summary(cls, name, sort='cumulative', limit=40):
+        """Textauswertung eines Profils (pstats), die limit teuersten Funktionen nach sort"""
+        if sort not in ('cumulative', 'tottime', 'calls'):
+            raise ValueError("sort muss 'cumulative', 'tottime' oder 'calls' sein")
+        output = io.StringIO()
+        stats = pstats.Stats(cls.stats_path(name), stream=output)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return output.getvalue()
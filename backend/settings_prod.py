@@ -39,6 +39,37 @@ if os.environ.get('ISERV_AUTH_ENABLED', 'False') == 'True':
         'backend.middleware.iserv_auth.IServAuthMiddleware'
     )
 
+# Profil einzelner Requests für Admins (Header X-SportOase-Profile: 1 oder ?_profile=1);
+# ohne Flag keine Messung. Es bleiben die neuesten PROFILE_MAX_FILES Profile in PROFILE_DIR
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'True') == 'True'
+PROFILE_DIR = os.environ.get('PROFILE_DIR', str(BASE_DIR / 'profiles'))
+PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 50))
+
+if PROFILING_ENABLED:
+    # Nach der Authentifizierung, damit die Admin-Berechtigung geprüft werden kann
+    MIDDLEWARE.append('backend.middleware.profiling.ProfilingMiddleware')
+
+# Abfrage- und Zeitmessung pro Request: Server-Timing-Header und JSON-Logzeile
+# für langsame Requests bzw. wiederholte Abfragen (N+1)
+QUERY_TIMING_ENABLED = os.environ.get('QUERY_TIMING_ENABLED', 'False') == 'True'
+QUERY_TIMING_SLOW_MS = int(os.environ.get('QUERY_TIMING_SLOW_MS', 500))
+QUERY_TIMING_DUPLICATE_THRESHOLD = int(os.environ.get('QUERY_TIMING_DUPLICATE_THRESHOLD', 5))
+
+if QUERY_TIMING_ENABLED:
+    # Ganz außen, damit auch Session- und Berechtigungsabfragen mitgezählt werden
+    MIDDLEWARE.insert(0, 'backend.middleware.query_timing.QueryTimingMiddleware')
+
+# Prometheus-Metriken (/metrics): Request-Histogramme über MetricsMiddleware, Dateien pro
+# Worker-Prozess in METRICS_DIR; Zugriff per Bearer-Token oder von METRICS_ALLOWED_IPS
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True') == 'True'
+METRICS_DIR = os.environ.get('METRICS_DIR', str(BASE_DIR / 'metrics'))
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
+
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(0, 'backend.middleware.metrics.MetricsMiddleware')
+
 ROOT_URLCONF = 'backend.main_urls'
 
 TEMPLATES = [
@@ -70,9 +101,33 @@ if db_engine == 'mysql':
             'PASSWORD': os.environ.get('DB_PASSWORD', ''),
             'HOST': os.environ.get('DB_HOST', 'localhost'),
             'PORT': os.environ.get('DB_PORT', '3306'),
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
             'OPTIONS': {
                 'charset': 'utf8mb4',
-                'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
+                'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', 10)),
+                'isolation_level': 'read committed',
+                'init_command': (
+                    "SET sql_mode='STRICT_TRANS_TABLES', "
+                    f"innodb_lock_wait_timeout={int(os.environ.get('DB_LOCK_WAIT_TIMEOUT', 20))}"
+                ),
+            },
+        }
+    }
+elif os.environ.get('SQLITE_PROFILE', 'tuned') == 'tuned':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'backend.db.sqlite',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'pragmas': {
+                    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+                    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 20000)),
+                    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+                },
+                'transaction_mode': 'IMMEDIATE',
             },
         }
     }
@@ -84,6 +139,65 @@ else:
         }
     }
 
+cache_backend = os.environ.get('CACHE_BACKEND', 'file')
+
+if cache_backend == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', 'redis://127.0.0.1:6379/1'),
+        }
+    }
+elif cache_backend == 'db':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'sportoase_cache',
+        }
+    }
+elif cache_backend == 'locmem':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', str(BASE_DIR / 'cache')),
+            'OPTIONS': {
+                'MAX_ENTRIES': 10000,
+            },
+        }
+    }
+
+AVAILABILITY_CACHE_TIMEOUT = int(os.environ.get('AVAILABILITY_CACHE_TIMEOUT', 24 * 60 * 60))
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_ENGINES[os.environ.get('SESSION_BACKEND', 'cached_db')]
+
+PERMISSION_SNAPSHOT_TIMEOUT = int(os.environ.get('PERMISSION_SNAPSHOT_TIMEOUT', 10 * 60))
+
+# Outbox: 'worker' (manage.py process_outbox) oder 'on_commit' (im Request nach dem Commit)
+OUTBOX_DISPATCH = os.environ.get('OUTBOX_DISPATCH', 'worker')
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', 5))
+OUTBOX_RETENTION_DAYS = int(os.environ.get('OUTBOX_RETENTION_DAYS', 30))
+
+# Aufbewahrung gelesener Benachrichtigungen (manage.py prune_notifications)
+NOTIFICATION_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_RETENTION_DAYS', 365))
+NOTIFICATION_COMPACT_AFTER_DAYS = int(os.environ.get('NOTIFICATION_COMPACT_AFTER_DAYS', 30))
+
+# Server-Sent Events (/changes/stream): maximale Dauer einer Verbindung und Prüfintervall in Sekunden
+CHANGE_STREAM_TIMEOUT = int(os.environ.get('CHANGE_STREAM_TIMEOUT', 55))
+CHANGE_STREAM_POLL_INTERVAL = float(os.environ.get('CHANGE_STREAM_POLL_INTERVAL', 1.0))
+# Wartezeit, bevor der Änderungsstrom eine Lücke in den IDs überspringt (MySQL: Commit-Reihenfolge)
+CHANGE_FEED_GAP_GRACE = int(os.environ.get('CHANGE_FEED_GAP_GRACE', 10))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -0,0 +1,36 @@
+from django.contrib.auth.models import Group, User
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+from backend.services.permission_cache import PermissionSnapshot
+
+
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_user_permissions(sender, instance, action, reverse, pk_set, **kwargs):
+    """Verwirft Berechtigungs-Snapshots, wenn sich Rechte oder Gruppen eines Benutzers ändern"""
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        for user_id in pk_set or []:
+            PermissionSnapshot.invalidate(user_id)
+        if action == 'post_clear':
+            PermissionSnapshot.invalidate_all()
+    else:
+        PermissionSnapshot.invalidate(instance.pk)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_group_permissions(sender, action, **kwargs):
+    """Verwirft alle Snapshots, wenn sich die Rechte einer Gruppe ändern"""
+    if action.startswith('post_'):
+        PermissionSnapshot.invalidate_all()
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_snapshot(sender, instance, created, update_fields=None, **kwargs):
+    """Verwirft den Snapshot, wenn sich Superuser- oder Aktiv-Status ändern können"""
+    if created:
+        return
+    if update_fields is not None and not {'is_active', 'is_superuser'} & set(update_fields):
+        return
+    PermissionSnapshot.invalidate(instance.pk)
@@ -1,5 +1,5 @@
 from django.urls import path
-from backend.views import slots, bookings, admin, csrf, auth
+from backend.views import slots, bookings, admin, csrf, auth, changes
 
 app_name = 'sportoase'
 
@@ -11,18 +11,34 @@ urlpatterns = [
     
     path('slots', slots.get_available_slots, name='get_slots'),
     path('slots/week', slots.get_week_overview, name='get_week'),
+    path('slots/range', slots.get_range_overview, name='get_range'),
     path('timeslots', slots.get_timeslots, name='get_timeslots'),
     path('timeslots/<int:timeslot_id>', slots.update_timeslot_label, name='update_timeslot'),
     
     path('book', bookings.create_booking, name='create_booking'),
+    path('book/series', bookings.create_booking_series, name='create_booking_series'),
     path('my-bookings', bookings.get_my_bookings, name='my_bookings'),
     path('bookings', bookings.get_all_bookings, name='all_bookings'),
+    path('bookings/export', bookings.export_bookings, name='export_bookings'),
     path('bookings/<int:booking_id>', bookings.delete_booking, name='delete_booking'),
+    path('students/search', bookings.search_students, name='search_students'),
     
     path('block-slot', admin.block_slot, name='block_slot'),
     path('unblock-slot', admin.unblock_slot, name='unblock_slot'),
+    path('block-slots', admin.block_slots, name='block_slots'),
+    path('unblock-slots', admin.unblock_slots, name='unblock_slots'),
     path('blocked-slots', admin.get_blocked_slots, name='blocked_slots'),
     
     path('notifications', admin.get_notifications, name='notifications'),
+    path('notifications/unread-count', admin.get_unread_notification_count, name='unread_notification_count'),
+    path('notifications/mark-read', admin.mark_notifications_read, name='mark_notifications_read'),
     path('notifications/<int:notification_id>/mark-read', admin.mark_notification_read, name='mark_notification_read'),
+    
+    path('cache-stats', admin.get_cache_stats, name='cache_stats'),
+    path('analytics/utilization', admin.get_utilization, name='utilization'),
+    path('profiles', admin.get_profiles, name='profiles'),
+    path('profiles/<str:name>', admin.download_profile, name='download_profile'),
+    
+    path('changes', changes.get_changes, name='changes'),
+    path('changes/stream', changes.stream_changes, name='changes_stream'),
 ]
@@ -1,20 +1,26 @@
-from django.http import JsonResponse, HttpResponseForbidden
+from django.http import FileResponse, HttpResponse, JsonResponse
 from django.views.decorators.http import require_http_methods
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from datetime import datetime
+from backend.views.decorators import sportoase_required
 from backend.services.booking_service import BookingService
+from backend.services.availability_cache import AvailabilityCache
+from backend.services.analytics import UtilizationRollup
+from backend.services.pagination import CursorPaginator
+from backend.services.profiling import ProfileStore
 from backend.models import BlockedSlot, Notification
 import json
 
 
+BLOCKED_SLOT_PAGES = CursorPaginator(['-date', 'period', 'id'], default_limit=100)
+NOTIFICATION_PAGES = CursorPaginator(['-created_at', 'id'], default_limit=50)
+
+
 @require_http_methods(["POST"])
+@sportoase_required('admin')
 def block_slot(request):
     """POST /api/sportoase/block-slot - Blockiert einen Slot (Admin only)"""
-    if not request.user.is_authenticated:
-        return HttpResponseForbidden("Authentifizierung erforderlich")
-    
-    if not request.user.has_perm("sportoase.admin"):
-        return HttpResponseForbidden("Nur für Admins")
-    
     try:
         data = json.loads(request.body)
     except json.JSONDecodeError:
@@ -54,14 +60,9 @@ def block_slot(request):
 
 
 @require_http_methods(["POST"])
+@sportoase_required('admin')
 def unblock_slot(request):
     """POST /api/sportoase/unblock-slot - Gibt einen Slot frei (Admin only)"""
-    if not request.user.is_authenticated:
-        return HttpResponseForbidden("Authentifizierung erforderlich")
-    
-    if not request.user.has_perm("sportoase.admin"):
-        return HttpResponseForbidden("Nur für Admins")
-    
     try:
         data = json.loads(request.body)
     except json.JSONDecodeError:
@@ -87,54 +88,144 @@ def unblock_slot(request):
         return JsonResponse({'success': False, 'error': f'Fehler: {str(e)}'}, status=500)
 
 
+def _parse_bulk_selection(request):
+    """Liest start_date, end_date, periods und weekdays einer Sammel-Blockierung aus dem Body"""
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        raise ValueError('Ungültige JSON-Daten')
+    
+    for field in ['start_date', 'end_date']:
+        if field not in data:
+            raise ValueError(f'Feld "{field}" fehlt')
+    
+    try:
+        start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
+        end_date = datetime.strptime(data['end_date'], '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        raise ValueError('Ungültiges Datumsformat')
+    
+    return data, {
+        'start_date': start_date,
+        'end_date': end_date,
+        'periods': data.get('periods'),
+        'weekdays': data.get('weekdays'),
+    }
+
+
+@require_http_methods(["POST"])
+@sportoase_required('admin')
+def block_slots(request):
+    """
+    POST /api/sportoase/block-slots - Blockiert alle Slots eines Zeitraums (Admin only)
+    
+    Body: start_date, end_date, optional periods (Liste), weekdays (Liste, Standard Mo–Fr), reason
+    """
+    try:
+        data, selection = _parse_bulk_selection(request)
+        result = BookingService.block_slots(
+            admin_user=request.user,
+            reason=data.get('reason', 'Beratung'),
+            **selection
+        )
+        
+        return JsonResponse({
+            'success': True,
+            'message': f"{len(result['blocked'])} Slots blockiert",
+            **result
+        })
+    
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    except PermissionError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=403)
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': f'Fehler: {str(e)}'}, status=500)
+
+
+@require_http_methods(["POST"])
+@sportoase_required('admin')
+def unblock_slots(request):
+    """
+    POST /api/sportoase/unblock-slots - Gibt alle blockierten Slots eines Zeitraums frei (Admin only)
+    
+    Body: start_date, end_date, optional periods (Liste), weekdays (Liste, Standard Mo–Fr)
+    """
+    try:
+        _, selection = _parse_bulk_selection(request)
+        unblocked = BookingService.unblock_slots(admin_user=request.user, **selection)
+        
+        return JsonResponse({
+            'success': True,
+            'message': f"{unblocked} Slots freigegeben",
+            'unblocked': unblocked
+        })
+    
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    except PermissionError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=403)
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': f'Fehler: {str(e)}'}, status=500)
+
+
 @require_http_methods(["GET"])
+@sportoase_required('admin')
 def get_blocked_slots(request):
-    """GET /api/sportoase/blocked-slots - Gibt alle blockierten Slots zurück"""
-    if not request.user.is_authenticated:
-        return HttpResponseForbidden("Authentifizierung erforderlich")
-    
-    if not request.user.has_perm("sportoase.admin"):
-        return HttpResponseForbidden("Nur für Admins")
+    """
+    GET /api/sportoase/blocked-slots - Gibt alle blockierten Slots zurück
     
-    blocked_slots = BlockedSlot.objects.all().order_by('-date', 'period')[:100]
+    Query params:
+        cursor: Optional - next_cursor der vorherigen Seite
+        limit: Optional - Seitengröße (Standard 100, max. 500)
+    """
+    try:
+        page, next_cursor = BLOCKED_SLOT_PAGES.page(
+            BlockedSlot.objects.select_related('blocked_by'),
+            request.GET.get('cursor'),
+            request.GET.get('limit'),
+        )
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
     
     return JsonResponse({
         'success': True,
-        'blocked_slots': [bs.to_dict() for bs in blocked_slots]
+        'blocked_slots': [bs.to_dict() for bs in page],
+        'next_cursor': next_cursor,
     })
 
 
 @require_http_methods(["GET"])
+@sportoase_required('admin')
 def get_notifications(request):
-    """GET /api/sportoase/notifications - Gibt Benachrichtigungen zurück"""
-    if not request.user.is_authenticated:
-        return HttpResponseForbidden("Authentifizierung erforderlich")
+    """
+    GET /api/sportoase/notifications - Gibt Benachrichtigungen zurück
     
-    if not request.user.has_perm("sportoase.admin"):
-        return HttpResponseForbidden("Nur für Admins")
+    Query params:
+        unread_only: Optional - 'true' für nur ungelesene
+        cursor: Optional - next_cursor der vorherigen Seite
+        limit: Optional - Seitengröße (Standard 50, max. 500)
+    """
+    notifications = Notification.objects.all()
+    if request.GET.get('unread_only') == 'true':
+        notifications = notifications.filter(is_read=False)
     
-    unread_only = request.GET.get('unread_only') == 'true'
-    
-    if unread_only:
-        notifications = BookingService.get_unread_notifications()
-    else:
-        notifications = Notification.objects.all().order_by('-created_at')[:50]
+    try:
+        page, next_cursor = NOTIFICATION_PAGES.page(notifications, request.GET.get('cursor'), request.GET.get('limit'))
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
     
     return JsonResponse({
         'success': True,
-        'notifications': [n.to_dict() for n in notifications]
+        'notifications': [n.to_dict() for n in page],
+        'next_cursor': next_cursor,
     })
 
 
 @require_http_methods(["POST"])
+@sportoase_required('admin')
 def mark_notification_read(request, notification_id):
     """POST /api/sportoase/notifications/<id>/mark-read - Markiert Benachrichtigung als gelesen"""
-    if not request.user.is_authenticated:
-        return HttpResponseForbidden("Authentifizierung erforderlich")
-    
-    if not request.user.has_perm("sportoase.admin"):
-        return HttpResponseForbidden("Nur für Admins")
-    
     success = BookingService.mark_notification_read(notification_id)
     
     if success:
@@ -147,3 +238,134 @@ def mark_notification_read(request, notification_id):
             'success': False,
             'error': 'Benachrichtigung nicht gefunden'
         }, status=404)
+
+
+@require_http_methods(["GET"])
+@sportoase_required('admin')
+def get_unread_notification_count(request):
+    """GET /api/sportoase/notifications/unread-count - Anzahl ungelesener Benachrichtigungen"""
+    return JsonResponse({
+        'success': True,
+        'unread_count': BookingService.count_unread_notifications()
+    })
+
+
+@require_http_methods(["POST"])
+@sportoase_required('admin')
+def mark_notifications_read(request):
+    """
+    POST /api/sportoase/notifications/mark-read - Markiert mehrere Benachrichtigungen als gelesen
+    
+    Body (mindestens eines der Felder, mehrere werden kombiniert):
+        ids: Liste von Notification-IDs
+        up_to_id: alle Benachrichtigungen bis einschließlich dieser ID
+        before: ISO-Zeitpunkt, alle Benachrichtigungen bis zu diesem Zeitpunkt
+    """
+    try:
+        data = json.loads(request.body or '{}')
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'error': 'Ungültige JSON-Daten'}, status=400)
+    
+    ids = data.get('ids')
+    if ids is not None and (not isinstance(ids, list) or not all(isinstance(i, int) for i in ids)):
+        return JsonResponse({'success': False, 'error': '"ids" muss eine Liste von IDs sein'}, status=400)
+    
+    up_to_id = data.get('up_to_id')
+    if up_to_id is not None and not isinstance(up_to_id, int):
+        return JsonResponse({'success': False, 'error': '"up_to_id" muss eine ID sein'}, status=400)
+    
+    before = None
+    if data.get('before'):
+        before = parse_datetime(str(data['before']))
+        if before is None:
+            return JsonResponse({'success': False, 'error': 'Ungültiges Zeitformat'}, status=400)
+        if timezone.is_naive(before):
+            before = timezone.make_aware(before)
+    
+    try:
+        updated = BookingService.mark_notifications_read(ids=ids, up_to_id=up_to_id, before=before)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    
+    return JsonResponse({
+        'success': True,
+        'updated': updated,
+        'unread_count': BookingService.count_unread_notifications()
+    })
+
+
+@require_http_methods(["GET"])
+@sportoase_required('admin')
+def get_cache_stats(request):
+    """GET /api/sportoase/cache-stats - Gibt Hit/Miss-Zähler des Verfügbarkeits-Caches zurück"""
+    return JsonResponse({
+        'success': True,
+        'availability_cache': AvailabilityCache.stats()
+    })
+
+
+@require_http_methods(["GET"])
+@sportoase_required('admin')
+def get_utilization(request):
+    """
+    GET /api/sportoase/analytics/utilization - Belegungsauswertung aus den täglichen Rollups (Admin only)
+    
+    Query params:
+        start_date, end_date: Zeitraum (inklusive)
+        group_by: 'slot' (Standard, mit Auslastung), 'weekday', 'date', 'teacher', 'offer_type' oder 'class'
+    """
+    try:
+        start_date = datetime.strptime(request.GET.get('start_date', ''), '%Y-%m-%d').date()
+        end_date = datetime.strptime(request.GET.get('end_date', ''), '%Y-%m-%d').date()
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'start_date und end_date im Format YYYY-MM-DD erforderlich'}, status=400)
+    
+    group_by = request.GET.get('group_by', 'slot')
+    try:
+        rows = UtilizationRollup.report(start_date, end_date, group_by)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    
+    return JsonResponse({
+        'success': True,
+        'start_date': start_date.strftime('%Y-%m-%d'),
+        'end_date': end_date.strftime('%Y-%m-%d'),
+        'group_by': group_by,
+        'rows': rows
+    })
+
+
+@require_http_methods(["GET"])
+@sportoase_required('admin')
+def get_profiles(request):
+    """GET /api/sportoase/profiles - Listet die gespeicherten Request-Profile, neueste zuerst (Admin only)"""
+    return JsonResponse({
+        'success': True,
+        'profiles': ProfileStore.list()
+    })
+
+
+@require_http_methods(["GET"])
+@sportoase_required('admin')
+def download_profile(request, name):
+    """
+    GET /api/sportoase/profiles/<name> - Lädt ein Request-Profil herunter (Admin only)
+    
+    Query params:
+        format: 'prof' (Standard, pstats-Datei z.B. für snakeviz) oder 'text' (Auswertung als Text)
+        sort: bei format=text 'cumulative' (Standard), 'tottime' oder 'calls'
+    """
+    output_format = request.GET.get('format', 'prof')
+    try:
+        if output_format == 'text':
+            summary = ProfileStore.summary(name, sort=request.GET.get('sort', 'cumulative'))
+            return HttpResponse(summary, content_type='text/plain; charset=utf-8')
+        if output_format != 'prof':
+            return JsonResponse({'success': False, 'error': "format muss 'prof' oder 'text' sein"}, status=400)
+        path = ProfileStore.stats_path(name)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    except FileNotFoundError:
+        return JsonResponse({'success': False, 'error': 'Profil nicht gefunden'}, status=404)
+    
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=f'{name}.prof', content_type='application/octet-stream')
@@ -1,7 +1,8 @@
-from django.http import JsonResponse, HttpResponseForbidden
+from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.contrib.auth import authenticate, login, logout
 from django.views.decorators.csrf import csrf_exempt
+from backend.services.permission_cache import PermissionSnapshot
 import json
 
 
@@ -21,17 +22,18 @@ def login_view(request):
         
         if user is not None:
             login(request, user)
+            PermissionSnapshot.invalidate(user.pk)
             return JsonResponse({
                 'success': True,
                 'user': {
                     'username': user.username,
                     'is_staff': user.is_staff,
-                    'permissions': list(user.get_all_permissions())
+                    'permissions': PermissionSnapshot.get(user)['permissions']
                 }
             })
         else:
             return JsonResponse({'error': 'Ungültige Anmeldedaten'}, status=401)
-            
+    
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
@@ -52,7 +54,7 @@ def check_auth(request):
             'user': {
                 'username': request.user.username,
                 'is_staff': request.user.is_staff,
-                'permissions': list(request.user.get_all_permissions())
+                'permissions': PermissionSnapshot.get(request.user)['permissions']
             }
         })
     return JsonResponse({'authenticated': False})
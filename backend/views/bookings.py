@@ -1,20 +1,23 @@
-from django.http import JsonResponse, HttpResponseForbidden
-from django.views.decorators.http import require_http_methods
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_http_methods, condition
+from django.views.decorators.cache import cache_control
 from datetime import datetime
-from backend.services.booking_service import BookingService
+from backend.views.decorators import sportoase_required
+from backend.services.booking_service import BookingService, StudentConflictError, SeriesConflictError
+from backend.services.pagination import CursorPaginator
+from backend.services.export import BookingExport
+from backend.views import etags
 from backend.models import Booking
 import json
 
 
+BOOKING_PAGES = CursorPaginator(['-date', 'period', 'id'], default_limit=100)
+
+
 @require_http_methods(["POST"])
+@sportoase_required('user')
 def create_booking(request):
     """POST /api/sportoase/book - Erstellt eine neue Buchung"""
-    if not request.user.is_authenticated:
-        return HttpResponseForbidden("Authentifizierung erforderlich")
-    
-    if not request.user.has_perm("sportoase.user"):
-        return HttpResponseForbidden("Keine Berechtigung")
-    
     try:
         data = json.loads(request.body)
     except json.JSONDecodeError:
@@ -49,21 +52,76 @@ def create_booking(request):
             'booking': booking.to_dict()
         })
     
+    except StudentConflictError as e:
+        return JsonResponse({'success': False, 'error': str(e), 'conflicts': e.conflicts}, status=400)
     except ValueError as e:
         return JsonResponse({'success': False, 'error': str(e)}, status=400)
     except Exception as e:
         return JsonResponse({'success': False, 'error': f'Fehler beim Erstellen der Buchung: {str(e)}'}, status=500)
 
 
+@require_http_methods(["POST"])
+@sportoase_required('user')
+def create_booking_series(request):
+    """
+    POST /api/sportoase/book/series - Bucht eine Stunde wöchentlich für einen Zeitraum
+    
+    Body: weekday, period, start_date, end_date, students, offer_type, offer_label,
+    optional teacher_name, teacher_class und skip_conflicts (Termine mit Konflikten auslassen)
+    """
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'error': 'Ungültige JSON-Daten'}, status=400)
+    
+    required_fields = ['weekday', 'period', 'start_date', 'end_date', 'students', 'offer_type', 'offer_label']
+    for field in required_fields:
+        if field not in data:
+            return JsonResponse({'success': False, 'error': f'Feld "{field}" fehlt'}, status=400)
+    
+    try:
+        start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
+        end_date = datetime.strptime(data['end_date'], '%Y-%m-%d').date()
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Ungültiges Datumsformat'}, status=400)
+    
+    try:
+        result = BookingService.create_booking_series(
+            weekday=data['weekday'],
+            period=data['period'],
+            start_date=start_date,
+            end_date=end_date,
+            teacher=request.user,
+            students=data['students'],
+            offer_type=data['offer_type'],
+            offer_label=data['offer_label'],
+            teacher_name=data.get('teacher_name'),
+            teacher_class=data.get('teacher_class'),
+            skip_conflicts=bool(data.get('skip_conflicts')),
+        )
+        
+        return JsonResponse({
+            'success': True,
+            'message': f"{len(result['bookings'])} Termine erfolgreich gebucht",
+            'series_key': result['series_key'],
+            'bookings': [b.to_dict() for b in result['bookings']],
+            'conflicts': result['conflicts'],
+        })
+    
+    except (StudentConflictError, SeriesConflictError) as e:
+        return JsonResponse({'success': False, 'error': str(e), 'conflicts': e.conflicts}, status=400)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': f'Fehler beim Erstellen der Serienbuchung: {str(e)}'}, status=500)
+
+
+@cache_control(private=True, no_cache=True)
 @require_http_methods(["GET"])
+@sportoase_required('user')
+@condition(etag_func=etags.my_bookings_etag)
 def get_my_bookings(request):
     """GET /api/sportoase/my-bookings - Gibt die Buchungen des aktuellen Benutzers zurück"""
-    if not request.user.is_authenticated:
-        return HttpResponseForbidden("Authentifizierung erforderlich")
-    
-    if not request.user.has_perm("sportoase.user"):
-        return HttpResponseForbidden("Keine Berechtigung")
-    
     start_date_str = request.GET.get('start_date')
     end_date_str = request.GET.get('end_date')
     
@@ -79,14 +137,9 @@ def get_my_bookings(request):
 
 
 @require_http_methods(["DELETE"])
+@sportoase_required('user')
 def delete_booking(request, booking_id):
     """DELETE /api/sportoase/bookings/<id> - Löscht eine Buchung"""
-    if not request.user.is_authenticated:
-        return HttpResponseForbidden("Authentifizierung erforderlich")
-    
-    if not request.user.has_perm("sportoase.user"):
-        return HttpResponseForbidden("Keine Berechtigung")
-    
     try:
         BookingService.delete_booking(booking_id, request.user)
         return JsonResponse({
@@ -103,26 +156,109 @@ def delete_booking(request, booking_id):
 
 
 @require_http_methods(["GET"])
+@sportoase_required('user')
+def search_students(request):
+    """
+    GET /api/sportoase/students/search - Sucht, wann ein Schüler oder eine Klasse gebucht ist
+    
+    Query params:
+        start_date, end_date: Zeitraum (inklusive)
+        name: Optional - Anfang des Schülernamens (Groß-/Kleinschreibung egal)
+        klasse: Optional - Klasse
+    """
+    try:
+        start_date = datetime.strptime(request.GET.get('start_date', ''), '%Y-%m-%d').date()
+        end_date = datetime.strptime(request.GET.get('end_date', ''), '%Y-%m-%d').date()
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'start_date und end_date im Format YYYY-MM-DD erforderlich'}, status=400)
+    
+    try:
+        results, truncated = BookingService.search_students(
+            start_date, end_date,
+            name=request.GET.get('name'),
+            klasse=request.GET.get('klasse'),
+        )
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    
+    return JsonResponse({
+        'success': True,
+        'results': results,
+        'truncated': truncated
+    })
+
+
+@require_http_methods(["GET"])
+@sportoase_required('admin')
 def get_all_bookings(request):
-    """GET /api/sportoase/bookings - Gibt alle Buchungen zurück (Admin only)"""
-    if not request.user.is_authenticated:
-        return HttpResponseForbidden("Authentifizierung erforderlich")
+    """
+    GET /api/sportoase/bookings - Gibt alle Buchungen zurück (Admin only)
     
-    if not request.user.has_perm("sportoase.admin"):
-        return HttpResponseForbidden("Nur für Admins")
+    Query params:
+        date: Optional - nur Buchungen dieses Tages
+        cursor: Optional - next_cursor der vorherigen Seite
+        limit: Optional - Seitengröße (Standard 100, max. 500)
+    """
+    bookings = Booking.objects.select_related('teacher')
     
     date_str = request.GET.get('date')
-    
     if date_str:
         try:
             date = datetime.strptime(date_str, '%Y-%m-%d').date()
-            bookings = Booking.objects.filter(date=date).order_by('period')
         except ValueError:
             return JsonResponse({'error': 'Ungültiges Datumsformat'}, status=400)
-    else:
-        bookings = Booking.objects.all().order_by('-date', 'period')[:100]
+        bookings = bookings.filter(date=date)
+    
+    try:
+        page, next_cursor = BOOKING_PAGES.page(bookings, request.GET.get('cursor'), request.GET.get('limit'))
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
     
     return JsonResponse({
         'success': True,
-        'bookings': [b.to_dict() for b in bookings]
+        'bookings': [b.to_dict() for b in page],
+        'next_cursor': next_cursor,
     })
+
+
+@require_http_methods(["GET"])
+@sportoase_required('admin')
+def export_bookings(request):
+    """
+    GET /api/sportoase/bookings/export - Exportiert Buchungen eines Zeitraums (Admin only)
+    
+    Query params:
+        start_date, end_date: Zeitraum (inklusive)
+        format: 'csv' (Standard) oder 'xlsx'
+        students: 'expand' für eine Zeile pro Schüler
+    """
+    try:
+        start_date = datetime.strptime(request.GET.get('start_date', ''), '%Y-%m-%d').date()
+        end_date = datetime.strptime(request.GET.get('end_date', ''), '%Y-%m-%d').date()
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'start_date und end_date im Format YYYY-MM-DD erforderlich'}, status=400)
+    
+    if end_date < start_date:
+        return JsonResponse({'success': False, 'error': 'Das Enddatum liegt vor dem Startdatum'}, status=400)
+    
+    export_format = request.GET.get('format', 'csv')
+    expand_students = request.GET.get('students') == 'expand'
+    filename = f"sportoase-buchungen-{start_date.isoformat()}-{end_date.isoformat()}"
+    
+    if export_format == 'csv':
+        response = StreamingHttpResponse(
+            BookingExport.stream_csv(start_date, end_date, expand_students),
+            content_type='text/csv; charset=utf-8',
+        )
+    elif export_format == 'xlsx':
+        response = StreamingHttpResponse(
+            BookingExport.stream_xlsx(start_date, end_date, expand_students),
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
+    else:
+        return JsonResponse({'success': False, 'error': 'Ungültiges Format'}, status=400)
+    
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    response['Cache-Control'] = 'private, no-store'
+    return response
+
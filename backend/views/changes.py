@@ -0,0 +1,55 @@
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_http_methods
+from backend.views.decorators import sportoase_required
+from backend.services.change_feed import ChangeFeed
+
+
+def _request_cursor(request):
+    """Cursor aus Last-Event-ID (Reconnect von EventSource) oder ?cursor=, sonst aktueller Stand"""
+    value = request.headers.get('Last-Event-ID') or request.GET.get('cursor')
+    return ChangeFeed.parse_cursor(value) or ChangeFeed.current_cursor()
+
+
+@require_http_methods(["GET"])
+@sportoase_required('user')
+def get_changes(request):
+    """
+    GET /api/sportoase/changes - Gibt die Änderungen seit einem Cursor zurück
+    
+    Query params:
+        cursor: Optional - Cursor der letzten Antwort; ohne Cursor wird nur der aktuelle Stand geliefert
+    """
+    cursor = ChangeFeed.parse_cursor(request.GET.get('cursor'))
+    if cursor is None:
+        return JsonResponse({
+            'success': True,
+            'events': [],
+            'cursor': ChangeFeed.format_cursor(*ChangeFeed.current_cursor()),
+        })
+    
+    messages, cursor, more, _ = ChangeFeed.read(cursor, include_notifications=request.sportoase_permissions['admin'])
+    return JsonResponse({
+        'success': True,
+        'events': [{'event': event, 'data': data} for event, data, _ in messages],
+        'cursor': ChangeFeed.format_cursor(*cursor),
+        'more': more,
+    })
+
+
+@require_http_methods(["GET"])
+@sportoase_required('user')
+def stream_changes(request):
+    """
+    GET /api/sportoase/changes/stream - Server-Sent Events für Verfügbarkeit und Benachrichtigungen
+    
+    Events:
+        availability: {'dates': [...], 'all': bool} - geänderte Tage neu laden
+        notification: Benachrichtigung (nur für Admins)
+    """
+    response = StreamingHttpResponse(
+        ChangeFeed.stream(_request_cursor(request), include_notifications=request.sportoase_permissions['admin']),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
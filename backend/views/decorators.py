@@ -0,0 +1,37 @@
+from django.http import HttpResponseForbidden
+from backend.services.permission_cache import PermissionSnapshot
+import functools
+
+
+DEFAULT_MESSAGES = {
+    'user': "Keine Berechtigung",
+    'admin': "Nur für Admins",
+}
+
+
+def sportoase_required(level='user', message=None):
+    """
+    Prüft Anmeldung und SportOase-Berechtigung eines Views
+    
+    Die Berechtigungen werden aus dem PermissionSnapshot gelesen, nicht aus den
+    Berechtigungstabellen. Der Snapshot steht im View als
+    request.sportoase_permissions zur Verfügung.
+    
+    Args:
+        level: 'user' (sportoase.user), 'admin' (sportoase.admin) oder None (nur Anmeldung)
+        message: Optional - Text der 403-Antwort bei fehlender Berechtigung
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not request.user.is_authenticated:
+                return HttpResponseForbidden("Authentifizierung erforderlich")
+            
+            snapshot = PermissionSnapshot.get(request.user)
+            if level and not snapshot[level]:
+                return HttpResponseForbidden(message or DEFAULT_MESSAGES[level])
+            
+            request.sportoase_permissions = snapshot
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,98 @@
+from django.db.models import Count, Max
+from datetime import datetime, timedelta
+from backend.services.availability_cache import AvailabilityCache
+from backend.services.booking_service import MAX_RANGE_DAYS
+from backend.models import Booking
+import hashlib
+
+
+# Die ETag-Funktionen laufen hinter sportoase_required: request.user ist
+# angemeldet und hat sportoase.user.
+
+
+def _hash(*parts):
+    """Bildet aus den übergebenen Teilen einen kompakten ETag-Wert"""
+    return hashlib.sha1('|'.join(str(p) for p in parts).encode('utf-8')).hexdigest()
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _availability_etag(request, dates):
+    global_version, versions = AvailabilityCache.get_versions(dates)
+    return _hash(
+        request.path,
+        request.GET.urlencode(),
+        global_version,
+        *(f'{date.isoformat()}:{versions[date]}' for date in dates),
+    )
+
+
+def slots_etag(request):
+    """ETag für GET /slots aus der Version des angefragten Tages"""
+    date = _parse_date(request.GET.get('date'))
+    if not date:
+        return None
+    
+    return _availability_etag(request, [date])
+
+
+def week_etag(request):
+    """ETag für GET /slots/week aus den Versionen der fünf Wochentage"""
+    start_date_str = request.GET.get('start_date')
+    if start_date_str:
+        start_date = _parse_date(start_date_str)
+        if not start_date:
+            return None
+    else:
+        today = datetime.now().date()
+        start_date = today - timedelta(days=today.weekday())
+    
+    return _availability_etag(request, [start_date + timedelta(days=i) for i in range(5)])
+
+
+def range_etag(request):
+    """ETag für GET /slots/range aus den Versionen aller Tage des Zeitraums"""
+    start_date = _parse_date(request.GET.get('start_date'))
+    end_date = _parse_date(request.GET.get('end_date'))
+    if not start_date or not end_date or end_date < start_date:
+        return None
+    
+    days = (end_date - start_date).days + 1
+    if days > MAX_RANGE_DAYS:
+        return None
+    
+    return _availability_etag(request, [start_date + timedelta(days=i) for i in range(days)])
+
+
+def my_bookings_etag(request):
+    """ETag für GET /my-bookings aus max(updated_at) und Anzahl der Buchungen"""
+    bookings = Booking.objects.filter(teacher=request.user)
+    
+    start_date_str = request.GET.get('start_date')
+    end_date_str = request.GET.get('end_date')
+    if start_date_str:
+        start_date = _parse_date(start_date_str)
+        if not start_date:
+            return None
+        bookings = bookings.filter(date__gte=start_date)
+    if end_date_str:
+        end_date = _parse_date(end_date_str)
+        if not end_date:
+            return None
+        bookings = bookings.filter(date__lte=end_date)
+    
+    state = bookings.order_by().aggregate(last_update=Max('updated_at'), count=Count('id'))
+    
+    return _hash(
+        request.path,
+        request.GET.urlencode(),
+        request.user.id,
+        request.user.email,
+        state['last_update'].isoformat() if state['last_update'] else '-',
+        state['count'],
+    )
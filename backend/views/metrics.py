@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_http_methods
+from backend.models import Booking, Notification
+from backend.services.availability_cache import AvailabilityCache
+from backend.services.metrics import Metrics
+import hmac
+
+
+def _allowed(request):
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        return hmac.compare_digest(header, f'Bearer {token}')
+    return request.META.get('REMOTE_ADDR') in getattr(settings, 'METRICS_ALLOWED_IPS', ['127.0.0.1', '::1'])
+
+
+@require_http_methods(["GET"])
+def metrics(request):
+    """
+    GET /metrics - Metriken aller Worker-Prozesse im Prometheus-Textformat
+    
+    Zugriff mit 'Authorization: Bearer <METRICS_TOKEN>' oder, ohne Token,
+    nur von den Adressen in METRICS_ALLOWED_IPS.
+    """
+    if not _allowed(request):
+        return HttpResponseForbidden("Kein Zugriff auf Metriken")
+    
+    cache_stats = AvailabilityCache.stats()['shared']
+    extra = [
+        ('sportoase_availability_cache_hits_total', 'counter', 'Treffer im Verfügbarkeits-Cache', {}, cache_stats['hits']),
+        ('sportoase_availability_cache_misses_total', 'counter', 'Fehlzugriffe im Verfügbarkeits-Cache', {}, cache_stats['misses']),
+        ('sportoase_availability_cache_hit_ratio', 'gauge', 'Trefferquote des Verfügbarkeits-Caches', {}, cache_stats['hit_ratio'] or 0),
+        ('sportoase_table_rows', 'gauge', 'Zeilen pro Tabelle', {'table': 'bookings'}, Booking.objects.count()),
+        ('sportoase_table_rows', 'gauge', 'Zeilen pro Tabelle', {'table': 'notifications'}, Notification.objects.count()),
+    ]
+    return HttpResponse(Metrics.render(extra), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,21 +1,79 @@
-from django.http import JsonResponse, HttpResponseForbidden
-from django.views.decorators.http import require_http_methods
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods, condition
+from django.views.decorators.cache import cache_control
 from django.views.decorators.csrf import csrf_exempt
 from datetime import datetime, timedelta
-from backend.services.booking_service import BookingService
-from backend.models import TimeSlot
+from backend.views.decorators import sportoase_required
+from backend.services.booking_service import BookingService, MAX_RANGE_DAYS, SLOT_FIELDS
+from backend.views import etags
+from backend.models import Booking, TimeSlot
 import json
 
 
+def _split_fields(value):
+    if not value:
+        return None
+    return [field.strip() for field in value.split(',') if field.strip()]
+
+
+def _parse_projection(request):
+    """
+    Liest die Darstellungsoptionen aus der Query
+    
+    - view=summary: nur Zähler und Flags, keine eingebetteten Buchungen
+    - fields=a,b,c: nur diese Slot-Felder ausgeben
+    - booking_fields=a,b,c: nur diese Felder der eingebetteten Buchungen laden
+    - format=columnar: Slots eines Tages als parallele Arrays (nur Woche/Zeitraum)
+    
+    Raises:
+        ValueError bei unbekannten Werten
+    """
+    view = request.GET.get('view', 'full')
+    if view not in ('full', 'summary'):
+        raise ValueError('view muss "full" oder "summary" sein')
+    
+    output_format = request.GET.get('format', 'rows')
+    if output_format not in ('rows', 'columnar'):
+        raise ValueError('format muss "rows" oder "columnar" sein')
+    
+    fields = _split_fields(request.GET.get('fields'))
+    unknown = [f for f in fields or [] if f not in SLOT_FIELDS]
+    if unknown:
+        raise ValueError(f'Unbekannte Felder: {", ".join(unknown)}')
+    
+    booking_fields = _split_fields(request.GET.get('booking_fields'))
+    unknown = [f for f in booking_fields or [] if f not in Booking.DICT_FIELDS]
+    if unknown:
+        raise ValueError(f'Unbekannte Buchungsfelder: {", ".join(unknown)}')
+    
+    include_bookings = view == 'full' and (fields is None or 'bookings' in fields)
+    
+    return {
+        'include_bookings': include_bookings,
+        'booking_fields': booking_fields if include_bookings else None,
+        'fields': fields,
+        'columnar': output_format == 'columnar',
+    }
+
+
+def _render_slots(slots, options):
+    if options['fields']:
+        slots = BookingService.project_slots(slots, options['fields'])
+    if options['columnar']:
+        return BookingService.slots_to_columns(slots, options['fields'])
+    return slots
+
+
+def _render_days(days, options):
+    return [{**day, 'slots': _render_slots(day['slots'], options)} for day in days]
+
+
+@cache_control(private=True, no_cache=True)
 @require_http_methods(["GET"])
+@sportoase_required('user')
+@condition(etag_func=etags.slots_etag)
 def get_available_slots(request):
     """GET /api/sportoase/slots - Gibt verfügbare Slots zurück"""
-    if not request.user.is_authenticated:
-        return HttpResponseForbidden("Authentifizierung erforderlich")
-    
-    if not request.user.has_perm("sportoase.user"):
-        return HttpResponseForbidden("Keine Berechtigung")
-    
     date_str = request.GET.get('date')
     if not date_str:
         return JsonResponse({'error': 'Datum erforderlich'}, status=400)
@@ -25,24 +83,29 @@ def get_available_slots(request):
     except ValueError:
         return JsonResponse({'error': 'Ungültiges Datumsformat (YYYY-MM-DD erwartet)'}, status=400)
     
-    slots = BookingService.get_available_slots(date, request.user)
+    try:
+        options = _parse_projection(request)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    options['columnar'] = False
+    
+    slots = BookingService.get_available_slots(
+        date, request.user, options['include_bookings'], options['booking_fields']
+    )
     
     return JsonResponse({
         'success': True,
         'date': date_str,
-        'slots': slots
+        'slots': _render_slots(slots, options)
     })
 
 
+@cache_control(private=True, no_cache=True)
 @require_http_methods(["GET"])
+@sportoase_required('user')
+@condition(etag_func=etags.week_etag)
 def get_week_overview(request):
     """GET /api/sportoase/slots/week - Gibt Übersicht für eine Woche zurück"""
-    if not request.user.is_authenticated:
-        return HttpResponseForbidden("Authentifizierung erforderlich")
-    
-    if not request.user.has_perm("sportoase.user"):
-        return HttpResponseForbidden("Keine Berechtigung")
-    
     start_date_str = request.GET.get('start_date')
     if not start_date_str:
         today = datetime.now().date()
@@ -53,29 +116,68 @@ def get_week_overview(request):
         except ValueError:
             return JsonResponse({'error': 'Ungültiges Datumsformat'}, status=400)
     
-    week_data = []
-    for i in range(5):
-        date = start_date + timedelta(days=i)
-        slots = BookingService.get_available_slots(date)
-        week_data.append({
-            'date': date.strftime('%Y-%m-%d'),
-            'weekday': date.strftime('%A'),
-            'slots': slots
-        })
+    try:
+        options = _parse_projection(request)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    week_data = BookingService.get_slots_for_range(
+        start_date, start_date + timedelta(days=4), request.user,
+        options['include_bookings'], options['booking_fields']
+    )
+    
+    return JsonResponse({
+        'success': True,
+        'start_date': start_date.strftime('%Y-%m-%d'),
+        'week_data': _render_days(week_data, options)
+    })
+
+
+@cache_control(private=True, no_cache=True)
+@require_http_methods(["GET"])
+@sportoase_required('user')
+@condition(etag_func=etags.range_etag)
+def get_range_overview(request):
+    """GET /api/sportoase/slots/range - Gibt Slots für einen Zeitraum zurück (z.B. Monatsansicht)"""
+    start_date_str = request.GET.get('start_date')
+    end_date_str = request.GET.get('end_date')
+    if not start_date_str or not end_date_str:
+        return JsonResponse({'error': 'start_date und end_date erforderlich'}, status=400)
+    
+    try:
+        start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
+        end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
+    except ValueError:
+        return JsonResponse({'error': 'Ungültiges Datumsformat (YYYY-MM-DD erwartet)'}, status=400)
+    
+    if end_date < start_date:
+        return JsonResponse({'error': 'end_date muss nach start_date liegen'}, status=400)
+    
+    if (end_date - start_date).days >= MAX_RANGE_DAYS:
+        return JsonResponse({'error': f'Zeitraum darf höchstens {MAX_RANGE_DAYS} Tage umfassen'}, status=400)
+    
+    try:
+        options = _parse_projection(request)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    days = BookingService.get_slots_for_range(
+        start_date, end_date, request.user,
+        options['include_bookings'], options['booking_fields']
+    )
     
     return JsonResponse({
         'success': True,
         'start_date': start_date.strftime('%Y-%m-%d'),
-        'week_data': week_data
+        'end_date': end_date.strftime('%Y-%m-%d'),
+        'days': _render_days(days, options)
     })
 
 
 @require_http_methods(["GET"])
+@sportoase_required(None)
 def get_timeslots(request):
     """GET /api/sportoase/timeslots - Gibt alle konfigurierten Zeitslots zurück"""
-    if not request.user.is_authenticated:
-        return HttpResponseForbidden("Authentifizierung erforderlich")
-    
     timeslots = TimeSlot.objects.all().order_by('weekday', 'period')
     
     return JsonResponse({
@@ -93,14 +195,9 @@ def get_timeslots(request):
 
 
 @require_http_methods(["PUT"])
+@sportoase_required('admin', "Admin-Berechtigung erforderlich")
 def update_timeslot_label(request, timeslot_id):
     """PUT /api/sportoase/timeslots/<id> - Aktualisiert das Label eines TimeSlots (nur Admin)"""
-    if not request.user.is_authenticated:
-        return HttpResponseForbidden("Authentifizierung erforderlich")
-    
-    if not request.user.has_perm("sportoase.admin"):
-        return HttpResponseForbidden("Admin-Berechtigung erforderlich")
-    
     try:
         data = json.loads(request.body)
         label = data.get('label')
@@ -108,9 +205,7 @@ def update_timeslot_label(request, timeslot_id):
         if not label:
             return JsonResponse({'error': 'Label erforderlich'}, status=400)
         
-        timeslot = TimeSlot.objects.get(id=timeslot_id)
-        timeslot.label = label
-        timeslot.save()
+        timeslot = BookingService.update_timeslot_label(timeslot_id, label)
         
         return JsonResponse({
             'success': True,
@@ -1,6 +1,6 @@
 import { NgModule } from '@angular/core';
 import { BrowserModule } from '@angular/platform-browser';
-import { HttpClientModule } from '@angular/common/http';
+import { HttpClientModule, HTTP_INTERCEPTORS } from '@angular/common/http';
 import { FormsModule, ReactiveFormsModule } from '@angular/forms';
 import { RouterModule, Routes } from '@angular/router';
 
@@ -13,6 +13,7 @@ import { AdminPanelComponent } from './components/admin-panel/admin-panel.compon
 import { WeekOverviewComponent } from './components/week-overview/week-overview.component';
 
 import { ApiService } from './services/api.service';
+import { EtagInterceptor } from './services/etag.interceptor';
 
 const routes: Routes = [
   { path: '', redirectTo: '/dashboard', pathMatch: 'full' },
@@ -41,7 +42,10 @@ const routes: Routes = [
     ReactiveFormsModule,
     RouterModule.forRoot(routes),
   ],
-  providers: [ApiService],
+  providers: [
+    ApiService,
+    { provide: HTTP_INTERCEPTORS, useClass: EtagInterceptor, multi: true },
+  ],
   bootstrap: [AppComponent]
 })
 export class AppModule { }
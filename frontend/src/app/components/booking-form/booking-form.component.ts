@@ -72,7 +72,10 @@ import { ApiService } from '../../services/api.service';
         </div>
         
         <div *ngIf="errorMessage" class="alert alert-danger mt-3">
-          {{ errorMessage }}
+          <ng-container *ngIf="conflicts.length === 0">{{ errorMessage }}</ng-container>
+          <ul *ngIf="conflicts.length > 0" class="mb-0">
+            <li *ngFor="let conflict of conflicts">{{ conflict.booking_info }}</li>
+          </ul>
         </div>
         
         <div *ngIf="successMessage" class="alert alert-success mt-3">
@@ -90,6 +93,7 @@ export class BookingFormComponent implements OnInit {
   bookingForm: FormGroup;
   submitting: boolean = false;
   errorMessage: string = '';
+  conflicts: any[] = [];
   successMessage: string = '';
 
   constructor(
@@ -135,6 +139,7 @@ export class BookingFormComponent implements OnInit {
     
     this.submitting = true;
     this.errorMessage = '';
+    this.conflicts = [];
     this.successMessage = '';
     
     const bookingData = {
@@ -155,6 +160,7 @@ export class BookingFormComponent implements OnInit {
       error: (error) => {
         this.submitting = false;
         this.errorMessage = error.error?.error || 'Fehler beim Erstellen der Buchung';
+        this.conflicts = error.error?.conflicts || [];
       }
     });
   }
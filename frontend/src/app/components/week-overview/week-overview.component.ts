@@ -236,7 +236,7 @@ export class WeekOverviewComponent implements OnInit {
     this.loading = true;
     this.errorMessage = '';
     
-    this.apiService.getWeekOverview(this.startDate).subscribe({
+    this.apiService.getWeekOverview(this.startDate, ['offer_label']).subscribe({
       next: (response) => {
         this.weekData = response.week_data || [];
         this.startDate = response.start_date;
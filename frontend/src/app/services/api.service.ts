@@ -2,6 +2,11 @@ import { Injectable } from '@angular/core';
 import { HttpClient, HttpHeaders } from '@angular/common/http';
 import { Observable } from 'rxjs';
 
+export interface ChangeEvent {
+  event: 'availability' | 'notification';
+  data: any;
+}
+
 @Injectable({
   providedIn: 'root'
 })
@@ -38,14 +43,23 @@ export class ApiService {
     return this.http.get(`${this.apiUrl}/slots?date=${date}`, { withCredentials: true });
   }
 
-  getWeekOverview(startDate?: string): Observable<any> {
+  getWeekOverview(startDate?: string, bookingFields?: string[]): Observable<any> {
     let url = `${this.apiUrl}/slots/week`;
-    if (startDate) {
-      url += `?start_date=${startDate}`;
+    const params: string[] = [];
+    
+    if (startDate) params.push(`start_date=${startDate}`);
+    if (bookingFields && bookingFields.length > 0) params.push(`booking_fields=${bookingFields.join(',')}`);
+    
+    if (params.length > 0) {
+      url += '?' + params.join('&');
     }
     return this.http.get(url, { withCredentials: true });
   }
 
+  getRangeOverview(startDate: string, endDate: string): Observable<any> {
+    return this.http.get(`${this.apiUrl}/slots/range?start_date=${startDate}&end_date=${endDate}`, { withCredentials: true });
+  }
+
   getTimeslots(): Observable<any> {
     return this.http.get(`${this.apiUrl}/timeslots`, { withCredentials: true });
   }
@@ -64,6 +78,13 @@ export class ApiService {
     });
   }
 
+  createBookingSeries(seriesData: any): Observable<any> {
+    return this.http.post(`${this.apiUrl}/book/series`, seriesData, {
+      headers: this.getHeaders(),
+      withCredentials: true
+    });
+  }
+
   getMyBookings(startDate?: string, endDate?: string): Observable<any> {
     let url = `${this.apiUrl}/my-bookings`;
     const params: string[] = [];
@@ -99,24 +120,70 @@ export class ApiService {
     });
   }
 
-  getBlockedSlots(): Observable<any> {
-    return this.http.get(`${this.apiUrl}/blocked-slots`, { withCredentials: true });
+  blockSlots(selection: any): Observable<any> {
+    return this.http.post(`${this.apiUrl}/block-slots`, selection, {
+      headers: this.getHeaders(),
+      withCredentials: true
+    });
+  }
+
+  unblockSlots(selection: any): Observable<any> {
+    return this.http.post(`${this.apiUrl}/unblock-slots`, selection, {
+      headers: this.getHeaders(),
+      withCredentials: true
+    });
+  }
+
+  getBlockedSlots(cursor?: string): Observable<any> {
+    let url = `${this.apiUrl}/blocked-slots`;
+    if (cursor) {
+      url += `?cursor=${encodeURIComponent(cursor)}`;
+    }
+    return this.http.get(url, { withCredentials: true });
   }
 
-  getAllBookings(date?: string): Observable<any> {
-    let url = `${this.apiUrl}/bookings`;
+  getAllBookings(date?: string, cursor?: string): Observable<any> {
+    const params: string[] = [];
     if (date) {
-      url += `?date=${date}`;
+      params.push(`date=${date}`);
+    }
+    if (cursor) {
+      params.push(`cursor=${encodeURIComponent(cursor)}`);
+    }
+    const query = params.length ? `?${params.join('&')}` : '';
+    return this.http.get(`${this.apiUrl}/bookings${query}`, { withCredentials: true });
+  }
+
+  /** URL for a streamed CSV/XLSX download (used as link target, not via HttpClient). */
+  getBookingExportUrl(startDate: string, endDate: string, format: 'csv' | 'xlsx' = 'csv', expandStudents = false): string {
+    let url = `${this.apiUrl}/bookings/export?start_date=${startDate}&end_date=${endDate}&format=${format}`;
+    if (expandStudents) {
+      url += '&students=expand';
+    }
+    return url;
+  }
+
+  searchStudents(startDate: string, endDate: string, name?: string, klasse?: string): Observable<any> {
+    let url = `${this.apiUrl}/students/search?start_date=${startDate}&end_date=${endDate}`;
+    if (name) {
+      url += `&name=${encodeURIComponent(name)}`;
+    }
+    if (klasse) {
+      url += `&klasse=${encodeURIComponent(klasse)}`;
     }
     return this.http.get(url, { withCredentials: true });
   }
 
-  getNotifications(unreadOnly: boolean = false): Observable<any> {
-    let url = `${this.apiUrl}/notifications`;
+  getNotifications(unreadOnly: boolean = false, cursor?: string): Observable<any> {
+    const params: string[] = [];
     if (unreadOnly) {
-      url += '?unread_only=true';
+      params.push('unread_only=true');
     }
-    return this.http.get(url, { withCredentials: true });
+    if (cursor) {
+      params.push(`cursor=${encodeURIComponent(cursor)}`);
+    }
+    const query = params.length ? `?${params.join('&')}` : '';
+    return this.http.get(`${this.apiUrl}/notifications${query}`, { withCredentials: true });
   }
 
   markNotificationRead(notificationId: number): Observable<any> {
@@ -125,4 +192,43 @@ export class ApiService {
       withCredentials: true
     });
   }
+
+  getUnreadNotificationCount(): Observable<any> {
+    return this.http.get(`${this.apiUrl}/notifications/unread-count`, { withCredentials: true });
+  }
+
+  markNotificationsRead(options: { ids?: number[]; up_to_id?: number; before?: string }): Observable<any> {
+    return this.http.post(`${this.apiUrl}/notifications/mark-read`, options, {
+      headers: this.getHeaders(),
+      withCredentials: true
+    });
+  }
+
+  getUtilization(startDate: string, endDate: string, groupBy: string = 'slot'): Observable<any> {
+    return this.http.get(`${this.apiUrl}/analytics/utilization?start_date=${startDate}&end_date=${endDate}&group_by=${groupBy}`, { withCredentials: true });
+  }
+
+  getProfiles(): Observable<any> {
+    return this.http.get(`${this.apiUrl}/profiles`, { withCredentials: true });
+  }
+
+  getProfileSummary(name: string, sort: string = 'cumulative'): Observable<string> {
+    return this.http.get(`${this.apiUrl}/profiles/${name}?format=text&sort=${sort}`, { responseType: 'text', withCredentials: true });
+  }
+
+  /**
+   * Server-Sent Events for availability changes and (for admins) new
+   * notifications. EventSource reconnects on its own and resumes from the
+   * last received event id.
+   */
+  streamChanges(): Observable<ChangeEvent> {
+    return new Observable<ChangeEvent>(subscriber => {
+      const source = new EventSource(`${this.apiUrl}/changes/stream`, { withCredentials: true });
+      const forward = (event: 'availability' | 'notification') => (message: MessageEvent) =>
+        subscriber.next({ event, data: JSON.parse(message.data) });
+      source.addEventListener('availability', forward('availability'));
+      source.addEventListener('notification', forward('notification'));
+      return () => source.close();
+    });
+  }
 }
@@ -0,0 +1,64 @@
+import { Injectable } from '@angular/core';
+import {
+  HttpErrorResponse,
+  HttpEvent,
+  HttpHandler,
+  HttpInterceptor,
+  HttpRequest,
+  HttpResponse
+} from '@angular/common/http';
+import { Observable, of, throwError } from 'rxjs';
+import { catchError, tap } from 'rxjs/operators';
+
+interface CachedResponse {
+  etag: string;
+  body: any;
+}
+
+/**
+ * Sends If-None-Match for GET requests whose last response carried an ETag
+ * and answers a 304 Not Modified with the previously received body.
+ */
+@Injectable()
+export class EtagInterceptor implements HttpInterceptor {
+  private static readonly MAX_ENTRIES = 50;
+  private cache = new Map<string, CachedResponse>();
+
+  intercept(req: HttpRequest<any>, next: HttpHandler): Observable<HttpEvent<any>> {
+    if (req.method !== 'GET') {
+      return next.handle(req);
+    }
+
+    const url = req.urlWithParams;
+    const cached = this.cache.get(url);
+    const conditionalReq = cached
+      ? req.clone({ setHeaders: { 'If-None-Match': cached.etag } })
+      : req;
+
+    return next.handle(conditionalReq).pipe(
+      tap(event => {
+        if (event instanceof HttpResponse) {
+          const etag = event.headers.get('ETag');
+          if (etag) {
+            this.remember(url, { etag, body: event.body });
+          }
+        }
+      }),
+      catchError((error: HttpErrorResponse) => {
+        if (error.status === 304 && cached) {
+          return of(new HttpResponse({ body: cached.body, status: 200, url }));
+        }
+        return throwError(() => error);
+      })
+    );
+  }
+
+  private remember(url: string, entry: CachedResponse): void {
+    this.cache.delete(url);
+    this.cache.set(url, entry);
+    if (this.cache.size > EtagInterceptor.MAX_ENTRIES) {
+      const oldest = this.cache.keys().next().value;
+      this.cache.delete(oldest);
+    }
+  }
+}